@@ -0,0 +1,254 @@
+## Ajuste automático dos parâmetros do Gurobi: busca em instâncias geradas, agrupadas por faixa
+## de tamanho, com presets gravados em arquivo e lidos uma vez por processo pelos modelos A e B
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import functools
+from faixas import FAIXAS, faixa  # Mesmas faixas de tamanho do padrão aprendido do portfólio
+
+# Arquivo dos presets: {objetivo: {faixa: {'params': {...}, ...}}}; ancorado no módulo, e não
+# no diretório de trabalho, para que todo processo que resolve leia o mesmo arquivo
+PRESETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados", "presets.json")
+
+# Espaço de busca: valores testados de cada parâmetro (o primeiro é o padrão do Gurobi)
+ESPACO = {
+    'MIPFocus': (0, 1, 2, 3),
+    'Cuts': (-1, 0, 1, 2, 3),
+    'Heuristics': (0.05, 0.0, 0.2, 0.5),
+    'Presolve': (-1, 0, 1, 2),
+    'Symmetry': (-1, 0, 2),
+}
+
+# Deslocamento (s) da média geométrica dos tempos, para que instâncias triviais não dominem
+DESLOCAMENTO = 1.0
+
+# Melhora relativa mínima da pontuação para aceitar uma mudança (ruído de tempo entre execuções)
+MELHORA_MINIMA = 0.05
+
+## Presets:
+def carregar(caminho=PRESETS):
+    """Presets gravados ({} se o arquivo não existe)."""
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, encoding='utf-8') as f:
+        return json.load(f)
+
+@functools.lru_cache(maxsize=4)
+def _presets(caminho, _mtime):
+    # Presets lidos uma vez por processo; relidos só quando o arquivo muda
+    return carregar(caminho)
+
+def preset(n, objetivo, caminho=PRESETS):
+    """Parâmetros do Gurobi para uma instância de n locais e o objetivo ('total' ou 'max'); {} sem preset."""
+    if not os.path.exists(caminho):
+        return {}
+    presets = _presets(caminho, os.path.getmtime(caminho))
+    return dict(presets.get(objetivo, {}).get(faixa(n), {}).get('params', {}))
+
+def gravar(objetivo, grupo, registro, caminho=PRESETS):
+    """Grava (ou substitui) o preset de um objetivo e faixa, mantendo os demais."""
+    presets = carregar(caminho)
+    presets.setdefault(objetivo, {})[grupo] = registro
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(presets, f, indent=2, sort_keys=True)
+
+## Avaliação de uma configuração:
+def _resolver(location_data, objetivo, params, time_limit, threads):
+    # Modelo A ou B com os parâmetros informados (sem o preset gravado) e sem log no terminal
+    import modelo_base
+    model = modelo_base.build_model(location_data, objectives=(objetivo,), time_limit=time_limit,
+                                    threads=threads, verbose=False)
+    try:
+        return modelo_base.solve_model(model, objetivo, params=params)
+    finally:
+        model.dispose()
+
+def medir(location_data, objetivo, params, time_limit=10, threads=None):
+    """
+    Resolve a instância e retorna (tempo penalizado, tempo do solve, gap final,
+    provado). O tempo penalizado é o tempo até a otimalidade quando ela é
+    provada e time_limit * (1 + gap) caso contrário (gap 1 sem solução).
+    """
+    resultado = _resolver(location_data, objetivo, params, time_limit, threads)
+    if resultado is None:
+        return 2 * time_limit, time_limit, 1.0, False
+    provado = resultado[-1]['status'] == 'OPTIMAL'
+    gap = 0.0 if provado else min(float(resultado[3]), 1.0)
+    penalizado = float(resultado[2]) if provado else time_limit * (1 + gap)
+    return penalizado, float(resultado[2]), gap, provado
+
+def media_geometrica(tempos, deslocamento=DESLOCAMENTO):
+    """Média geométrica deslocada dos tempos."""
+    return math.exp(sum(math.log(t + deslocamento) for t in tempos) / len(tempos)) - deslocamento
+
+def pontuar(instancias, objetivo, params, time_limit=10, threads=None):
+    """Pontuação de uma configuração (menor é melhor) e as medidas por instância."""
+    medidas = [medir(location_data, objetivo, params, time_limit, threads) for location_data in instancias]
+    return media_geometrica([m[0] for m in medidas]), medidas
+
+def _limpar(params):
+    # Retira os parâmetros no valor padrão (o preset guarda só o que muda)
+    return {nome: valor for nome, valor in params.items() if valor != ESPACO[nome][0]}
+
+## Busca:
+def buscar(instancias, objetivo, time_limit=10, threads=None, rodadas=2, espaco=ESPACO, verbose=True):
+    """
+    Busca por coordenadas a partir dos padrões do Gurobi: em cada rodada,
+    cada parâmetro de 'espaco' testa seus valores com os demais fixos, e a
+    mudança fica se a pontuação melhorar ao menos MELHORA_MINIMA. Para quando
+    uma rodada não muda nada. Configurações repetidas não são resolvidas de
+    novo. Retorna (parâmetros, pontuação, pontuação dos padrões, avaliações).
+    """
+    avaliadas = {}
+
+    def avaliar(params):
+        chave = tuple(sorted(params.items()))
+        if chave not in avaliadas:
+            inicio = time.perf_counter()
+            avaliadas[chave] = pontuar(instancias, objetivo, params, time_limit, threads)[0]
+            if verbose:
+                print(f"   {objetivo:<5} {params or 'padrão'}: {avaliadas[chave]:.2f}s "
+                      f"({time.perf_counter() - inicio:.1f}s)")
+        return avaliadas[chave]
+
+    melhor = {}
+    padrao = pontuacao = avaliar(melhor)
+    for _ in range(rodadas):
+        mudou = False
+        for nome, valores in espaco.items():
+            for valor in valores:
+                candidata = _limpar({**melhor, nome: valor})
+                if candidata == melhor:
+                    continue
+                valor_candidata = avaliar(candidata)
+                if valor_candidata < pontuacao * (1 - MELHORA_MINIMA):
+                    melhor, pontuacao, mudou = candidata, valor_candidata, True
+        if not mudou:
+            break
+    return melhor, pontuacao, padrao, len(avaliadas)
+
+def comparar(instancias, objetivo, params, time_limit=10, threads=None):
+    """
+    Padrões do Gurobi contra 'params' nas instâncias de validação. Retorna,
+    para cada um, (pontuação, instâncias provadas, tempo médio até a
+    otimalidade nas provadas por ambos, gap final médio).
+    """
+    _, padrao = pontuar(instancias, objetivo, {}, time_limit, threads)
+    _, ajustado = pontuar(instancias, objetivo, params, time_limit, threads)
+    ambos = [k for k in range(len(instancias)) if padrao[k][3] and ajustado[k][3]]
+
+    def resumo(medidas):
+        return {
+            'pontuacao': media_geometrica([m[0] for m in medidas]),
+            'provadas': sum(m[3] for m in medidas),
+            'tempo_otimo': sum(medidas[k][1] for k in ambos) / len(ambos) if ambos else None,
+            'gap': sum(m[2] for m in medidas) / len(medidas),
+        }
+    return resumo(padrao), resumo(ajustado)
+
+## Ajuste por faixa de tamanho:
+def instancias_por_faixa(tamanhos, sementes, tightness=1.0, faixas=FAIXAS):
+    """Instâncias geradas (benchmark.generate_instance) agrupadas por faixa de tamanho."""
+    import benchmark
+    grupos = {}
+    for n in tamanhos:
+        grupos.setdefault(faixa(n, faixas), []).extend(
+            benchmark.generate_instance(n, semente, tightness) for semente in sementes)
+    return grupos
+
+def ajustar(tamanhos, objetivos=('total', 'max'), sementes=3, validacao=2, time_limit=10, threads=None,
+            rodadas=2, tightness=1.0, caminho=PRESETS):
+    """
+    Para cada objetivo e faixa de tamanho: busca os parâmetros nas sementes
+    de treino (0 a sementes-1), mede a melhora contra os padrões em sementes
+    novas (validação) e grava o preset. Retorna os registros gravados por
+    (objetivo, faixa).
+    """
+    treino = instancias_por_faixa(tamanhos, range(sementes), tightness)
+    teste = instancias_por_faixa(tamanhos, range(sementes, sementes + validacao), tightness)
+    registros = {}
+    for objetivo in objetivos:
+        for grupo, instancias in treino.items():
+            print(f"\n⚙️ Ajustando {objetivo} na faixa {grupo} ({len(instancias)} instâncias de treino)")
+            params, pontuacao, padrao, avaliacoes = buscar(instancias, objetivo, time_limit, threads, rodadas)
+            registro = {
+                'params': params,
+                'tamanhos': sorted(n for n in tamanhos if faixa(n) == grupo),
+                'treino': {'pontuacao': pontuacao, 'pontuacao_padrao': padrao, 'avaliacoes': avaliacoes,
+                           'sementes': sementes},
+                'time_limit': time_limit,
+            }
+            if teste.get(grupo):
+                padrao_teste, ajustado_teste = comparar(teste[grupo], objetivo, params, time_limit, threads)
+                registro['validacao'] = {'padrao': padrao_teste, 'preset': ajustado_teste,
+                                         'instancias': len(teste[grupo])}
+            gravar(objetivo, grupo, registro, caminho)
+            registros[(objetivo, grupo)] = registro
+    return registros
+
+def imprimir(registros):
+    """Tabela dos presets com a comparação contra os padrões na validação."""
+    def numero(valor, formato):
+        return format(valor, formato) if valor is not None else "-"
+
+    print("\n+--------+--------+------------------------------------------------------------+-----------------+-----------------+-------------------+")
+    print("| Obj.   | Faixa  | Parâmetros                                                 | Provadas (p/a)  | T. ótimo (p/a)  | Gap médio (p/a)   |")
+    print("+--------+--------+------------------------------------------------------------+-----------------+-----------------+-------------------+")
+    for (objetivo, grupo), r in sorted(registros.items()):
+        params = ", ".join(f"{nome}={valor}" for nome, valor in sorted(r['params'].items())) or "padrão"
+        v = r.get('validacao')
+        if v:
+            p, a, total = v['padrao'], v['preset'], v['instancias']
+            provadas = f"{p['provadas']}/{a['provadas']} de {total}"
+            tempos = f"{numero(p['tempo_otimo'], '.2f')}/{numero(a['tempo_otimo'], '.2f')}"
+            gaps = f"{p['gap']:.2%}/{a['gap']:.2%}"
+        else:
+            provadas = tempos = gaps = "-"
+        print(f"| {objetivo:<6} | {grupo:<6} | {params:<58} | {provadas:<15} | {tempos:<15} | {gaps:<17} |")
+    print("+--------+--------+------------------------------------------------------------+-----------------+-----------------+-------------------+")
+    print("p = padrões do Gurobi, a = preset ajustado; tempo médio (s) nas instâncias de validação provadas por ambos")
+
+## Linha de comando:
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ajuste dos parâmetros do Gurobi por faixa de tamanho")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="busca os parâmetros em instâncias geradas e grava os presets")
+    run.add_argument("--sizes", type=int, nargs="+", default=[12, 16, 20, 25, 30],
+                     help="tamanhos das instâncias geradas (locais, depósito incluso)")
+    run.add_argument("--seeds", type=int, default=3, help="instâncias de treino por tamanho")
+    run.add_argument("--holdout", type=int, default=2, help="instâncias de validação por tamanho")
+    run.add_argument("--objetivos", nargs="+", default=['total', 'max'], choices=['total', 'max'])
+    run.add_argument("--time-limit", type=float, default=10, help="tempo limite de cada solve da busca")
+    run.add_argument("--threads", type=int, default=None)
+    run.add_argument("--rounds", type=int, default=2, help="rodadas da busca por coordenadas")
+    run.add_argument("--tightness", type=float, default=1.0)
+    run.add_argument("--output", default=PRESETS)
+
+    show = sub.add_parser("presets", help="mostra os presets gravados e a validação de cada um")
+    show.add_argument("--output", default=PRESETS)
+
+    args = parser.parse_args(argv)
+    if args.command == "presets":
+        registros = {(objetivo, grupo): r for objetivo, grupos in carregar(args.output).items()
+                     for grupo, r in grupos.items()}
+        if not registros:
+            print(f"Nenhum preset em {args.output}")
+            return 0
+        imprimir(registros)
+        return 0
+
+    for n in args.sizes:
+        if not 2 <= n <= 500:
+            parser.error(f"tamanho {n} fora da faixa suportada (2 a 500 locais)")
+    registros = ajustar(args.sizes, args.objetivos, args.seeds, args.holdout, args.time_limit, args.threads,
+                        args.rounds, args.tightness, args.output)
+    imprimir(registros)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+## Ambientes do Gurobi reutilizáveis: gp.Env pré-configurados, iniciados uma vez por processo e thread
+import os
+import time
+import atexit
+import threading
+import gurobipy as gp
+
+# Parâmetros aplicados na criação de cada ambiente e herdados por todos os modelos dele
+PARAMETROS = {
+    'OutputFlag': 0,  # Sem log por padrão (e sem o cabeçalho da licença a cada ambiente)
+    'LazyConstraints': 1,  # Cortes de subtour via cbLazy
+    'PreCrush': 1,  # Cortes de usuário via cbCut
+}
+
+class PoolAmbientes:
+    """
+    Um gp.Env por thread do processo, iniciado (com checkout da licença) no
+    primeiro modelo e reaproveitado pelos seguintes. Um ambiente não deve ser
+    usado por duas threads ao mesmo tempo, e os ambientes herdados em um fork
+    pertencem ao processo pai: o filho cria os seus.
+    """
+    def __init__(self, parametros=None):
+        self.parametros = dict(PARAMETROS if parametros is None else parametros)
+        self._ambientes = {}
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self.iniciados = 0  # Ambientes iniciados neste processo
+        self.tempo_inicio = 0.0  # Tempo total (s) gasto iniciando ambientes
+
+    def obter(self):
+        """
+        Ambiente da thread atual: (env, segundos gastos para iniciá-lo nesta
+        chamada, 0 se já estava pronto).
+        """
+        with self._lock:
+            if os.getpid() != self._pid:
+                self._ambientes, self._pid = {}, os.getpid()
+            chave = threading.get_ident()
+            if chave in self._ambientes:
+                return self._ambientes[chave], 0.0
+            inicio = time.perf_counter()
+            env = gp.Env(empty=True)
+            for nome, valor in self.parametros.items():
+                env.setParam(nome, valor)
+            env.start()
+            tempo = time.perf_counter() - inicio
+            self._ambientes[chave] = env
+            self.iniciados += 1
+            self.tempo_inicio += tempo
+            return env, tempo
+
+    def configurar(self, **parametros):
+        """Altera parâmetros padrão (por exemplo, Threads do processo) nos ambientes atuais e nos próximos."""
+        with self._lock:
+            self.parametros.update(parametros)
+            if os.getpid() == self._pid:
+                for env in self._ambientes.values():
+                    for nome, valor in parametros.items():
+                        env.setParam(nome, valor)
+
+    def fechar(self):
+        """Libera os ambientes do processo (os modelos criados neles devem ter sido descartados)."""
+        with self._lock:
+            if os.getpid() == self._pid:
+                for env in self._ambientes.values():
+                    env.dispose()
+            self._ambientes = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+# Pool do processo, usado por modelo_base.build_model
+_pool = PoolAmbientes()
+atexit.register(_pool.fechar)
+
+def pool():
+    """Pool de ambientes do processo atual."""
+    return _pool
+
+def obter():
+    """Ambiente pronto da thread atual e o tempo gasto iniciando-o nesta chamada."""
+    return _pool.obter()
+
+def iniciar(threads=None):
+    """
+    Inicializador dos processos de trabalho: fixa as threads do Gurobi e já
+    inicia o ambiente, para que o primeiro job não pague o checkout da licença.
+    """
+    if threads is not None:
+        _pool.configurar(Threads=threads)
+    _pool.obter()
@@ -0,0 +1,292 @@
+## Armazém colunar dos resultados: um arquivo binário por coluna (mapeável em memória com
+## np.memmap), acrescentado a cada solve, com os vetores por parada e consultas/relatórios
+import os
+import sys
+import json
+import time
+import argparse
+import numpy as np
+
+# Pasta do armazém: <coluna>.bin, <vetor>.bin e categorias.json
+PASTA = os.path.join("resultados", "armazem")
+
+# Colunas por solve e seus tipos; 'categoria' é guardada como código (<i4) com os valores em categorias.json
+COLUNAS = {
+    'instancia': 'categoria',
+    'modelo': 'categoria',  # 'A' ou 'B'
+    'status': 'categoria',  # OPTIMAL, TIME_LIMIT, ... ou SEM_SOLUCAO
+    'metodo': 'categoria',  # MIP, DP, LNS, HiGHS, ...
+    'data': '<f8',  # Instante da gravação (segundos desde a época)
+    'n': '<i4',  # Locais da instância, depósito incluso
+    'objetivo': '<f8',
+    'limite': '<f8',  # Limite inferior do solver
+    'tempo': '<f8',  # Tempo do solve (s)
+    'gap': '<f8',
+    'nos': '<f8',  # Nós explorados
+    'atraso_total': '<f8',  # Calculados dos atrasos reportados, para os dois modelos
+    'atraso_maximo': '<f8',
+    'construcao': '<f8',  # Montagem do modelo (s), quando informada
+    'violacoes': '<i4',  # Problemas do verificador (avaliacao.problemas); -1 se não verificado
+    'inicio': '<i8',  # Posição da primeira parada nos vetores
+    'paradas': '<i4',  # Quantidade de valores do solve nos vetores (n, ou 0 sem solução)
+}
+
+# Vetores por parada, concatenados entre os solves: chegadas e atrasos indexados pelo local, rota na ordem de visita
+VETORES = {'chegada': '<f8', 'atraso': '<f8', 'rota': '<i4'}
+
+def _tipo(tipo):
+    return np.dtype('<i4' if tipo == 'categoria' else tipo)
+
+def _caminho(pasta, nome):
+    return os.path.join(pasta, f"{nome}.bin")
+
+def _ler_categorias(pasta):
+    caminho = os.path.join(pasta, "categorias.json")
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, encoding='utf-8') as f:
+        return json.load(f)
+
+def _gravar_categorias(pasta, categorias):
+    # Grava em arquivo temporário e substitui: leitores nunca veem um JSON pela metade
+    caminho = os.path.join(pasta, "categorias.json")
+    with open(caminho + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(categorias, f, ensure_ascii=False)
+    os.replace(caminho + ".tmp", caminho)
+
+def _mapear(caminho, tipo):
+    # Arquivo inteiro como array somente leitura (memmap não aceita arquivo vazio)
+    if not os.path.exists(caminho) or os.path.getsize(caminho) < tipo.itemsize:
+        return np.empty(0, dtype=tipo)
+    return np.memmap(caminho, dtype=tipo, mode='r', shape=(os.path.getsize(caminho) // tipo.itemsize,))
+
+## Escrita:
+def _descartar_incompleta(pasta):
+    # Corta as colunas no número de linhas completas (restos de uma gravação interrompida)
+    tamanhos = {nome: os.path.getsize(_caminho(pasta, nome)) if os.path.exists(_caminho(pasta, nome)) else 0
+                for nome in COLUNAS}
+    linhas = min(tamanho // _tipo(COLUNAS[nome]).itemsize for nome, tamanho in tamanhos.items())
+    for nome, tamanho in tamanhos.items():
+        if tamanho > linhas * _tipo(COLUNAS[nome]).itemsize:
+            os.truncate(_caminho(pasta, nome), linhas * _tipo(COLUNAS[nome]).itemsize)
+
+def gravar(instancia, modelo, resultado, location_data=None, pasta=PASTA):
+    """
+    Acrescenta um solve ao armazém: métricas da tupla (formato de
+    modelo_a.solve ou modelo_b.solve; None se não houve solução) e os vetores
+    de chegadas, atrasos e rota. Com 'location_data', a solução passa pelo
+    verificador e o número de problemas vai para a coluna 'violacoes'.
+    Os vetores são gravados antes das colunas, e a leitura considera só as
+    linhas completas: uma gravação interrompida não corrompe o armazém.
+    """
+    os.makedirs(pasta, exist_ok=True)
+    _descartar_incompleta(pasta)
+    n = len(location_data) if location_data is not None else (len(resultado[6]) if resultado else 0)
+    detalhes = resultado[-1] if resultado and isinstance(resultado[-1], dict) else {}
+    linha = {nome: np.nan for nome, tipo in COLUNAS.items() if tipo == '<f8'}
+    linha.update(instancia=instancia, modelo=modelo, status=detalhes.get('status', 'SEM_SOLUCAO'),
+                 metodo=detalhes.get('metodo', 'MIP'), data=time.time(), n=n, violacoes=-1, paradas=0,
+                 inicio=os.path.getsize(_caminho(pasta, 'chegada')) // 8
+                 if os.path.exists(_caminho(pasta, 'chegada')) else 0)
+
+    if resultado:
+        import avaliacao  # Rota a partir dos arcos e verificação
+        chegadas = np.asarray(resultado[6], dtype='<f8')
+        atrasos = np.asarray(resultado[7], dtype='<f8')
+        rota, _ = avaliacao.ciclo(resultado[5], len(chegadas))
+        rota = np.resize(rota.astype('<i4'), len(chegadas))  # Ciclo incompleto: completado só para manter o tamanho
+        linha.update(objetivo=resultado[0], limite=resultado[1], tempo=resultado[2], gap=resultado[3],
+                     nos=resultado[4], atraso_total=atrasos[1:].sum(), atraso_maximo=atrasos[1:].max(initial=0.0),
+                     construcao=detalhes.get('construcao', np.nan), paradas=len(chegadas))
+        if location_data is not None:
+            linha['violacoes'] = len(avaliacao.problemas(resultado, location_data, 'max' if modelo == 'B' else 'total'))
+        for nome, valores in (('chegada', chegadas), ('atraso', atrasos), ('rota', rota)):
+            with open(_caminho(pasta, nome), 'ab') as f:
+                f.write(np.ascontiguousarray(valores, dtype=VETORES[nome]).tobytes())
+
+    categorias = _ler_categorias(pasta)
+    for nome, tipo in COLUNAS.items():
+        if tipo == 'categoria':
+            valores = categorias.setdefault(nome, [])
+            if linha[nome] not in valores:
+                valores.append(linha[nome])
+            linha[nome] = valores.index(linha[nome])
+    _gravar_categorias(pasta, categorias)
+    for nome, tipo in COLUNAS.items():
+        valor = linha[nome] if linha[nome] is not None else np.nan
+        with open(_caminho(pasta, nome), 'ab') as f:
+            f.write(np.asarray([valor], dtype=_tipo(tipo)).tobytes())
+
+def gravar_instancia(instancia, resultado_a, resultado_b, location_data=None, pasta=PASTA):
+    """Grava os solves dos dois modelos de uma instância."""
+    gravar(instancia, 'A', resultado_a, location_data, pasta)
+    gravar(instancia, 'B', resultado_b, location_data, pasta)
+
+## Leitura e consultas:
+def abrir(pasta=PASTA):
+    """
+    Abre o armazém sem copiar os dados: retorna (tabela, vetores), dicionários
+    de coluna -> array. As colunas numéricas e os vetores são np.memmap; as
+    categóricas vêm decodificadas (arrays de texto).
+    """
+    categorias = _ler_categorias(pasta)
+    tabela = {nome: _mapear(_caminho(pasta, nome), _tipo(tipo)) for nome, tipo in COLUNAS.items()}
+    linhas = min(len(coluna) for coluna in tabela.values())
+    for nome, tipo in COLUNAS.items():
+        tabela[nome] = tabela[nome][:linhas]
+        if tipo == 'categoria':
+            valores = np.asarray(categorias.get(nome, []), dtype=object)
+            tabela[nome] = valores[np.asarray(tabela[nome])] if linhas else np.empty(0, dtype=object)
+    vetores = {nome: _mapear(_caminho(pasta, nome), np.dtype(tipo)) for nome, tipo in VETORES.items()}
+    return tabela, vetores
+
+def filtrar(tabela, **condicoes):
+    """
+    Índices das linhas que atendem a todas as condições coluna=valor (uma
+    lista ou tupla aceita qualquer um dos valores), em ordem de gravação.
+    """
+    mascara = np.ones(len(tabela['n']), dtype=bool)
+    for nome, valor in condicoes.items():
+        if valor is None:
+            continue
+        valores = valor if isinstance(valor, (list, tuple, set)) else [valor]
+        mascara &= np.isin(tabela[nome], list(valores))
+    return np.flatnonzero(mascara)
+
+def ultimos(tabela, indices=None):
+    """Das linhas em 'indices' (todas se omitido), a última gravada de cada (instância, modelo)."""
+    indices = np.arange(len(tabela['n'])) if indices is None else np.asarray(indices)
+    vistos = {}
+    for k in indices:
+        vistos[(tabela['instancia'][k], tabela['modelo'][k])] = k
+    return np.asarray(sorted(vistos.values()), dtype=int)
+
+def paradas(tabela, vetores, k):
+    """(chegadas, atrasos, rota) do solve da linha k, como vistas dos vetores (sem cópia)."""
+    inicio, tamanho = int(tabela['inicio'][k]), int(tabela['paradas'][k])
+    return tuple(vetores[nome][inicio:inicio + tamanho] for nome in ('chegada', 'atraso', 'rota'))
+
+def solucao(tabela, vetores, k):
+    """Reconstrói a tupla no formato de modelo_a/modelo_b da linha k (None se não houve solução)."""
+    if tabela['paradas'][k] == 0:
+        return None
+    chegadas, atrasos, rota = (np.asarray(v) for v in paradas(tabela, vetores, k))
+    arcos = list(zip(rota.tolist(), np.roll(rota, -1).tolist()))
+    resultado = (float(tabela['objetivo'][k]), float(tabela['limite'][k]), float(tabela['tempo'][k]),
+                 float(tabela['gap'][k]), float(tabela['nos'][k]), arcos, chegadas.tolist(), atrasos.tolist())
+    if tabela['modelo'][k] == 'B':
+        resultado += (float(tabela['objetivo'][k]),)  # Valor do atraso máximo
+    return resultado + ({'status': tabela['status'][k], 'metodo': tabela['metodo'][k]},)
+
+def resumo(tabela, indices=None, por=('modelo',)):
+    """
+    Agrega as linhas por grupo (colunas em 'por'): solves, provados ótimos,
+    tempo médio, gap médio, nós médios e soluções com problemas no verificador.
+    Retorna uma lista de dicionários, um por grupo.
+    """
+    indices = np.arange(len(tabela['n'])) if indices is None else np.asarray(indices, dtype=int)
+    grupos = {}
+    for k in indices:
+        grupos.setdefault(tuple(tabela[c][k] for c in por), []).append(k)
+    linhas = []
+    for chave, ks in sorted(grupos.items(), key=lambda item: tuple(str(v) for v in item[0])):
+        ks = np.asarray(ks)
+        com_solucao = ks[tabela['paradas'][ks] > 0]
+        linhas.append({
+            'grupo': chave,
+            'solves': len(ks),
+            'otimos': int(np.sum(tabela['status'][ks] == 'OPTIMAL')),
+            'sem_solucao': len(ks) - len(com_solucao),
+            'tempo': float(np.mean(tabela['tempo'][com_solucao])) if len(com_solucao) else np.nan,
+            'gap': float(np.nanmean(tabela['gap'][com_solucao])) if len(com_solucao) else np.nan,
+            'nos': float(np.nanmean(tabela['nos'][com_solucao])) if len(com_solucao) else np.nan,
+            'invalidas': int(np.sum(tabela['violacoes'][ks] > 0)),
+        })
+    return linhas
+
+## Relatórios:
+def imprimir_resumo(linhas, por=('modelo',)):
+    """Tabela do resumo por grupo."""
+    rotulo = " / ".join(por)
+    largura = max([len(rotulo)] + [len(" / ".join(str(v) for v in r['grupo'])) for r in linhas])
+    borda = f"+-{'-' * largura}-+--------+--------+---------+-----------+----------+------------+-----------+"
+    print(borda)
+    print(f"| {rotulo:<{largura}} | Solves | Ótimos | Sem sol.| Tempo (s) | Gap      | Nós        | Inválidas |")
+    print(borda)
+    for r in linhas:
+        grupo = " / ".join(str(v) for v in r['grupo'])
+        print(f"| {grupo:<{largura}} | {r['solves']:>6} | {r['otimos']:>6} | {r['sem_solucao']:>7} "
+              f"| {r['tempo']:>9.2f} | {r['gap']:>8.2%} | {r['nos']:>10.0f} | {r['invalidas']:>9} |")
+    print(borda)
+
+def imprimir_linhas(tabela, indices):
+    """Uma linha por solve: instância, modelo, status, objetivo, limite, gap, nós e tempo."""
+    borda = "+------------+--------+------------+------------+------------+----------+------------+-----------+"
+    print(borda)
+    print("| Instância  | Modelo | Status     | Objetivo   | Limite     | Gap      | Nós        | Tempo (s) |")
+    print(borda)
+    for k in indices:
+        print(f"| {tabela['instancia'][k]:<10} | {tabela['modelo'][k]:^6} | {tabela['status'][k]:<10} "
+              f"| {tabela['objetivo'][k]:>10.2f} | {tabela['limite'][k]:>10.2f} | {tabela['gap'][k]:>8.2%} "
+              f"| {tabela['nos'][k]:>10.0f} | {tabela['tempo'][k]:>9.2f} |")
+    print(borda)
+
+def renderizar(instancia, pasta=PASTA, destino=None):
+    """
+    Visão em texto (a tabela de resolucao.log_solution) dos últimos solves A e
+    B da instância no armazém. Grava em 'destino' se informado; retorna o texto.
+    """
+    import resolucao
+    tabela, vetores = abrir(pasta)
+    linhas = ultimos(tabela, filtrar(tabela, instancia=instancia))
+    if not len(linhas):
+        raise ValueError(f"Instância {instancia} não está no armazém {pasta}")
+    solucoes = {tabela['modelo'][k]: solucao(tabela, vetores, k) for k in linhas}
+    data = max(float(tabela['data'][k]) for k in linhas)
+    texto = resolucao.format_solution_log(instancia, solucoes.get('A'), solucoes.get('B'), data=data)
+    if destino:
+        with open(destino, "w", encoding='utf-8') as f:
+            f.write(texto)
+    return texto
+
+## Linha de comando:
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consultas e relatórios do armazém de resultados")
+    parser.add_argument("--pasta", default=PASTA)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    filtros = argparse.ArgumentParser(add_help=False)
+    filtros.add_argument("--instancia", nargs="+", default=None)
+    filtros.add_argument("--modelo", nargs="+", default=None, choices=['A', 'B'])
+    filtros.add_argument("--status", nargs="+", default=None)
+    filtros.add_argument("--metodo", nargs="+", default=None)
+    filtros.add_argument("--ultimos", action="store_true", help="só o último solve de cada instância e modelo")
+
+    resumir = sub.add_parser("resumo", parents=[filtros], help="métricas agregadas por grupo")
+    resumir.add_argument("--por", nargs="+", default=['modelo'], choices=[c for c, t in COLUNAS.items()
+                                                                          if t == 'categoria'] + ['n'])
+    sub.add_parser("consulta", parents=[filtros], help="uma linha por solve")
+    render = sub.add_parser("render", help="tabela em texto dos últimos solves de uma instância")
+    render.add_argument("instancia")
+    render.add_argument("--output", default=None, help="arquivo de saída (padrão: só imprime)")
+
+    args = parser.parse_args(argv)
+    if args.command == "render":
+        print(renderizar(args.instancia, args.pasta, args.output))
+        return 0
+
+    tabela, _ = abrir(args.pasta)
+    indices = filtrar(tabela, instancia=args.instancia, modelo=args.modelo, status=args.status, metodo=args.metodo)
+    if args.ultimos:
+        indices = ultimos(tabela, indices)
+    if not len(indices):
+        print(f"Nenhum solve encontrado em {args.pasta}")
+        return 0
+    if args.command == "resumo":
+        imprimir_resumo(resumo(tabela, indices, args.por), args.por)
+    else:
+        imprimir_linhas(tabela, indices)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
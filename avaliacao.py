@@ -0,0 +1,159 @@
+## Avaliação vetorizada de rotas (uma ou milhares de permutações por chamada) e
+## verificação independente das soluções devolvidas pelos solvers
+import numpy as np
+
+# Tolerância padrão da verificação, relativa à grandeza dos valores comparados (mínimo 1)
+TOLERANCIA = 1e-6
+
+## Dados da instância em forma de vetores:
+def matriz_distancias(location_data):
+    """Retorna a matriz (n x n) de distâncias euclidianas entre todos os locais."""
+    coords = np.asarray([p[:2] for p in location_data], dtype=float)
+    diff = coords[:, None, :] - coords[None, :, :]
+    return np.hypot(diff[..., 0], diff[..., 1])
+
+def vetores_instancia(location_data):
+    """Separa a instância em matriz de distâncias, tempos de serviço e deadlines."""
+    servico = np.asarray([p[2] for p in location_data], dtype=float)
+    prazo = np.asarray([p[3] for p in location_data], dtype=float)
+    return matriz_distancias(location_data), servico, prazo
+
+## Avaliação:
+def atrasos_por_chegada(chegadas, prazo):
+    """Atraso de cada local (chegada além do deadline), zero no depósito (coluna 0)."""
+    atrasos = np.maximum(np.asarray(chegadas, dtype=float) - prazo, 0.0)
+    atrasos[..., 0] = 0.0
+    return atrasos
+
+def avaliar_rotas(rotas, dist, servico, prazo):
+    """
+    Avalia várias rotas de uma vez. Cada linha de 'rotas' é uma permutação
+    dos locais começando no depósito (0). Retorna (chegadas, atrasos,
+    atraso_total, atraso_maximo), com chegadas e atrasos indexados pela
+    posição na rota.
+    """
+    rotas = np.atleast_2d(rotas)
+    origem, destino = rotas[:, :-1], rotas[:, 1:]
+    # Tempo de cada trecho = serviço no local de origem + distância até o destino
+    trechos = servico[origem] + dist[origem, destino]
+    chegadas = np.zeros(rotas.shape, dtype=float)
+    np.cumsum(trechos, axis=1, out=chegadas[:, 1:])
+    atrasos = atrasos_por_chegada(chegadas, prazo[rotas])
+    return chegadas, atrasos, atrasos.sum(axis=1), atrasos.max(axis=1)
+
+def avaliar(rotas, dist, servico, prazo):
+    """
+    Como avaliar_rotas, mas com chegadas e atrasos indexados pelo número do
+    local (linha k, coluna i: local i na rota k), no formato das tuplas dos
+    solvers. Aceita uma permutação ou um array 2-D de permutações.
+    """
+    rotas = np.atleast_2d(rotas)
+    chegadas_pos, atrasos_pos, total, maximo = avaliar_rotas(rotas, dist, servico, prazo)
+    chegadas, atrasos = np.empty_like(chegadas_pos), np.empty_like(atrasos_pos)
+    np.put_along_axis(chegadas, rotas, chegadas_pos, axis=1)
+    np.put_along_axis(atrasos, rotas, atrasos_pos, axis=1)
+    return chegadas, atrasos, total, maximo
+
+## Verificação:
+def ciclo(arcos, n):
+    """
+    Rota a partir do depósito formada pelos arcos (i, j) de uma solução e os
+    problemas encontrados: locais fora da instância, laços, saídas ou
+    entradas repetidas e ciclos que não passam por todos os locais.
+    Retorna (rota, problemas); a rota só é completa se não houver problemas.
+    """
+    problemas = []
+    arcos = np.asarray(list(arcos), dtype=int).reshape(-1, 2)
+    if ((arcos < 0) | (arcos >= n)).any():
+        return np.array([0]), [f"arco com local fora da instância (0 a {n - 1})"]
+    if (arcos[:, 0] == arcos[:, 1]).any():
+        problemas.append("arco de um local para ele mesmo")
+    saidas, entradas = np.bincount(arcos[:, 0], minlength=n), np.bincount(arcos[:, 1], minlength=n)
+    for nome, contagem in (("saídas", saidas), ("entradas", entradas)):
+        errados = np.flatnonzero(contagem != 1)
+        if len(errados):
+            problemas.append(f"locais sem exatamente uma das {nome}: {errados.tolist()}")
+
+    sucessor = dict(zip(arcos[:, 0].tolist(), arcos[:, 1].tolist()))
+    rota, atual = [0], sucessor.get(0)
+    while atual is not None and atual != 0 and len(rota) < n:
+        rota.append(atual)
+        atual = sucessor.get(atual)
+    if len(rota) < n or atual != 0:
+        problemas.append(f"a rota a partir do depósito não é um ciclo com os {n} locais "
+                         f"(visita {len(rota)} antes de {'fechar' if atual == 0 else 'parar'})")
+    return np.asarray(rota), problemas
+
+def problemas(resultado, location_data, objetivo=None, tolerancia=TOLERANCIA):
+    """
+    Confere uma tupla de resultado (formato de modelo_a.solve ou
+    modelo_b.solve) contra a instância, sem confiar no solver:
+    - os arcos formam um único ciclo hamiltoniano a partir do depósito;
+    - as chegadas respeitam as restrições de sequenciamento (Big-M com o
+      arco ativo): y[j] >= y[i] + s_i + d_ij em cada arco (i, j), j != 0;
+    - os atrasos cobrem chegada - deadline e o objetivo é a soma deles
+      ('total') ou cobre o maior ('max');
+    - o objetivo não é pior que o da própria rota avaliada sem esperas e o
+      limite inferior não passa do objetivo.
+    'objetivo' é deduzido do tamanho da tupla se omitido. Retorna a lista de
+    problemas (vazia se a solução é válida).
+    """
+    if not resultado:
+        return ["sem solução"]
+    if objetivo is None:
+        objetivo = 'max' if len(resultado) == 10 else 'total'
+    n = len(location_data)
+    dist, servico, prazo = vetores_instancia(location_data)
+    valor, limite, arcos, chegadas, atrasos = resultado[0], resultado[1], resultado[5], resultado[6], resultado[7]
+
+    def folga(referencia):
+        return tolerancia * np.maximum(1.0, np.abs(referencia))
+
+    rota, encontrados = ciclo(arcos, n)
+    hamiltoniano = not encontrados
+    chegadas, atrasos = np.asarray(chegadas, dtype=float), np.asarray(atrasos, dtype=float)
+    if chegadas.shape != (n,) or atrasos.shape != (n,):
+        return encontrados + [f"chegadas e atrasos devem ter {n} valores (um por local)"]
+
+    # Sequenciamento nos arcos usados (o retorno ao depósito não tem restrição de tempo)
+    usados = np.asarray(list(arcos), dtype=int).reshape(-1, 2)
+    if hamiltoniano:
+        i, j = usados[usados[:, 1] != 0].T
+        minimo = chegadas[i] + servico[i] + dist[i, j]
+        violados = np.flatnonzero(chegadas[j] < minimo - folga(minimo))
+        if len(violados):
+            k = violados[np.argmax((minimo - chegadas[j])[violados])]
+            encontrados.append(f"{len(violados)} arcos com chegada antes do possível, o pior {i[k]} -> {j[k]} "
+                               f"(chegada {chegadas[j[k]]:.4f} < {minimo[k]:.4f})")
+    if (chegadas < -folga(chegadas)).any():
+        encontrados.append("chegada negativa")
+
+    # Atrasos reportados contra as chegadas reportadas, e objetivo contra os atrasos
+    exigidos = atrasos_por_chegada(chegadas, prazo)
+    abaixo = np.flatnonzero(atrasos[1:] < exigidos[1:] - folga(exigidos[1:])) + 1
+    if len(abaixo):
+        encontrados.append(f"atrasos menores que chegada - deadline nos locais {abaixo.tolist()}")
+    if objetivo == 'max':  # max_atraso só precisa cobrir os atrasos
+        reportado = atrasos[1:].max(initial=0.0)
+        if valor < reportado - folga(reportado):
+            encontrados.append(f"objetivo {valor:.4f} abaixo do maior atraso reportado ({reportado:.4f})")
+    elif abs(valor - atrasos[1:].sum()) > folga(valor):
+        encontrados.append(f"objetivo {valor:.4f} difere da soma dos atrasos reportados ({atrasos[1:].sum():.4f})")
+    if objetivo == 'max' and len(resultado) == 10 and abs(resultado[8] - valor) > folga(valor):
+        encontrados.append(f"atraso máximo {resultado[8]:.4f} difere do objetivo {valor:.4f}")
+
+    # A rota sem esperas é o melhor cronograma dela: o objetivo não pode ficar abaixo
+    if hamiltoniano:
+        _, _, total, maximo = avaliar_rotas(rota, dist, servico, prazo)
+        proprio = maximo[0] if objetivo == 'max' else total[0]
+        if valor < proprio - folga(proprio):
+            encontrados.append(f"objetivo {valor:.4f} abaixo do valor da rota ({proprio:.4f})")
+    if limite is not None and limite > valor + folga(valor):
+        encontrados.append(f"limite inferior {limite:.4f} acima do objetivo {valor:.4f}")
+    return encontrados
+
+def verificar(resultado, location_data, objetivo=None, tolerancia=TOLERANCIA):
+    """Como problemas, mas levanta ValueError se a solução não for válida."""
+    encontrados = problemas(resultado, location_data, objetivo, tolerancia)
+    if encontrados:
+        raise ValueError("Solução inválida: " + "; ".join(encontrados))
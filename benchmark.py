@@ -0,0 +1,300 @@
+## Benchmark dos solvers: gerador de instâncias, execução em lote e comparação com uma base
+import os
+import csv
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import parametro
+import modelo_a
+import modelo_b
+import modelo_base
+import programacao_dinamica
+import avaliacao
+
+# Pasta padrão das instâncias geradas e dos resultados do benchmark
+INSTANCE_DIR = os.path.join("instancias", "benchmark")
+RESULTS_DIR = os.path.join("resultados", "benchmark")
+BASELINE_PATH = os.path.join(RESULTS_DIR, "baseline.json")
+
+# Área do plano (coordenadas de 0 a GRID) e faixa do tempo de serviço, como nas instâncias da prova
+GRID = 100
+SERVICE_RANGE = (5, 20)
+
+## Gerador de instâncias:
+def generate_instance(n, seed=0, tightness=1.0):
+    """
+    Instância aleatória reprodutível com n locais (depósito + n-1 clientes) no
+    formato de parametro.read_instances. Os deadlines são sorteados entre 0 e
+    horizonte / tightness, onde o horizonte estima o fim de uma rota completa
+    (serviços + comprimento esperado do tour no quadrado): tightness = 1 espalha
+    os deadlines pela rota inteira, valores maiores apertam, menores folgam.
+    """
+    rng = random.Random(f"{n}:{seed}:{tightness}")
+    location_data = [[rng.randint(0, GRID), rng.randint(0, GRID), 0, 0]]
+    services = [rng.randint(*SERVICE_RANGE) for _ in range(n - 1)]
+    horizon = sum(services) + 0.7124 * math.sqrt(max(n - 1, 1) * GRID * GRID)  # Beardwood-Halton-Hammersley
+    for service in services:
+        deadline = rng.randint(0, max(1, round(horizon / tightness)))
+        location_data.append([rng.randint(0, GRID), rng.randint(0, GRID), service, deadline])
+    return location_data
+
+def write_instance(path, location_data):
+    """Grava a instância no formato de 'instancias/*.txt': quantidade de locais, depósito e 'x y serviço deadline'."""
+    lines = [str(len(location_data)), f"{location_data[0][0]:3d} {location_data[0][1]:3d}"]
+    lines += [" ".join(f"{v:3d}" for v in row) for row in location_data[1:]]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+def generate_set(sizes, seeds=(0,), tightness=1.0, directory=INSTANCE_DIR):
+    """Gera um arquivo por (tamanho, semente) em 'directory' e retorna os caminhos."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for n in sizes:
+        if not 2 <= n <= 500:
+            raise ValueError(f"Tamanho {n} fora da faixa suportada (2 a 500 locais)")
+        for seed in seeds:
+            path = os.path.join(directory, f"bench_{n}_s{seed}_t{tightness:g}.txt")
+            write_instance(path, generate_instance(n, seed, tightness))
+            paths.append(path)
+    return paths
+
+## Configurações de solver: nome -> função (location_data, time_limit, threads) -> resultado
+CONFIGS = {
+    "A": lambda data, time_limit, threads: modelo_a.solve(data, time_limit=time_limit, threads=threads),
+    "B": lambda data, time_limit, threads: modelo_b.solve(data, time_limit=time_limit, threads=threads),
+    "A-sem-pre": lambda data, time_limit, threads: modelo_a.solve(data, time_limit=time_limit, threads=threads,
+                                                                  preprocess=False),
+    "B-sem-pre": lambda data, time_limit, threads: modelo_b.solve(data, time_limit=time_limit, threads=threads,
+                                                                  preprocess=False),
+    "B-bissecao": lambda data, time_limit, threads: modelo_b.solve(data, time_limit=time_limit, threads=threads,
+                                                                   engine='bisection'),
+    "A-lns": lambda data, time_limit, threads: modelo_a.solve(data, time_limit=time_limit, threads=threads,
+                                                              engine='lns'),
+    "B-lns": lambda data, time_limit, threads: modelo_b.solve(data, time_limit=time_limit, threads=threads,
+                                                              engine='lns'),
+    "A-highs": lambda data, time_limit, threads: modelo_a.solve(data, time_limit=time_limit, threads=threads,
+                                                                backend='highs'),
+    "B-highs": lambda data, time_limit, threads: modelo_b.solve(data, time_limit=time_limit, threads=threads,
+                                                                backend='highs'),
+    "A-heuristica": lambda data, time_limit, threads: modelo_a.solve(data, heuristic_only=True),
+    "B-heuristica": lambda data, time_limit, threads: modelo_b.solve(data, heuristic_only=True),
+    "A-dp": lambda data, time_limit, threads: programacao_dinamica.solve(data, 'total'),
+    "B-dp": lambda data, time_limit, threads: programacao_dinamica.solve(data, 'max'),
+    # Padrões do Gurobi, ignorando o preset da faixa de tamanho (ver ajuste.py)
+    "A-padrao": lambda data, time_limit, threads: modelo_a.solve(data, time_limit=time_limit, threads=threads,
+                                                                 params={}),
+    "B-padrao": lambda data, time_limit, threads: modelo_b.solve(data, time_limit=time_limit, threads=threads,
+                                                                 params={}),
+    # Modelo compartilhado: devolve os dois resultados, registrados como "AB:A" e "AB:B"
+    "AB": lambda data, time_limit, threads: modelo_base.solve_both(data, time_limit=time_limit, threads=threads),
+}
+
+# Famílias da inferência de precedências, uma de cada vez, para comparar nós e tempo (ver precedencia.py)
+PRECEDENCE_VARIANTS = {
+    "sem-prec": False,
+    "prec-janelas": {"janelas": True, "arcos": False, "cortes": None},
+    "prec-arcos": {"janelas": False, "arcos": True, "cortes": None},
+    "prec-lazy": {"cortes": "lazy"},
+    "prec-usuario": {"cortes": "usuario"},
+}
+for _label, _module in (("A", modelo_a), ("B", modelo_b)):
+    for _variant, _precedence in PRECEDENCE_VARIANTS.items():
+        CONFIGS[f"{_label}-{_variant}"] = (
+            lambda data, time_limit, threads, module=_module, precedence=_precedence:
+            module.solve(data, time_limit=time_limit, threads=threads, precedence=precedence))
+
+# Colunas gravadas por execução (CSV e JSON)
+FIELDS = ["instance", "n", "config", "status", "objective", "bound", "gap", "runtime",
+          "build_time", "env_time", "wall_time", "nodes", "violations", "repeats", "objective_spread", "gap_spread"]
+NUMERIC_FIELDS = {"n", "objective", "bound", "gap", "runtime", "build_time", "env_time", "wall_time", "nodes",
+                  "violations", "repeats", "objective_spread", "gap_spread"}
+
+## Execução:
+def _spread(values):
+    # Amplitude (máximo - mínimo) entre as repetições que têm o valor
+    values = [v for v in values if v is not None]
+    return max(values) - min(values) if values else None
+
+def make_record(instance_name, location_data, config, result, wall_time, repeated=None):
+    """
+    Linha de resultado a partir da tupla devolvida pelos solvers (formato de
+    modelo_a/modelo_b). 'repeated' traz os resultados de todas as repetições,
+    dos quais se grava a amplitude do objetivo e do gap.
+    """
+    record = {"instance": instance_name, "n": len(location_data), "config": config,
+              "wall_time": wall_time}
+    if repeated and len(repeated) > 1:
+        record.update({
+            "repeats": len(repeated),
+            "objective_spread": _spread([r[0] if r else None for r in repeated]),
+            "gap_spread": _spread([r[3] if r else None for r in repeated]),
+        })
+    if not result:
+        record["status"] = "SEM_SOLUCAO"
+        return record
+    details = result[-1]
+    record.update({
+        "status": details["status"],
+        "objective": result[0],
+        "bound": result[1],
+        "gap": result[3],
+        "runtime": result[2],
+        "build_time": details.get("construcao"),  # Só os solves do Gurobi constroem modelo
+        "env_time": details.get("ambiente"),  # Parte de build_time gasta iniciando o ambiente
+        "nodes": result[4],
+        "violations": len(avaliacao.problemas(result, location_data)),  # Problemas apontados pelo verificador
+    })
+    return record
+
+def run_benchmark(instances, configs=("A", "B"), time_limit=60, threads=None, repeats=1):
+    """
+    Executa cada configuração em cada instância (lista de (nome, location_data)
+    ou de (nome, array) de parametro.iter_instances) e retorna uma lista de
+    registros. Com repeats > 1, grava a execução de tempo de parede mediano
+    (mediana inferior: tempo, objetivo e gap vêm da mesma execução) e a
+    amplitude do objetivo e do gap entre as repetições.
+    """
+    records = []
+    for name, locations in instances:
+        location_data = parametro.as_location_data(locations)
+        for config in configs:
+            solver = CONFIGS[config]
+            runs = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                result = solver(location_data, time_limit, threads)
+                runs.append((result, time.perf_counter() - start))
+            runs.sort(key=lambda run: run[1])
+            result, wall_time = runs[(len(runs) - 1) // 2]
+            if config == "AB":
+                for k, label in enumerate(("A", "B")):
+                    records.append(make_record(name, location_data, f"AB:{label}", result[k], wall_time,
+                                               [res[k] for res, _ in runs]))
+            else:
+                records.append(make_record(name, location_data, config, result, wall_time,
+                                           [res for res, _ in runs]))
+            print(f"   - {name} / {config}: {records[-1]['status']} em {wall_time:.2f}s")
+    return records
+
+def save_results(records, path):
+    """Grava os registros em CSV ou JSON, conforme a extensão do arquivo."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if path.endswith(".csv"):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows({k: r.get(k) for k in FIELDS} for r in records)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=2)
+
+def load_results(path):
+    """Lê registros gravados por save_results (CSV ou JSON)."""
+    with open(path, "r", encoding="utf-8") as f:
+        if not path.endswith(".csv"):
+            return json.load(f)
+        return [{k: (float(v) if k in NUMERIC_FIELDS and v != "" else (v or None)) for k, v in row.items()}
+                for row in csv.DictReader(f)]
+
+## Comparação com a base:
+def compare(records, baseline, time_tolerance=0.10, min_time_delta=0.10, gap_tolerance=1e-3):
+    """
+    Compara cada (instância, configuração) com a base e retorna as linhas com
+    os alertas encontrados:
+      - LENTO: tempo de parede acima da base em mais de time_tolerance (e de min_time_delta segundos);
+      - GAP: gap final maior que o da base em mais de gap_tolerance;
+      - OBJETIVO: solução pior que a da base;
+      - STATUS: a base provou otimalidade e a execução atual não;
+      - INVALIDA: o verificador (avaliacao.problemas) apontou problemas na solução atual;
+      - NOVO / AUSENTE: par presente só na execução atual / só na base.
+    """
+    base = {(r["instance"], r["config"]): r for r in baseline}
+    current = {(r["instance"], r["config"]): r for r in records}
+    rows = []
+    for key in sorted(set(base) | set(current)):
+        old, new = base.get(key), current.get(key)
+        flags = []
+        if old is None:
+            flags.append("NOVO")
+        elif new is None:
+            flags.append("AUSENTE")
+        else:
+            if (new["wall_time"] > old["wall_time"] * (1 + time_tolerance)
+                    and new["wall_time"] - old["wall_time"] > min_time_delta):
+                flags.append("LENTO")
+            if old.get("gap") is not None and (new.get("gap") is None or new["gap"] > old["gap"] + gap_tolerance):
+                flags.append("GAP")
+            if old.get("objective") is not None and (
+                    new.get("objective") is None or new["objective"] > old["objective"] + 1e-6 * max(1.0, abs(old["objective"]))):
+                flags.append("OBJETIVO")
+            if old["status"] == "OPTIMAL" and new["status"] != "OPTIMAL":
+                flags.append("STATUS")
+        if new is not None and new.get("violations"):
+            flags.append("INVALIDA")
+        rows.append({"instance": key[0], "config": key[1], "base": old, "atual": new, "alertas": flags})
+    return rows
+
+def print_comparison(rows):
+    """Imprime a tabela de comparação e retorna o número de linhas com alerta."""
+    def fmt(r, field, spec):
+        return format(r[field], spec) if r is not None and r.get(field) is not None else "-"
+
+    print("\n+--------------------+--------------+------------+------------+----------+----------+----------------------+")
+    print("| Instância          | Configuração | Base (s)   | Atual (s)  | Gap base | Gap atual| Alertas              |")
+    print("+--------------------+--------------+------------+------------+----------+----------+----------------------+")
+    for row in rows:
+        old, new = row["base"], row["atual"]
+        print(f"| {row['instance']:<18} | {row['config']:<12} | {fmt(old, 'wall_time', '.2f'):>10} "
+              f"| {fmt(new, 'wall_time', '.2f'):>10} | {fmt(old, 'gap', '.2%'):>8} | {fmt(new, 'gap', '.2%'):>8} "
+              f"| {', '.join(row['alertas']) or 'ok':<20} |")
+    print("+--------------------+--------------+------------+------------+----------+----------+----------------------+")
+    return sum(1 for row in rows if row["alertas"])
+
+## Linha de comando:
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos modelos A e B")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    gen = sub.add_parser("generate", help="gera instâncias aleatórias reprodutíveis")
+    gen.add_argument("sizes", type=int, nargs="+", help="número de locais (depósito incluso), de 2 a 500")
+    gen.add_argument("--seeds", type=int, nargs="+", default=[0])
+    gen.add_argument("--tightness", type=float, default=1.0, help="aperto dos deadlines (maior = mais apertado)")
+    gen.add_argument("--dir", default=INSTANCE_DIR)
+
+    run = sub.add_parser("run", help="executa as configurações e grava os resultados")
+    run.add_argument("--dir", default=INSTANCE_DIR, help="pasta com as instâncias (.txt)")
+    run.add_argument("--configs", nargs="+", default=["A", "B"], choices=sorted(CONFIGS))
+    run.add_argument("--time-limit", type=float, default=60)
+    run.add_argument("--threads", type=int, default=None)
+    run.add_argument("--repeats", type=int, default=1)
+    run.add_argument("--output", default=os.path.join(RESULTS_DIR, "resultados.json"), help=".json ou .csv")
+    run.add_argument("--baseline", action="store_true", help="grava também como nova base de comparação")
+
+    cmp_ = sub.add_parser("compare", help="compara uma execução com a base e aponta regressões")
+    cmp_.add_argument("results", nargs="?", default=os.path.join(RESULTS_DIR, "resultados.json"))
+    cmp_.add_argument("--baseline", default=BASELINE_PATH)
+    cmp_.add_argument("--time-tolerance", type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+    if args.command == "generate":
+        for path in generate_set(args.sizes, args.seeds, args.tightness, args.dir):
+            print(path)
+        return 0
+
+    if args.command == "run":
+        instances = sorted(parametro.iter_instances(args.dir), key=lambda inst: (len(inst[1]), inst[0]))
+        records = run_benchmark(instances, args.configs, args.time_limit, args.threads, args.repeats)
+        save_results(records, args.output)
+        if args.baseline:
+            save_results(records, BASELINE_PATH)
+        print(f"Resultados gravados em {args.output}")
+        return 0
+
+    rows = compare(load_results(args.results), load_results(args.baseline), args.time_tolerance)
+    return 1 if print_comparison(rows) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
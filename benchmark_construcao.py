@@ -0,0 +1,38 @@
+## Benchmark do tempo de construção do modelo: construtor em laço x construtor matricial
+import sys
+import time
+import modelo_base
+from benchmark import generate_instance  # Gerador de instâncias reprodutíveis
+
+def measure_build(location_data, vectorized, preprocess=True):
+    """Tempo (s) para construir o modelo completo (A e B), sem heurística, e o tamanho resultante."""
+    start = time.perf_counter()
+    model = modelo_base.build_model(location_data, warm_start=False, preprocess=preprocess,
+                                    vectorized=vectorized)
+    elapsed = time.perf_counter() - start
+    size = (model.NumVars, model.NumConstrs)
+    model.dispose()
+    return elapsed, size
+
+def run(sizes=(10, 30, 50, 100, 200, 300, 500), repeats=3):
+    """Imprime a tabela comparativa de tempos de construção por tamanho de instância."""
+    rows = []
+    for n in sizes:
+        location_data = generate_instance(n, seed=n)
+        loop = min(measure_build(location_data, vectorized=False)[0] for _ in range(repeats))
+        times, size = zip(*(measure_build(location_data, vectorized=True) for _ in range(repeats)))
+        matrix = min(times)
+        rows.append(f"| {n:^5} | {size[0][0]:>10} | {size[0][1]:>10} | {loop:>10.3f} | {matrix:>10.3f} | {loop / matrix:>7.1f}x |")
+
+    # A tabela é impressa no fim para não se misturar com o log do Gurobi
+    print("\n+-------+------------+------------+------------+------------+----------+")
+    print("|   n   | Variáveis  | Restrições |  Laço (s)  | Matriz (s) | Speedup  |")
+    print("+-------+------------+------------+------------+------------+----------+")
+    for row in rows:
+        print(row)
+    print("+-------+------------+------------+------------+------------+----------+")
+
+if __name__ == "__main__":
+    # Tamanhos opcionais pela linha de comando: python benchmark_construcao.py 10 50 100
+    sizes = tuple(int(a) for a in sys.argv[1:]) or (10, 30, 50, 100, 200, 300, 500)
+    run(sizes)
@@ -0,0 +1,117 @@
+## Modelo B por bisseção no atraso máximo L (checagens de viabilidade com deadlines rígidos)
+import time
+import numpy as np
+import gurobipy as gp
+import heuristica
+import avaliacao
+import modelo_base
+import programacao_dinamica
+
+# Gap relativo para considerar o intervalo [inferior, superior] fechado
+TOLERANCIA = 1e-4
+
+def limite_inferior_trivial(location_data):
+    """Nenhum local é atendido antes da viagem direta do depósito: L >= dist(0, i) - deadline_i."""
+    dist, _, prazo = avaliacao.vetores_instancia(location_data)
+    return max(0.0, float(np.max(dist[0, 1:] - prazo[1:]))) if len(prazo) > 1 else 0.0
+
+def limite_inferior_lp(location_data, limite_superior, threads=None):
+    """Valor da relaxação linear do Modelo B (com o pré-processamento limitado pela heurística)."""
+    model = modelo_base.build_model(location_data, warm_start=False, objectives=('max',),
+                                    threads=threads, upper_bound=limite_superior)
+    model.setObjective(model._max_atraso, sense=gp.GRB.MINIMIZE)
+    relaxado = model.relax()
+    relaxado.optimize()
+    valor = relaxado.ObjVal if relaxado.status == gp.GRB.OPTIMAL else 0.0
+    relaxado.dispose()
+    model.dispose()
+    return valor
+
+def checar(location_data, L, time_limit, threads=None):
+    """
+    Existe rota com atraso máximo <= L, isto é, que respeite os deadlines
+    rígidos deadline_i + L? Instâncias pequenas usam a programação dinâmica;
+    as demais, o modelo sem objetivo com as janelas do pré-processamento
+    calculadas para L. Retorna (status, rota).
+    """
+    if len(location_data) <= programacao_dinamica.LIMITE_LOCAIS:
+        rota, _, _ = programacao_dinamica.resolver(location_data, 'max', limite_superior=L)
+        return ('FEASIBLE', rota) if rota is not None else ('INFEASIBLE', None)
+
+    model = modelo_base.build_model(location_data, warm_start=False, objectives=('max',),
+                                    time_limit=time_limit, threads=threads, upper_bound=L)
+    model._max_atraso.UB = L
+    try:
+        return modelo_base.check_feasible(model)
+    finally:
+        model.dispose()
+
+def resolver(location_data, time_limit=120, check_time_limit=30, threads=None, tolerancia=TOLERANCIA):
+    """
+    Bisseção no atraso máximo. O intervalo começa no limite superior da
+    heurística e no maior entre o limite trivial e o da relaxação linear.
+    Checagem viável: o superior cai para o atraso real da rota encontrada.
+    Checagem inviável: o inferior sobe para o ponto testado.
+    Status: OPTIMAL (intervalo fechado), TIME_LIMIT (tempo esgotado) ou
+    INCONCLUSIVE (ainda há tempo, mas as checagens sem resposta cobrem o
+    intervalo e o ponto testado não avança mais).
+    Retorna (rota, superior, inferior, histórico de checagens, status).
+    """
+    inicio = time.time()
+    dist, servico, prazo = avaliacao.vetores_instancia(location_data)
+
+    def atraso_maximo(rota):
+        return float(avaliacao.avaliar_rotas(rota, dist, servico, prazo)[3][0])
+
+    def passo(superior):
+        # Menor distância relevante abaixo do superior (tolerância relativa do intervalo)
+        return tolerancia * max(superior, 1.0)
+
+    rota = heuristica.resolver(location_data, objetivo='max')
+    superior = atraso_maximo(rota)
+    inferior = limite_inferior_trivial(location_data)
+    if superior - inferior > passo(superior):
+        inferior = max(inferior, limite_inferior_lp(location_data, superior, threads))
+
+    historico = []
+    status = 'OPTIMAL'
+    busca = inferior  # Extremo inferior usado para escolher L (sobe também após checagens sem resposta)
+    while superior - inferior > passo(superior):
+        restante = time_limit - (time.time() - inicio)
+        if restante <= 0:
+            status = 'TIME_LIMIT'
+            break
+        if superior - busca <= passo(superior):
+            status = 'INCONCLUSIVE'
+            break
+        L = (busca + superior) / 2
+        resultado, nova_rota = checar(location_data, L, min(check_time_limit, restante), threads)
+        historico.append({'L': L, 'resultado': resultado, 'tempo': time.time() - inicio})
+        if resultado == 'FEASIBLE':
+            rota, superior = nova_rota, min(superior, atraso_maximo(nova_rota))
+            # Pontos sem resposta acima do novo superior deixam de importar
+            busca = min(busca, max(inferior, superior - passo(superior)))
+        elif resultado == 'INFEASIBLE':
+            inferior = busca = L
+        else:
+            # Checagem sem resposta no tempo: o inferior provado não muda, mas a busca segue acima de L
+            busca = L
+    return rota, superior, inferior, historico, status
+
+def solve(location_data, time_limit=120, check_time_limit=30, threads=None):
+    """Modelo B por bisseção: tupla no mesmo formato de modelo_b.solve."""
+    inicio = time.time()
+    rota, superior, inferior, historico, status = resolver(location_data, time_limit, check_time_limit, threads)
+    chegadas, atrasos = heuristica.tempos_por_local(rota, location_data)
+    return (
+        superior,  # Valor da função objetivo (atraso máximo)
+        inferior,  # Limite inferior provado pelas checagens inviáveis
+        time.time() - inicio,  # Tempo de execução
+        (superior - inferior) / superior if superior > 1e-9 else 0.0,  # Gap relativo
+        len(historico),  # Número de checagens de viabilidade
+        heuristica.rota_para_arcos(rota),  # Arcos utilizados
+        chegadas,  # Tempo de chegada em cada local
+        atrasos,  # Lista com atrasos por local
+        superior,  # Valor do atraso máximo
+        {'status': status, 'metodo': 'bissecao', 'checagens': historico}  # Detalhes da solução
+    )
@@ -0,0 +1,97 @@
+## Cache persistente de resultados: instâncias sem mudança não são resolvidas de novo
+import os
+import json
+import pickle
+import hashlib
+import tempfile
+import numpy as np
+import heuristica
+
+# Pasta do cache e tamanho máximo em disco antes da remoção das entradas menos usadas
+CACHE_DIR = os.path.join("resultados", "cache")
+TAMANHO_MAXIMO = 200 * 1024 * 1024  # 200 MB
+
+# Módulos cujo código entra na chave: qualquer mudança neles invalida o cache
+MODULOS_SOLVER = ("modelo_base", "modelo_a", "modelo_b", "heuristica", "preprocessamento",
+                  "separacao", "programacao_dinamica", "bissecao", "lns", "formulacao",
+                  "modelo_highs", "precedencia", "avaliacao", "ajuste", "faixas")
+
+_versao = None
+
+def versao_codigo():
+    """Hash do código-fonte dos módulos do solver (calculado uma vez por processo)."""
+    global _versao
+    if _versao is None:
+        h = hashlib.sha256()
+        pasta = os.path.dirname(os.path.abspath(__file__))
+        for nome in MODULOS_SOLVER:
+            with open(os.path.join(pasta, f"{nome}.py"), "rb") as f:
+                h.update(f.read())
+        _versao = h.hexdigest()[:16]
+    return _versao
+
+def chave(location_data, modelo, parametros):
+    """
+    Chave do cache: hash dos dados da instância já lidos (não do arquivo, para
+    ignorar espaços e nomes), da variante do modelo ('A' ou 'B'), dos parâmetros
+    do solver e da versão do código.
+    """
+    h = hashlib.sha256(np.asarray(location_data, dtype=float).tobytes())
+    h.update(json.dumps({"modelo": modelo, "parametros": parametros, "versao": versao_codigo()},
+                        sort_keys=True).encode())
+    return h.hexdigest()
+
+def _caminho(k, pasta):
+    return os.path.join(pasta, f"{k}.pkl")
+
+def carregar(k, pasta=CACHE_DIR):
+    """Resultado guardado para a chave, ou None. A leitura renova a data de uso da entrada."""
+    caminho = _caminho(k, pasta)
+    try:
+        with open(caminho, "rb") as f:
+            resultado = pickle.load(f)
+        os.utime(caminho)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return None
+    return resultado
+
+def gravar(k, resultado, pasta=CACHE_DIR):
+    """Grava o resultado de forma atômica (arquivo temporário + rename), seguro entre processos."""
+    os.makedirs(pasta, exist_ok=True)
+    fd, temporario = tempfile.mkstemp(dir=pasta, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        pickle.dump(resultado, f)
+    os.replace(temporario, _caminho(k, pasta))
+
+def otimo(resultado):
+    """O resultado tem otimalidade provada e pode ser servido sem resolver?"""
+    return bool(resultado) and resultado[-1]["status"] == "OPTIMAL"
+
+def rota_inicial(resultado):
+    """Rota da incumbente guardada, usada como MIP start ao retomar um solve com tempo limite."""
+    return heuristica.arcos_para_rota(resultado[5]) if resultado else None
+
+def limpar(tamanho_maximo=TAMANHO_MAXIMO, pasta=CACHE_DIR):
+    """Remove as entradas usadas há mais tempo até o cache caber em tamanho_maximo bytes."""
+    if not os.path.isdir(pasta):
+        return 0
+    entradas = []
+    for nome in os.listdir(pasta):
+        caminho = os.path.join(pasta, nome)
+        try:
+            info = os.stat(caminho)
+        except FileNotFoundError:
+            continue
+        entradas.append((info.st_mtime, info.st_size, caminho))
+    total = sum(tamanho for _, tamanho, _ in entradas)
+    removidas = 0
+    for _, tamanho, caminho in sorted(entradas):
+        if total <= tamanho_maximo:
+            break
+        try:
+            os.remove(caminho)
+        except FileNotFoundError:
+            pass
+        total -= tamanho
+        removidas += 1
+    return removidas
@@ -0,0 +1,141 @@
+## Execução de um job (instância e modelo) em um processo do pool: escolha do método, cache,
+## solve e medição de tempos. Usado pelo agendador de main.py e pelo serviço (servico.py)
+import os
+import time
+import importlib
+import parametro
+
+# Modelos disponíveis: rótulo -> módulo com a função solve
+MODELS = {"A": "modelo_a", "B": "modelo_b"}
+
+# Objetivo de cada modelo, usado pelos métodos que não dependem do Gurobi
+OBJECTIVES = {"A": "total", "B": "max"}
+
+# Rótulo do job que resolve A e B no mesmo modelo (núcleo construído uma vez)
+SHARED_LABEL = "AB"
+
+# Tempo limite (s) de cada solve do Gurobi
+TIME_LIMIT = 120
+
+# Método de run_job para cada configuração do portfólio que pode ser o padrão aprendido
+# (as demais são variantes do MIP)
+PORTFOLIO_METHODS = {"dp": "DP", "lns": "LNS", "bissecao": "BISECTION"}
+
+def warm_worker(threads, backend):
+    """Inicializador dos processos do pool: ambiente do Gurobi pronto (licença já obtida) antes do primeiro job."""
+    if backend == "gurobi":
+        import ambiente
+        ambiente.iniciar(threads)
+
+def model_solver(model_label):
+    """Função solve do modelo, importada somente quando o primeiro job a usa."""
+    return importlib.import_module(MODELS[model_label]).solve
+
+def incumbent_path(instance_name, model_label):
+    """Caminho do arquivo JSONL com as incumbentes de uma instância/modelo."""
+    directory = os.path.join("resultados", "incumbentes")
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{instance_name}_{model_label}.jsonl")
+
+def solve_params(location_data, objective, dp_limit, lns_limit, backend="gurobi"):
+    """
+    Parâmetros que mudam o resultado de um solve e entram na chave do cache.
+    Quando o portfólio já aprendeu uma configuração padrão para o objetivo e a
+    faixa de tamanho (portfolio.padrao), ela escolhe o método; senão valem os
+    limites de tamanho (dp_limit e lns_limit).
+    """
+    import portfolio
+
+    size = len(location_data)
+    learned = portfolio.padrao(size, objective)
+    if learned is not None:
+        method = PORTFOLIO_METHODS.get(learned, "MIP")
+    else:
+        method = "DP" if size <= dp_limit else ("LNS" if lns_limit and size > lns_limit else "MIP")
+    params = {"method": method, "time_limit": TIME_LIMIT if method != "DP" else None, "learned": learned}
+    if method == "MIP":
+        params["backend"] = backend
+    if method == "MIP" and backend == "gurobi":
+        import ajuste
+        # Parâmetros do Gurobi: os da variante aprendida ou o preset da faixa de tamanho (resultados/presets.json)
+        params["gurobi"] = portfolio.PARAMETROS.get(learned) or ajuste.preset(size, objective)
+    return params
+
+def run_job(instance_name, location_data, model_label, threads, submitted_at,
+            dp_limit=None, force=False, lns_limit=None, backend="gurobi"):
+    """
+    Executa um único solve em um processo do pool e mede fila, parede e CPU.
+    O tempo de CPU do processo inclui todas as threads do Gurobi.
+    Instâncias com até dp_limit locais (padrão: programacao_dinamica.LIMITE_LOCAIS)
+    vão para a programação dinâmica exata, e as com mais de lns_limit locais
+    (padrão: lns.LIMITE_LOCAIS; 0 desliga) para o motor LNS, exceto quando o
+    portfólio aprendeu outro padrão para a faixa (ver solve_params). 'backend'
+    escolhe o solver do MIP: "gurobi" ou "highs" (SciPy, sem licença).
+    Resultados ótimos já guardados no cache são devolvidos sem resolver; os que
+    pararam no tempo limite são retomados com a incumbente como MIP start.
+    Com force, o cache é ignorado na leitura (mas atualizado).
+    """
+    import cache
+    import lns
+    import modelo_base
+    import programacao_dinamica
+
+    started_at = time.time()
+    cpu_start = time.process_time()
+    location_data = parametro.as_location_data(location_data)  # Array compacto -> listas só no processo do job
+    if dp_limit is None:
+        dp_limit = programacao_dinamica.LIMITE_LOCAIS
+    if lns_limit is None:
+        lns_limit = lns.LIMITE_LOCAIS
+    labels = list(MODELS) if model_label == SHARED_LABEL else [model_label]
+    params = {label: solve_params(location_data, OBJECTIVES[label], dp_limit, lns_limit, backend) for label in labels}
+    keys = {label: cache.chave(location_data, label, params[label]) for label in labels}
+    cached = {label: None if force else cache.carregar(keys[label]) for label in labels}
+    results = {label: res for label, res in cached.items() if cache.otimo(res)}
+    todo = [label for label in labels if label not in results]
+
+    shared = (backend == "gurobi" and len(todo) == len(MODELS) and not any(cached.values())
+              and all(params[label]["method"] == "MIP" for label in todo))
+    if shared:
+        logs = (incumbent_path(instance_name, "A"), incumbent_path(instance_name, "B"))
+        names = (f"{instance_name}_A", f"{instance_name}_B")  # Log e telemetria separados por modelo
+        results.update(zip(MODELS, modelo_base.solve_both(location_data, threads=threads, incumbent_logs=logs,
+                                                          time_limit=TIME_LIMIT, telemetry=names,
+                                                          params=tuple(params[label]["gurobi"] for label in MODELS))))
+    for label in [] if shared else todo:
+        method = params[label]["method"]
+        if method == "DP":
+            results[label] = programacao_dinamica.solve(location_data, OBJECTIVES[label])
+        elif method == "BISECTION":
+            results[label] = model_solver(label)(location_data, threads=threads, time_limit=TIME_LIMIT,
+                                                 engine="bisection")
+        elif method == "LNS":
+            results[label] = model_solver(label)(location_data, threads=threads, time_limit=TIME_LIMIT, engine="lns",
+                                                 initial_route=cache.rota_inicial(cached[label]))
+        else:
+            results[label] = model_solver(label)(location_data, threads=threads, time_limit=TIME_LIMIT,
+                                                 incumbent_log=incumbent_path(instance_name, label),
+                                                 initial_route=cache.rota_inicial(cached[label]),
+                                                 telemetry=f"{instance_name}_{label}" if backend == "gurobi" else None,
+                                                 backend=backend,
+                                                 params=params[label].get("gurobi"))
+    for label in todo:
+        if results[label]:
+            cache.gravar(keys[label], results[label])
+
+    result = tuple(results[label] for label in labels) if model_label == SHARED_LABEL else results[model_label]
+    stats = {
+        "instance": instance_name,
+        "model": model_label,
+        "threads": threads,
+        # A bisseção não parte de uma rota: o resultado guardado não é retomado
+        "cache": "hit" if not todo else ("resume" if any(cached[label] and params[label]["method"] != "BISECTION"
+                                                         for label in todo) else "miss"),
+        "queue_wait": started_at - submitted_at,
+        "wall_time": time.time() - started_at,
+        "cpu_time": time.process_time() - cpu_start,
+        # Montagem dos modelos (ambiente, heurísticas, pré-processamento) separada do tempo do otimizador
+        "setup_time": sum(results[label][-1].get("construcao", 0.0) for label in todo if results[label]),
+        "solver_time": sum(results[label][2] for label in todo if results[label]),
+    }
+    return result, stats
@@ -0,0 +1,13 @@
+## Faixas de tamanho das instâncias, comuns ao padrão aprendido do portfólio e aos presets do ajuste
+
+# Limites superiores das faixas (número de locais, depósito incluso)
+FAIXAS = (10, 20, 40, 100, 300)
+
+def faixa(n, faixas=FAIXAS):
+    """Rótulo da faixa de tamanho da instância (por exemplo, '21-40')."""
+    inferior = 1
+    for superior in faixas:
+        if n <= superior:
+            return f"{inferior}-{superior}"
+        inferior = superior + 1
+    return f">{faixas[-1]}"
@@ -0,0 +1,55 @@
+## Formulação dos modelos A e B independente do solver: os dados das restrições em arrays,
+## traduzidos para cada backend (Gurobi em modelo_base, HiGHS em modelo_highs)
+import numpy as np
+import avaliacao
+
+# Backends disponíveis para os modelos A e B
+BACKENDS = ('gurobi', 'highs')
+
+def dados(location_data, pre=None):
+    """
+    Dados comuns a todos os backends, com ou sem o pré-processamento 'pre':
+
+    - 'permitido': matriz n x n dos arcos utilizáveis (sem laços e sem os
+      arcos proibidos no pré-processamento).
+    - 'I', 'J', 'M': arcos com restrição de sequenciamento (destino j >= 1) e
+      seus Big-M, na forma y[j] - y[i] - M_ij * x[i,j] >= s_i + d_ij - M_ij
+      (lado direito em 'rhs').
+    - 'chegada_min' / 'chegada_max': limites das variáveis de chegada.
+    - 'precedencia_I', 'precedencia_J', 'precedencia_rhs': pares (i antes de j)
+      dos cortes y[j] - y[i] >= s_i + d_ij, quando o pré-processamento os gerou.
+    - 'dist', 'servico', 'prazo': vetores da instância.
+    """
+    n = len(location_data)
+    dist, servico, prazo = avaliacao.vetores_instancia(location_data)
+
+    permitido = ~np.eye(n, dtype=bool)
+    if pre is not None:
+        permitido &= ~pre['arcos_proibidos']
+
+    sequencia = permitido.copy()
+    sequencia[:, 0] = False  # O retorno ao depósito não tem restrição de tempo
+    I, J = np.nonzero(sequencia)
+    if pre is not None:
+        M = pre['M'][I, J]  # Big-M específico do arco
+    else:
+        M = np.full(len(I), dist.sum() + (n - 1) * servico.sum() + prazo.sum())  # Big-M global
+
+    prec = pre['precedencia'] if pre is not None and pre['cortes_precedencia'] else None
+    vazio = np.array([], dtype=int)
+    return {
+        'n': n,
+        'permitido': permitido,
+        'I': I,
+        'J': J,
+        'M': M,
+        'rhs': servico[I] + dist[I, J] - M,
+        'chegada_min': pre['chegada_min'] if pre is not None else np.zeros(n),
+        'chegada_max': pre['chegada_max'] if pre is not None else np.full(n, np.inf),
+        'precedencia_I': prec['I'] if prec is not None else vazio,
+        'precedencia_J': prec['J'] if prec is not None else vazio,
+        'precedencia_rhs': prec['rhs'] if prec is not None else np.array([]),
+        'dist': dist,
+        'servico': servico,
+        'prazo': prazo,
+    }
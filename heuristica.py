@@ -0,0 +1,188 @@
+## Heurística construtiva + busca local para gerar soluções iniciais (MIP start)
+import time
+import numpy as np
+import avaliacao  # Avaliação vetorizada das rotas
+
+def _melhor_indice(total, maximo, objetivo):
+    # Critério lexicográfico: objetivo principal e o outro como desempate
+    if objetivo == 'max':
+        return int(np.lexsort((total, maximo))[0])
+    return int(np.lexsort((maximo, total))[0])
+
+def _valor(total, maximo, objetivo):
+    return (maximo, total) if objetivo == 'max' else (total, maximo)
+
+## Construção:
+def rotas_iniciais(dist, servico, prazo):
+    """Gera rotas construtivas: EDD, vizinho mais próximo e menor folga de deadline."""
+    n = len(prazo)
+    clientes = np.arange(1, n)
+    rotas = [np.concatenate(([0], clientes[np.argsort(prazo[1:], kind='stable')]))]
+
+    for criterio in ('distancia', 'folga'):
+        rota, atual, tempo = [0], 0, 0.0
+        livres = np.ones(n, dtype=bool)
+        livres[0] = False
+        for _ in range(n - 1):
+            candidatos = np.flatnonzero(livres)
+            chegada = tempo + servico[atual] + dist[atual, candidatos]
+            if criterio == 'distancia':
+                chave = dist[atual, candidatos]
+            else:
+                # Prioriza quem está mais perto de estourar o prazo
+                chave = prazo[candidatos] - chegada
+            escolhido = candidatos[int(np.argmin(chave))]
+            tempo += servico[atual] + dist[atual, escolhido]
+            rota.append(escolhido)
+            livres[escolhido] = False
+            atual = escolhido
+        rotas.append(np.asarray(rota))
+    return np.vstack(rotas)
+
+## Vizinhanças (o depósito permanece fixo na posição 0):
+# Cada vizinhança é gerada em blocos de no máximo ELEMENTOS_POR_BLOCO posições
+# (linhas x locais), para que a memória não cresça com n³ em instâncias grandes
+ELEMENTOS_POR_BLOCO = 2_000_000
+
+def _linhas_por_bloco(n):
+    return max(1, ELEMENTOS_POR_BLOCO // n)
+
+def _pares(n):
+    # Pares de posições (i, j), 1 <= i < j < n
+    i, j = np.triu_indices(n, k=1)
+    sel = i >= 1
+    return i[sel], j[sel]
+
+def _vizinhos_2opt(rota):
+    n = len(rota)
+    i, j = _pares(n)
+    p = np.arange(n)[None, :]
+    bloco = _linhas_por_bloco(n)
+    for inicio in range(0, len(i), bloco):
+        bi, bj = i[inicio:inicio + bloco, None], j[inicio:inicio + bloco, None]
+        dentro = (p >= bi) & (p <= bj)
+        yield rota[np.where(dentro, bi + bj - p, p)]
+
+def _vizinhos_swap(rota):
+    n = len(rota)
+    i, j = _pares(n)
+    bloco = _linhas_por_bloco(n)
+    for inicio in range(0, len(i), bloco):
+        bi, bj = i[inicio:inicio + bloco], j[inicio:inicio + bloco]
+        p = np.broadcast_to(np.arange(n), (len(bi), n)).copy()
+        linhas = np.arange(len(bi))
+        p[linhas, bi], p[linhas, bj] = bj, bi
+        yield rota[p]
+
+def _vizinhos_oropt(rota, tamanhos=(1, 2, 3)):
+    n = len(rota)
+    posicoes = np.arange(n, dtype=float)
+    bloco = _linhas_por_bloco(n)
+    vizinhos, linhas = [], 0
+    for tam in tamanhos:
+        for i in range(1, n - tam + 1):
+            # Posições de inserção fora do segmento (insere logo após a posição j)
+            j = np.array([k for k in range(n) if k < i - 1 or k >= i + tam])
+            if len(j) == 0:
+                continue
+            chave = np.broadcast_to(posicoes, (len(j), n)).copy()
+            chave[:, i:i + tam] = j[:, None] + 0.5 + np.arange(tam) / (tam + 1)
+            vizinhos.append(rota[np.argsort(chave, axis=1, kind='stable')])
+            linhas += len(j)
+            if linhas >= bloco:
+                yield np.vstack(vizinhos)
+                vizinhos, linhas = [], 0
+    if vizinhos:
+        yield np.vstack(vizinhos)
+
+def melhora(valor, atual):
+    """Compara (objetivo principal, desempate): melhora no principal ou empate nele e melhora no desempate."""
+    return valor[0] < atual[0] - 1e-9 or (abs(valor[0] - atual[0]) <= 1e-9 and valor[1] < atual[1] - 1e-9)
+
+def busca_local(rota, dist, servico, prazo, objetivo='total', limite_tempo=1.0):
+    """Melhoria por 2-opt, or-opt e swap (melhor vizinho) até um ótimo local."""
+    inicio = time.time()
+    _, _, total, maximo = avaliacao.avaliar_rotas(rota, dist, servico, prazo)
+    atual = _valor(total[0], maximo[0], objetivo)
+    melhorou = True
+    while melhorou and time.time() - inicio < limite_tempo:
+        melhorou = False
+        for vizinhanca in (_vizinhos_2opt, _vizinhos_oropt, _vizinhos_swap):
+            # Melhor vizinho entre todos os blocos da vizinhança
+            melhor, melhor_valor = None, None
+            for candidatos in vizinhanca(rota):
+                _, _, total, maximo = avaliacao.avaliar_rotas(candidatos, dist, servico, prazo)
+                k = _melhor_indice(total, maximo, objetivo)
+                valor = _valor(total[k], maximo[k], objetivo)
+                if melhor_valor is None or valor < melhor_valor:
+                    melhor, melhor_valor = candidatos[k].copy(), valor
+                if time.time() - inicio >= limite_tempo:
+                    break
+            if melhor is not None and melhora(melhor_valor, atual):
+                rota, atual, melhorou = melhor, melhor_valor, True
+                break
+    return rota
+
+## Interface principal:
+def resolver(location_data, objetivo='total', limite_tempo=1.0):
+    """
+    Constrói rotas iniciais e aplica busca local. 'objetivo' é 'total'
+    (soma dos atrasos, Modelo A) ou 'max' (maior atraso, Modelo B).
+    Retorna a melhor permutação encontrada (começando em 0).
+    """
+    dist, servico, prazo = avaliacao.vetores_instancia(location_data)
+    if len(location_data) <= 2:
+        return np.arange(len(location_data))
+
+    melhor, melhor_valor = None, None
+    for rota in rotas_iniciais(dist, servico, prazo):
+        rota = busca_local(rota, dist, servico, prazo, objetivo, limite_tempo)
+        _, _, total, maximo = avaliacao.avaliar_rotas(rota, dist, servico, prazo)
+        valor = _valor(total[0], maximo[0], objetivo)
+        if melhor_valor is None or valor < melhor_valor:
+            melhor, melhor_valor = rota, valor
+    return melhor
+
+def rota_para_arcos(rota):
+    """Converte uma permutação em lista de arcos (i, j), incluindo o retorno ao depósito."""
+    rota = [int(i) for i in rota]
+    return list(zip(rota, rota[1:] + rota[:1]))
+
+def arcos_para_rota(arcos):
+    """Converte a lista de arcos (i, j) de uma solução na permutação a partir do depósito."""
+    sucessor = dict(arcos)
+    rota, atual = [0], sucessor[0]
+    while atual != 0 and len(rota) < len(sucessor):
+        rota.append(atual)
+        atual = sucessor[atual]
+    return np.asarray(rota)
+
+def tempos_por_local(rota, location_data):
+    """Retorna (chegadas, atrasos) indexados pelo número do local."""
+    chegadas, atrasos, _, _ = avaliacao.avaliar(rota, *avaliacao.vetores_instancia(location_data))
+    return chegadas[0].tolist(), atrasos[0].tolist()
+
+def solve(location_data, objetivo='total', limite_tempo=1.0):
+    """
+    Modo "somente heurística": retorna uma tupla no mesmo formato de
+    modelo_a.solve (objetivo 'total') ou modelo_b.solve (objetivo 'max').
+    Limite inferior e gap são os triviais (0 e 100%).
+    """
+    inicio = time.time()
+    rota = resolver(location_data, objetivo, limite_tempo)
+    chegadas, atrasos = tempos_por_local(rota, location_data)
+    total, maximo = sum(atrasos[1:]), max(atrasos[1:], default=0.0)
+    valor = maximo if objetivo == 'max' else total
+    resultado = (
+        valor,  # Valor da função objetivo
+        0.0,  # Limite inferior trivial (atrasos são não negativos)
+        time.time() - inicio,  # Tempo de execução
+        1.0 if valor > 1e-9 else 0.0,  # Gap relativo
+        0,  # Nenhum nó explorado
+        rota_para_arcos(rota),  # Arcos escolhidos
+        chegadas,  # Tempos de chegada
+        atrasos  # Tempos de atraso
+    )
+    if objetivo == 'max':
+        resultado += (maximo,)  # Valor do atraso máximo
+    return resultado + ({'status': 'HEURISTIC'},)  # Detalhes da solução
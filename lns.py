@@ -0,0 +1,184 @@
+## Busca em vizinhança grande (LNS / fix-and-optimize) com subproblemas da formulação dos modelos A e B
+import time
+import numpy as np
+import heuristica
+import avaliacao
+import modelo_base
+
+# Instâncias com mais locais (depósito incluso) que isso vão para o LNS (execucao.run_job):
+# acima disso o modelo completo raramente fecha o gap no tempo limite
+LIMITE_LOCAIS = 50
+
+# Clientes liberados por subproblema, tempo (s) de cada sub-MIP e orçamento total padrão
+TAMANHO_JANELA = 12
+TEMPO_SUBPROBLEMA = 2.0
+TEMPO_TOTAL = 120
+
+# Vizinhanças (trechos consecutivos da rota): posição aleatória, trecho que termina no
+# cliente mais atrasado e trecho em torno de um cliente atrasado sorteado pelo atraso
+VIZINHANCAS = ('janela', 'atraso', 'atrasado')
+
+def _trecho(vizinhanca, atrasos, k, rng):
+    """Posições [inicio, fim) da rota liberadas para o sub-MIP."""
+    n = len(atrasos)
+    if vizinhanca == 'atraso' and atrasos.max() > 0:
+        # Antecipar o cliente mais atrasado exige mexer em quem vem antes dele
+        fim = int(np.argmax(atrasos)) + 1
+        inicio = max(1, fim - k)
+    elif vizinhanca == 'atrasado' and atrasos.max() > 0:
+        centro = int(rng.choice(n, p=atrasos / atrasos.sum()))
+        inicio = min(max(1, centro - k // 2), max(1, n - k))
+    else:
+        inicio = int(rng.integers(1, max(2, n - k + 1)))
+    return inicio, min(n, inicio + k)
+
+def subinstancia(location_data, rota, chegadas, inicio, fim, objetivo):
+    """
+    Monta a instância do sub-MIP do trecho rota[inicio:fim]: o local anterior
+    ao trecho vira o depósito (tempos relativos à chegada nele) e o posterior,
+    se houver, vira o último cliente. Como o restante da rota fica fixo, cada
+    cliente j depois do trecho chega 'deslocamento_j' após esse último cliente,
+    e seu atraso depende só da chegada nele (prazo efetivo e_j = d_j - deslocamento_j):
+    no Modelo B basta dar ao último cliente o menor e_j; no Modelo A a soma
+    dos atrasos seguintes entra como função linear por partes da chegada.
+    Retorna (location_data do sub-MIP, prazos efetivos e_j ou None).
+    """
+    n = len(rota)
+    anterior = location_data[rota[inicio - 1]]
+    t0 = chegadas[inicio - 1]
+    sub = [[anterior[0], anterior[1], anterior[2], 0]]
+    sub += [[p[0], p[1], p[2], p[3] - t0] for p in (location_data[v] for v in rota[inicio:fim])]
+    if fim == n:
+        return sub, None
+
+    prazos = np.asarray([location_data[v][3] for v in rota[fim:]], dtype=float)
+    efetivos = prazos - (chegadas[fim:] - chegadas[fim]) - t0
+    ultimo = location_data[rota[fim]]
+    # No Modelo A o atraso do último cliente vem da função linear por partes: prazo sem efeito
+    prazo_ultimo = efetivos.min() if objetivo == 'max' else efetivos.max() + chegadas[-1] + 1.0
+    sub.append([ultimo[0], ultimo[1], ultimo[2], prazo_ultimo])
+    return sub, efetivos
+
+def _resolver_trecho(location_data, rota, chegadas, inicio, fim, objetivo, limite, tempo, threads):
+    """Reotimiza o trecho como um MIP pequeno; retorna a nova ordem dos seus clientes ou None."""
+    sub, efetivos = subinstancia(location_data, rota, chegadas, inicio, fim, objetivo)
+    m = len(sub)
+    # Folga numérica: a ordem atual do trecho atinge o limite exatamente e serve de MIP start
+    model = modelo_base.build_model(sub, warm_start=False, objectives=(objetivo,), time_limit=tempo,
+                                    threads=threads, upper_bound=limite + 1e-6 * (1.0 + limite), verbose=False)
+    try:
+        if efetivos is not None:
+            ultimo = m - 1
+            model._vars[ultimo, 0].LB = 1  # O local seguinte ao trecho fecha o subproblema
+            if objetivo == 'total':
+                # w_ultimo = soma de max(0, y_ultimo - e_j) sobre o restante da rota (convexa)
+                e = np.sort(efetivos)
+                xs = np.concatenate(([e[0] - 1.0], e, [e[-1] + 1.0]))
+                ys = np.maximum(xs[:, None] - e[None, :], 0.0).sum(axis=1)
+                model.addGenConstrPWL(model._chegada[ultimo], model._atraso[ultimo], xs.tolist(), ys.tolist())
+        resultado = modelo_base.solve_model(model, objetivo, rota_inicial=np.arange(m))
+        if not resultado:
+            return None
+        ordem = modelo_base.rota_da_solucao(model)
+    finally:
+        model.dispose()
+    trecho = rota[inicio:fim]
+    return np.asarray([trecho[i - 1] for i in ordem[1:] if i <= len(trecho)])
+
+def resolver(location_data, objetivo='total', tamanho_janela=TAMANHO_JANELA,
+             tempo_subproblema=TEMPO_SUBPROBLEMA, tempo_total=TEMPO_TOTAL, threads=None, semente=0,
+             compartilhado=None, rota_inicial=None, verbose=False):
+    """
+    Parte da rota heurística (ou de 'rota_inicial') e, até esgotar 'tempo_total', fixa toda a rota
+    exceto um trecho de 'tamanho_janela' clientes, que é reotimizado pela
+    formulação do Modelo A ou B (subinstancia) por no máximo
+    'tempo_subproblema' segundos. A nova rota passa pela busca local da
+    heurística e é aceita se melhorar o objetivo.
+    Após uma rodada inteira sem melhora, a janela cresce em 2 clientes (até o dobro).
+    Com 'compartilhado' (portfólio), troca incumbentes com as demais
+    configurações e para quando uma delas prova o resultado.
+    Com 'verbose', imprime cada melhora aceita (o histórico as registra sempre).
+    Retorna (rota, valor, histórico).
+    """
+    inicio = time.time()
+    rng = np.random.default_rng(semente)
+    dist, servico, prazo = avaliacao.vetores_instancia(location_data)
+    n = len(location_data)
+
+    def avaliar(rota):
+        chegadas, atrasos, total, maximo = avaliacao.avaliar_rotas(rota, dist, servico, prazo)
+        valor = (maximo[0], total[0]) if objetivo == 'max' else (total[0], maximo[0])  # (principal, desempate)
+        return chegadas[0], atrasos[0], valor
+
+    rota = np.asarray(rota_inicial) if rota_inicial is not None else heuristica.resolver(location_data, objetivo)
+    chegadas, atrasos, valor = avaliar(rota)
+    historico = [{'tempo': time.time() - inicio, 'valor': valor[0],
+                  'vizinhanca': 'inicial' if rota_inicial is not None else 'heuristica'}]
+    if compartilhado is not None:
+        compartilhado.publicar(valor[0], rota)
+
+    k = min(tamanho_janela, n - 1)
+    sem_melhora, iteracoes = 0, 0
+    while n > 2 and valor[0] > 1e-9 and tempo_total - (time.time() - inicio) > 0.05:
+        if compartilhado is not None:
+            if compartilhado.parar.is_set():
+                break
+            # Parte da melhor rota do portfólio quando outra configuração a encontrou
+            if compartilhado.valor() < valor[0] - 1e-6:
+                rota = compartilhado.melhor()[1]
+                chegadas, atrasos, valor = avaliar(rota)
+                historico.append({'tempo': time.time() - inicio, 'valor': valor[0], 'vizinhanca': 'portfolio'})
+        restante = tempo_total - (time.time() - inicio)
+        vizinhanca = VIZINHANCAS[iteracoes % len(VIZINHANCAS)]
+        iteracoes += 1
+        a, b = _trecho(vizinhanca, atrasos, k, rng)
+
+        # No Modelo A o limite do subproblema é a parte do objetivo que depende do trecho
+        limite = valor[0] if objetivo == 'max' else float(atrasos[a:].sum())
+        ordem = _resolver_trecho(location_data, rota, chegadas, a, b, objetivo, limite,
+                                 min(tempo_subproblema, restante), threads)
+        if ordem is not None and len(ordem) == b - a:
+            nova = np.concatenate((rota[:a], ordem, rota[b:]))
+            # A troca do sub-MIP costuma abrir novos movimentos simples para a busca local
+            nova = heuristica.busca_local(nova, dist, servico, prazo, objetivo,
+                                          min(1.0, tempo_total - (time.time() - inicio)))
+            novas_chegadas, novos_atrasos, novo_valor = avaliar(nova)
+            if heuristica.melhora(novo_valor, valor):
+                rota, chegadas, atrasos, valor = nova, novas_chegadas, novos_atrasos, novo_valor
+                historico.append({'tempo': time.time() - inicio, 'valor': valor[0], 'vizinhanca': vizinhanca})
+                if compartilhado is not None:
+                    compartilhado.publicar(valor[0], rota)
+                if verbose:
+                    print(f"   LNS {objetivo}: {valor[0]:.2f} ({vizinhanca}, janela {k}, {historico[-1]['tempo']:.1f}s)")
+                sem_melhora = 0
+                continue
+        sem_melhora += 1
+        # Uma rodada completa (a rota inteira coberta por janelas) sem melhora: amplia a janela
+        if sem_melhora >= max(len(VIZINHANCAS), (n - 1) // k) and k < min(n - 1, 2 * tamanho_janela):
+            k, sem_melhora = min(k + 2, n - 1, 2 * tamanho_janela), 0
+    return rota, valor[0], historico
+
+def solve(location_data, objetivo='total', time_limit=TEMPO_TOTAL, threads=None,
+          tamanho_janela=TAMANHO_JANELA, tempo_subproblema=TEMPO_SUBPROBLEMA, compartilhado=None,
+          rota_inicial=None, verbose=False):
+    """LNS com tupla no formato de modelo_a.solve ('total') ou modelo_b.solve ('max')."""
+    inicio = time.time()
+    rota, valor, historico = resolver(location_data, objetivo, tamanho_janela, tempo_subproblema,
+                                      time_limit, threads, compartilhado=compartilhado, rota_inicial=rota_inicial,
+                                      verbose=verbose)
+    chegadas, atrasos = heuristica.tempos_por_local(rota, location_data)
+    valor = float(valor)
+    resultado = (
+        valor,  # Valor da função objetivo
+        0.0,  # Limite inferior trivial (o LNS não prova otimalidade)
+        time.time() - inicio,  # Tempo de execução
+        1.0 if valor > 1e-9 else 0.0,  # Gap relativo
+        len(historico) - 1,  # Melhorias aceitas (no lugar dos nós da árvore de busca)
+        heuristica.rota_para_arcos(rota),  # Arcos escolhidos
+        chegadas,  # Tempos de chegada
+        atrasos  # Tempos de atraso
+    )
+    if objetivo == 'max':
+        resultado += (max(atrasos),)  # Valor do atraso máximo
+    status = 'OPTIMAL' if valor <= 1e-9 else 'HEURISTIC'  # Atraso zero é ótimo
+    return resultado + ({'status': status, 'metodo': 'LNS', 'historico': historico},)  # Detalhes da solução
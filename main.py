@@ -1,74 +1,330 @@
 import time
 import parametro as parametro
-import modelo_a
-import modelo_b
-import resolucao
 import gc
-from concurrent.futures import ThreadPoolExecutor
+import sys
+import heapq
+import argparse
+import itertools
 import multiprocessing
+import os
+import execucao  # Jobs executados nos processos do pool (leve: os solvers são importados por job)
 
-def process_instance(instance_data):
+# Os módulos pesados (gurobipy, numpy, matplotlib, networkx) só são importados
+# dentro das funções que precisam deles, para que validações e execuções
+# servidas pelo cache não paguem o custo de importação.
+
+# Orçamento de tempo (ms) para 'import main', conferido com python -X importtime
+STARTUP_BUDGET_MS = 150
+
+# Módulos que não podem ser importados na inicialização
+HEAVY_MODULES = ("gurobipy", "numpy", "matplotlib", "networkx")
+
+# Jobs em andamento por processo do pool: os processos não ficam ociosos entre jobs e só essas
+# instâncias (mais a janela de ordenação) ficam em memória, qualquer que seja o tamanho do lote
+JOBS_PER_WORKER = 2
+
+def expected_cost(location_data):
+    """Estimativa do esforço de uma instância a partir do tamanho (n² binárias, árvore de busca)."""
+    return len(location_data) ** 3
+
+def plan_jobs(instances, shared_model=False, window=None):
+    """
+    Gera um job por (instância, modelo), do mais demorado esperado para o
+    menos demorado, para que as instâncias grandes não fiquem no fim da fila.
+    As instâncias são lidas sob demanda: com window, a ordenação vale dentro
+    de uma janela de até window jobs (None ordena todos, lendo tudo antes).
+    Com shared_model, cada instância vira um único job "AB" que resolve os dois
+    objetivos sobre o mesmo modelo.
     """
-    Processa uma única instância, resolvendo os modelos A e B,
-    registrando a solução e limpando a memória.
+    labels = [execucao.SHARED_LABEL] if shared_model else list(execucao.MODELS)
+    heap = []
+    for order, (name, data) in enumerate(instances):
+        for label in labels:
+            heapq.heappush(heap, (-expected_cost(data), order, label, (name, data, label)))
+        while window is not None and len(heap) > window:
+            yield heapq.heappop(heap)[-1]
+    while heap:
+        yield heapq.heappop(heap)[-1]
+
+def split_core_budget(core_budget, job_count):
+    """Divide o orçamento de núcleos: (processos simultâneos, threads do Gurobi por processo)."""
+    workers = max(1, min(core_budget, job_count))
+    return workers, max(1, core_budget // workers)
+
+def finish_instance(instance_name, location_data, res_a, res_b, plots=None, text=False):
+    """
+    Registra a solução de uma instância com os dois modelos prontos no armazém
+    de resultados (com text, também a tabela em resultados/solucao_<instância>.txt)
+    e envia as rotas para a fila de gráficos (renderizados fora do laço de resolução).
     """
-    instance_name, location_data = instance_data
-    print(f"🚀 Processando instância: {instance_name}...")
-
-    # --- Resolução do Modelo A ---
-    print(f"   - Resolvendo Modelo A para {instance_name}...")
-    start_a = time.time()
-    res_a = modelo_a.solve(location_data)
-    end_a = time.time()
-    if res_a:
-        print(f"   - Modelo A finalizado em {end_a - start_a:.2f}s. Atraso Total: {res_a[0]:.2f}")
-    else:
-        print(f"   - Modelo A não encontrou solução para {instance_name} no tempo limite.")
-
-    # --- Resolução do Modelo B ---
-    print(f"   - Resolvendo Modelo B para {instance_name}...")
-    start_b = time.time()
-    res_b = modelo_b.solve(location_data)
-    end_b = time.time()
-    if res_b:
-        print(f"   - Modelo B finalizado em {end_b - start_b:.2f}s. Maior Atraso: {res_b[0]:.2f}")
-    else:
-        print(f"   - Modelo B não encontrou solução para {instance_name} no tempo limite.")
-
-    # --- Logging e Geração de Gráficos ---
-    print(f"   - Gerando arquivos de resultado para {instance_name}...")
-    resolucao.log_solution(instance_name, res_a, res_b)
-
-    if res_a:
-        route_a = res_a[5] 
-        resolucao.plot_resolucao(f"{instance_name}_A", location_data, route_a)
-
-    if res_b:
-        route_b = res_b[5]
-        resolucao.plot_resolucao(f"{instance_name}_B", location_data, route_b)
+    import armazem
+
+    print(f"   - Gravando os resultados de {instance_name}...")
+    location_data = parametro.as_location_data(location_data)  # O verificador espera as listas, não o array compacto
+    armazem.gravar_instancia(instance_name, res_a, res_b, location_data)
+    if text:
+        import resolucao
+        resolucao.log_solution(instance_name, res_a, res_b, location_data)
+
+    if plots is not None:
+        if res_a:
+            plots.submit(f"{instance_name}_A", location_data, res_a[5])
+        if res_b:
+            plots.submit(f"{instance_name}_B", location_data, res_b[5])
 
     del res_a, res_b
     gc.collect()
     print(f"✅ Instância {instance_name} finalizada.\n")
 
-if __name__ == "__main__":
+def report_jobs(job_stats):
+    """Imprime a espera na fila, o tempo de parede (montagem e otimizador) e o tempo de CPU de cada job."""
+    print("\n+------------+--------+---------+--------+-----------+-----------+-----------+-----------+-----------+")
+    print("| Instância  | Modelo | Threads | Cache  | Fila (s)  | Parede (s)| Montagem  | Solver (s)| CPU (s)   |")
+    print("+------------+--------+---------+--------+-----------+-----------+-----------+-----------+-----------+")
+    for s in sorted(job_stats, key=lambda s: (s["instance"], s["model"])):
+        print(f"| {s['instance']:<10} | {s['model']:^6} | {s['threads']:^7} | {s['cache']:^6} | {s['queue_wait']:>9.2f} "
+              f"| {s['wall_time']:>9.2f} | {s['setup_time']:>9.2f} | {s['solver_time']:>9.2f} "
+              f"| {s['cpu_time']:>9.2f} |")
+    print("+------------+--------+---------+--------+-----------+-----------+-----------+-----------+-----------+")
+
+def run_scheduler(instances, core_budget=None, shared_model=None,
+                  dp_limit=None, force=False, cache_size=None, plots=True, plot_batch=None,
+                  lns_limit=None, backend="gurobi", text=False):
+    """
+    Resolve todas as instâncias (lista ou iterador de (nome, array)) em um pool
+    de processos. Cada (instância, modelo) é um job separado, e o orçamento
+    global de núcleos é dividido entre os processos simultâneos via parâmetro
+    Threads do Gurobi. As instâncias são consumidas sob demanda: ficam no pool
+    no máximo JOBS_PER_WORKER jobs por processo, e o próximo é enviado quando
+    um termina, de modo que a memória não cresce com o tamanho do lote.
+    Sem indicação explícita, usa o modelo compartilhado (um job por instância)
+    quando já há instâncias suficientes para ocupar todos os núcleos.
+    Instâncias pequenas (até dp_limit locais; 0 desliga) são resolvidas por
+    programação dinâmica em vez do Gurobi, e as grandes (mais de lns_limit
+    locais) pelo motor LNS, que reotimiza trechos da rota com sub-MIPs.
+    Com backend="highs" os MIPs não usam licença do Gurobi e cada modelo é um
+    job separado, para ocupar todos os núcleos.
+    O cache de resultados é consultado em cada job (force ignora) e, no fim,
+    reduzido a cache_size bytes (padrão: cache.TAMANHO_MAXIMO).
+    Os gráficos são gerados em um processo próprio enquanto as demais instâncias
+    são resolvidas (plots=False desliga; plot_batch agrupa rotas em painéis).
+    Os resultados vão para o armazém colunar (armazem.py); text também grava as
+    tabelas em texto por instância.
+    """
+    from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+    import cache
+    import resolucao
+
+    core_budget = core_budget or multiprocessing.cpu_count()
+    instances = iter(instances)
+
+    # Só as primeiras instâncias são lidas para escolher o modo e os processos; se o lote
+    # acabar antes, as contagens são exatas, senão já há jobs para ocupar todos os núcleos
+    head = list(itertools.islice(instances, core_budget * JOBS_PER_WORKER))
+    if shared_model is None:
+        shared_model = backend == "gurobi" and len(head) >= core_budget
+    workers, threads = split_core_budget(core_budget, len(head) * (1 if shared_model else len(execucao.MODELS)))
+    in_flight = workers * JOBS_PER_WORKER
+    jobs = plan_jobs(itertools.chain(head, instances), shared_model, window=in_flight)
+    del head
+    print(f"\n--- INICIANDO PROCESSAMENTO PARALELO: {workers} PROCESSOS x {threads} THREADS ({core_budget} NÚCLEOS) ---")
+
+    locations, pending = {}, {}  # Só as instâncias com jobs em andamento
+    job_stats = []
+    plot_pipeline = resolucao.PlotPipeline(batch_size=plot_batch, enabled=plots)
+    with ProcessPoolExecutor(max_workers=workers, initializer=execucao.warm_worker,
+                             initargs=(threads, backend)) as executor:
+        futures = {}
+
+        def submit_jobs():
+            # Completa o pool até in_flight jobs com os próximos da fila
+            for name, data, label in itertools.islice(jobs, in_flight - len(futures)):
+                print(f"🚀 Agendando instância {name} - Modelo {label}...")
+                locations[name] = data
+                pending.setdefault(name, {})
+                future = executor.submit(execucao.run_job, name, data, label, threads, time.time(), dp_limit,
+                                         force, lns_limit, backend)
+                futures[future] = (name, label)
+
+        submit_jobs()
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, label = futures.pop(future)
+                result, stats = future.result()
+                job_stats.append(stats)
+                # O job compartilhado devolve os resultados dos dois modelos
+                results = dict(zip(execucao.MODELS, result)) if label == execucao.SHARED_LABEL else {label: result}
+                for model_label, model_result in results.items():
+                    if model_result:
+                        print(f"   - Modelo {model_label} de {name} finalizado em {stats['wall_time']:.2f}s. "
+                              f"Objetivo: {model_result[0]:.2f} ({model_result[-1]['status']})")
+                    else:
+                        print(f"   - Modelo {model_label} não encontrou solução para {name} no tempo limite.")
+
+                # Quando os dois modelos da instância terminam, gera os arquivos de resultado
+                pending[name].update(results)
+                if len(pending[name]) == len(execucao.MODELS):
+                    finish_instance(name, locations.pop(name), pending[name]["A"], pending[name]["B"],
+                                    plot_pipeline, text)
+                    del pending[name]
+            submit_jobs()
+
+    images = plot_pipeline.close()
+    if images:
+        print(f"🖼️ {len(images)} imagens geradas em resultados/imagens.")
+    report_jobs(job_stats)
+    removed = cache.limpar(cache_size if cache_size is not None else cache.TAMANHO_MAXIMO)
+    if removed:
+        print(f"🧹 {removed} entradas antigas removidas do cache.")
+    return job_stats
+
+## Linha de comando:
+def command_solve(args):
+    """Resolve todas as instâncias da pasta (comportamento original do script)."""
     print("--- INICIANDO SCRIPT DE RESOLUÇÃO ---")
-    
-    instances = parametro.read_instances()
-    print(f"🔍 Encontradas {len(instances)} instâncias.")
-    
-    if not instances:
+
+    # Instâncias em arrays estruturados compactos, lidas uma a uma conforme o pool pede novos jobs;
+    # o job converte a sua quando começa
+    instances = parametro.iter_instances(args.dir, strict=False)
+    first = next(instances, None)
+    if first is None:
         print("\n‼️ ERRO CRÍTICO: Nenhuma instância foi encontrada.")
         print("   Verifique se a pasta 'instancias' existe no mesmo diretório que o script.")
-        exit()
-    
+        return 1
+
     total_start_time = time.time()
-    
-    # Executa em paralelo usando todos os núcleos da CPU
-    num_threads = multiprocessing.cpu_count()
-    print(f"\n--- INICIANDO PROCESSAMENTO PARALELO COM {num_threads} THREADS ---")
-    with ThreadPoolExecutor(max_workers=num_threads) as executor:
-        executor.map(process_instance, instances)
+
+    # Executa em paralelo respeitando o orçamento de núcleos da CPU
+    job_stats = run_scheduler(itertools.chain([first], instances),
+                              core_budget=args.cores or multiprocessing.cpu_count(), force=args.force,
+                              cache_size=args.cache_size * 1024 * 1024 if args.cache_size else None,
+                              plots=not args.no_plots, plot_batch=args.plot_batch, lns_limit=args.lns_limit,
+                              backend=args.backend, text=args.text)
+    print(f"🔍 {len({s['instance'] for s in job_stats})} instâncias resolvidas.")
 
     total_end_time = time.time()
-    print(f"\n🎉 Tempo total de execução de todas as instâncias: {total_end_time - total_start_time:.2f} segundos")
\ No newline at end of file
+    print(f"\n🎉 Tempo total de execução de todas as instâncias: {total_end_time - total_start_time:.2f} segundos")
+    return 0
+
+def command_validate(args):
+    """Confere os arquivos de instância sem importar nenhum solver."""
+    problems = 0
+    for filepath in parametro.instance_paths(args.source):
+        issues = parametro.check_instance(filepath)
+        problems += len(issues)
+        print(f"{'✅' if not issues else '‼️'} {os.path.basename(filepath)}"
+              + "".join(f"\n   - {issue}" for issue in issues))
+    return 1 if problems else 0
+
+def command_report(args):
+    """Resumo da telemetria dos solves, do armazém de resultados e do cache."""
+    import armazem
+    import cache
+    import telemetria
+
+    telemetria.resumo(args.telemetry)
+    tabela, _ = armazem.abrir()
+    if len(tabela['n']):
+        print(f"Armazém: {len(tabela['n'])} solves em {armazem.PASTA} (último de cada instância e modelo)")
+        armazem.imprimir_resumo(armazem.resumo(tabela, armazem.ultimos(tabela)))
+    entries = [e for e in os.scandir(cache.CACHE_DIR) if e.name.endswith(".pkl")] if os.path.isdir(cache.CACHE_DIR) else []
+    size = sum(e.stat().st_size for e in entries)
+    print(f"Cache: {len(entries)} resultados, {size / 1024:.1f} KB em {cache.CACHE_DIR}")
+    return 0
+
+def command_bench(args):
+    """Repassa os argumentos para o benchmark (generate, run, compare)."""
+    import benchmark
+    return benchmark.main(args.bench_args)
+
+def command_serve(args):
+    """Repassa os argumentos para o serviço local de resolução (ver servico.py)."""
+    import servico
+    return servico.main(args.serve_args)
+
+def check_startup(budget_ms=STARTUP_BUDGET_MS):
+    """
+    Mede 'import main' com python -X importtime em um processo novo e confere
+    o orçamento de tempo e a ausência dos módulos pesados. Retorna (ok, ms, pesados).
+    """
+    import subprocess
+    here = os.path.dirname(os.path.abspath(__file__))
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"], cwd=here,
+                            capture_output=True, text=True, check=True).stderr
+    cumulative, heavy = {}, set()
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "cumulative" in line:
+            continue
+        _, total, name = line.split("|")
+        module = name.strip()
+        cumulative[module] = int(total) / 1000
+        if module.split(".")[0] in HEAVY_MODULES:
+            heavy.add(module.split(".")[0])
+    elapsed = cumulative.get("main", 0.0)
+    return elapsed <= budget_ms and not heavy, elapsed, sorted(heavy)
+
+def command_importtime(args):
+    ok, elapsed, heavy = check_startup(args.budget)
+    print(f"import main: {elapsed:.1f} ms (orçamento {args.budget} ms)"
+          + (f" | módulos pesados importados: {', '.join(heavy)}" if heavy else ""))
+    return 0 if ok else 1
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resolução das instâncias com os modelos A e B")
+    sub = parser.add_subparsers(dest="command")
+
+    solve = sub.add_parser("solve", help="resolve as instâncias (padrão sem subcomando)")
+    solve.add_argument("--dir", default=parametro.INSTANCE_DIR,
+                       help="instâncias: pasta, padrão glob ou arquivo .txt")
+    solve.add_argument("--cores", type=int, default=None, help="orçamento de núcleos (padrão: todos)")
+    solve.add_argument("--force", action="store_true", help="resolve de novo mesmo com resultado em cache")
+    solve.add_argument("--cache-size", type=int, default=None,
+                       help="tamanho máximo do cache de resultados (MB, padrão 200)")
+    solve.add_argument("--no-plots", action="store_true", help="não gera os gráficos das rotas")
+    solve.add_argument("--plot-batch", type=int, default=None,
+                       help="agrupa as rotas em imagens com até N painéis")
+    solve.add_argument("--lns-limit", type=int, default=None,
+                       help="instâncias com mais locais usam o motor LNS (padrão 50; 0 desliga)")
+    solve.add_argument("--backend", choices=["gurobi", "highs"], default="gurobi",
+                       help="solver dos MIPs (highs: SciPy, sem licença do Gurobi)")
+    solve.add_argument("--text", action="store_true",
+                       help="também grava as tabelas em resultados/solucao_<instância>.txt")
+    solve.set_defaults(handler=command_solve)
+
+    validate = sub.add_parser("validate", help="confere os arquivos de instância")
+    validate.add_argument("source", nargs="?", default=parametro.INSTANCE_DIR,
+                          help="pasta, padrão glob ou arquivo .txt")
+    validate.set_defaults(handler=command_validate)
+
+    report = sub.add_parser("report", help="resumo da telemetria, do armazém de resultados e do cache")
+    report.add_argument("--telemetry", default=os.path.join("resultados", "telemetria"))
+    report.set_defaults(handler=command_report)
+
+    bench = sub.add_parser("bench", help="benchmark: generate, run ou compare (ver benchmark.py)")
+    bench.add_argument("bench_args", nargs=argparse.REMAINDER)
+    bench.set_defaults(handler=command_bench)
+
+    serve = sub.add_parser("serve", add_help=False,
+                           help="serviço local: instâncias por HTTP, respostas em JSON (ver servico.py)")
+    serve.add_argument("serve_args", nargs=argparse.REMAINDER)
+    serve.set_defaults(handler=command_serve)
+
+    startup = sub.add_parser("importtime", help="confere o tempo de inicialização do CLI")
+    startup.add_argument("--budget", type=float, default=STARTUP_BUDGET_MS, help="orçamento em ms")
+    startup.set_defaults(handler=command_importtime)
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Sem subcomando (ou só com opções), mantém o comportamento original: resolver tudo
+    if not argv or argv[0].startswith("-") and argv[0] not in ("-h", "--help"):
+        argv = ["solve"] + argv
+    # As opções do serviço são do servico.py: repassadas sem validação aqui
+    args, extra = parser.parse_known_args(argv)
+    if args.command == "serve":
+        args.serve_args = extra + args.serve_args
+    elif extra:
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,580 @@
+## Núcleo compartilhado dos modelos A e B (roteamento + tempos), construído uma única vez
+import math
+import json
+import time
+import gurobipy as gp  # API do solver Gurobi
+import numpy as np
+import heuristica  # Heurística usada como solução inicial (MIP start)
+import avaliacao  # Atrasos a partir das chegadas
+import formulacao  # Dados da formulação comuns aos backends (Gurobi e HiGHS)
+import preprocessamento  # Big-M por arco e eliminação de arcos
+import separacao  # Separação de cortes de subtour (inteiros e fracionários)
+import telemetria  # Log por solve e amostras de incumbente/limite
+import ambiente  # Ambientes do Gurobi pré-configurados e reaproveitados
+import ajuste  # Presets de parâmetros do Gurobi por faixa de tamanho
+
+# Objetivos disponíveis: 'total' (Modelo A, soma dos atrasos) e 'max' (Modelo B, maior atraso)
+OBJETIVOS = ('total', 'max')
+
+# Log do Gurobi dos solves sem nome de telemetria
+LOG_COMPARTILHADO = './resultados/gurobi.log'
+
+## Funções auxiliares:
+# Nomes dos status do Gurobi que podem terminar com solução
+STATUS = {
+    gp.GRB.OPTIMAL: 'OPTIMAL',
+    gp.GRB.TIME_LIMIT: 'TIME_LIMIT',
+    gp.GRB.USER_OBJ_LIMIT: 'USER_OBJ_LIMIT',
+    gp.GRB.INTERRUPTED: 'INTERRUPTED',
+    gp.GRB.SOLUTION_LIMIT: 'SOLUTION_LIMIT',
+    gp.GRB.NODE_LIMIT: 'NODE_LIMIT',
+}
+
+# Grava cada incumbente que melhora a solução (uma linha JSON por solução)
+def registrar_incumbente(model):
+    obj = model.cbGet(gp.GRB.Callback.MIPSOL_OBJ)
+    if obj >= model._melhor_obj:
+        return
+    model._melhor_obj = obj
+    if model._incumbentes is not None:
+        registro = {
+            'tempo': round(model.cbGet(gp.GRB.Callback.RUNTIME), 4),  # Segundos desde o início
+            'objetivo': obj,  # Valor da nova solução
+            'limite': model.cbGet(gp.GRB.Callback.MIPSOL_OBJBND),  # Melhor limite inferior
+        }
+        model._incumbentes.write(json.dumps(registro) + '\n')
+        model._incumbentes.flush()
+
+# Corte de subtour: no máximo |S| - 1 arcos dentro do conjunto S
+def subtour_cut(model, tour):
+    return gp.quicksum(model._vars[i, j] for i in tour for j in tour if i != j) <= len(tour) - 1
+
+# Intervalo de nós entre separações fracionárias fora da raiz (a raiz é sempre separada)
+FREQUENCIA_CORTES = 100
+
+# Callback para eliminação de subtours durante a busca de soluções
+def subtour_elim_callback(model, where):
+    if where == gp.GRB.Callback.MIPSOL:
+        inicio = time.perf_counter()
+        vals = np.reshape(model.cbGetSolution(model._x_vars), (model._count, model._count))
+        tours = separacao.get_subtours(separacao.sucessores(vals))  # Ciclos pelo vetor de sucessores
+        cortes = 0
+        if len(tours) > 1:
+            for tour in tours:
+                if len(tour) < model._count:  # Subtour inválido
+                    model.cbLazy(subtour_cut(model, tour))
+                    model._cortes.add(frozenset(tour))  # Guarda no pool para os próximos solves
+                    cortes += 1
+        else:
+            registrar_incumbente(model)  # Solução viável: registra no arquivo de incumbentes
+            telemetria.amostrar(model, where)
+            if model._compartilhado is not None:  # Portfólio: oferece a rota às outras configurações
+                model._compartilhado.publicar(model.cbGet(gp.GRB.Callback.MIPSOL_OBJ), tours[0])
+        separacao.registrar(model._separacao, 'MIPSOL', inicio, cortes)
+
+    elif where == gp.GRB.Callback.MIP:
+        telemetria.amostrar(model, where)  # Amostra periódica de incumbente, limite e nós
+        if model._compartilhado is not None and model._compartilhado.parar.is_set():
+            model.terminate()  # Outra configuração do portfólio já provou o resultado
+
+    elif where == gp.GRB.Callback.MIPNODE:
+        if model._compartilhado is not None:
+            usar_incumbente_compartilhada(model)
+        if not model._cortes_fracionarios and model._precedencia is None:
+            return
+        # Só separa relaxações resolvidas até o ótimo, na raiz e a cada FREQUENCIA_CORTES nós
+        if model.cbGet(gp.GRB.Callback.MIPNODE_STATUS) != gp.GRB.OPTIMAL:
+            return
+        nos = int(model.cbGet(gp.GRB.Callback.MIPNODE_NODCNT))
+        if nos > 0 and nos % FREQUENCIA_CORTES:
+            return
+        if model._precedencia is not None:
+            separar_precedencias(model)
+        if not model._cortes_fracionarios:
+            return
+        inicio = time.perf_counter()
+        vals = np.reshape(model.cbGetNodeRel(model._x_vars), (model._count, model._count))
+        cortes = 0
+        for tour in separacao.separar_fracionario(vals):
+            # Confirma a violação na forma x(S) <= |S| - 1 antes de adicionar o corte de usuário
+            if vals[np.ix_(tour, tour)].sum() > len(tour) - 1 + separacao.EPS:
+                model.cbCut(subtour_cut(model, tour))
+                cortes += 1
+        separacao.registrar(model._separacao, 'MIPNODE', inicio, cortes)
+
+# Máximo de cortes de precedência por chamada do callback (os mais violados primeiro)
+MAX_CORTES_PRECEDENCIA = 50
+
+# Cortes de usuário de precedência: y[j] - y[i] >= s_i + d_ij violados na relaxação do nó
+def separar_precedencias(model):
+    inicio = time.perf_counter()
+    prec = model._precedencia
+    y = np.asarray(model.cbGetNodeRel(model._chegada))
+    violacao = prec['rhs'] - (y[prec['J']] - y[prec['I']])
+    cortes = 0
+    for k in np.argsort(-violacao)[:MAX_CORTES_PRECEDENCIA]:
+        if violacao[k] <= separacao.EPS:
+            break
+        i, j = prec['I'][k], prec['J'][k]
+        model.cbCut(model._chegada[j] - model._chegada[i] >= prec['rhs'][k])
+        cortes += 1
+    separacao.registrar(model._separacao, 'PRECEDENCIA', inicio, cortes)
+
+# Portfólio: injeta a melhor rota encontrada por outra configuração, se for melhor que a incumbente
+def usar_incumbente_compartilhada(model):
+    valor = model._compartilhado.valor()
+    if valor >= min(model._compartilhado_visto, model.cbGet(gp.GRB.Callback.MIPNODE_OBJBST)) - 1e-6:
+        return
+    valor, rota = model._compartilhado.melhor()
+    model._compartilhado_visto = valor  # Cada rota é oferecida uma única vez
+    variaveis, valores = valores_rota(model, rota, model._objetivo)
+    model.cbSetSolution(variaveis, valores)
+    model.cbUseSolution()
+
+# Função para calcular a distância euclidiana entre dois pontos
+def get_distance(p1, p2):
+    return math.hypot(p1[0] - p2[0], p1[1] - p2[1])
+
+## Construção do modelo:
+def _build_core_loop(model, location_data, pre, objectives):
+    # Construtor original: uma restrição por vez, distâncias em dicionário (mantido para comparação)
+    location_count = len(location_data)
+
+    # Cria um dicionário com todas as distâncias entre pares de pontos
+    dist = {
+        (i, j): get_distance(location_data[i][:2], location_data[j][:2])
+        for i in range(location_count)
+        for j in range(location_count)
+    }
+
+    # x[i,j] = 1 se o caminho de i para j é usado na rota
+    rotas_escolhidas = model.addVars(location_count, location_count, vtype=gp.GRB.BINARY, name='x')
+
+    # y[i] = tempo de chegada no local i
+    tempo_chegada = model.addVars(location_count, vtype=gp.GRB.CONTINUOUS, name='y', lb=0)
+
+    # Cada local deve ter exatamente uma saída
+    model.addConstrs((rotas_escolhidas.sum(i, '*') == 1 for i in range(location_count)))
+
+    # Cada local deve ter exatamente uma entrada
+    model.addConstrs((rotas_escolhidas.sum('*', j) == 1 for j in range(location_count)))
+
+    # Proíbe laços (não pode ir do local i para o próprio i)
+    model.addConstrs((rotas_escolhidas[i, i] == 0 for i in range(location_count)), name="no_self_loops")
+
+    # Constante grande usada nas restrições de sequência temporal (Big-M global, sem pré-processamento)
+    M = sum(dist.get((i, j), 0) + location_data[i][2]
+            for i in range(location_count) for j in range(location_count) if i != j) \
+        + sum(d[3] for d in location_data)  # Inclui todos os deadlines
+
+    # Limites das janelas de chegada calculadas no pré-processamento
+    if pre is not None:
+        for i in range(location_count):
+            tempo_chegada[i].LB = pre['chegada_min'][i]
+            tempo_chegada[i].UB = pre['chegada_max'][i]
+
+    # Restrições de sequenciamento temporal (tempo de chegada consistente com a rota e duração do serviço)
+    for i in range(location_count):
+        for j in range(1, location_count):  # Começa em 1 para ignorar o depósito como destino
+            if i != j:
+                # Arcos impossíveis são fixados em zero e não recebem restrição de sequência
+                if pre is not None and pre['arcos_proibidos'][i, j]:
+                    rotas_escolhidas[i, j].UB = 0
+                    continue
+                M_ij = pre['M'][i, j] if pre is not None else M  # Big-M específico do arco
+                model.addConstr(
+                    tempo_chegada[j] >= tempo_chegada[i] + location_data[i][2] + dist[i, j]
+                    - M_ij * (1 - rotas_escolhidas[i, j])
+                )
+
+    # Modelo A: w[i] representa o tempo de atraso no atendimento do local i
+    if 'total' in objectives:
+        model._atraso = model.addVars(location_count, vtype=gp.GRB.CONTINUOUS, name='w', lb=0)
+        for i in range(1, location_count):
+            model.addConstr(model._atraso[i] >= tempo_chegada[i] - location_data[i][3])
+
+    # Modelo B: variável que representa o atraso máximo entre todos os locais
+    if 'max' in objectives:
+        model._max_atraso = model.addVar(vtype=gp.GRB.CONTINUOUS, name='max_atraso', lb=0)
+        for i in range(1, location_count):  # Ignora o depósito
+            model.addConstr(model._max_atraso >= tempo_chegada[i] - location_data[i][3])
+
+    model._vars = rotas_escolhidas
+    model._chegada = tempo_chegada
+
+def _build_core_matrix(model, location_data, pre, objectives):
+    # Construtor vetorizado: dados da formulação (formulacao.py) e API matricial do Gurobi (addMVar)
+    f = formulacao.dados(location_data, pre)
+    n, prazo = f['n'], f['prazo']
+
+    # x[i,j] = 1 se o caminho de i para j é usado na rota (arcos proibidos com limite superior 0)
+    x = model.addMVar((n, n), vtype=gp.GRB.BINARY, ub=f['permitido'].astype(float), name='x')
+
+    # y[i] = tempo de chegada no local i, dentro da janela do pré-processamento
+    ub = np.where(np.isfinite(f['chegada_max']), f['chegada_max'], gp.GRB.INFINITY)
+    y = model.addMVar(n, vtype=gp.GRB.CONTINUOUS, lb=f['chegada_min'], ub=ub, name='y')
+
+    # Cada local deve ter exatamente uma saída e uma entrada
+    model.addConstr(x.sum(axis=1) == 1)
+    model.addConstr(x.sum(axis=0) == 1)
+
+    # Sequenciamento para todos os arcos permitidos com destino j >= 1, em um único bloco:
+    # y[j] - y[i] - M_ij * x[i,j] >= s_i + d_ij - M_ij
+    I, J = f['I'], f['J']
+    model.addConstr(y[J] - y[I] - f['M'] * x[I, J] >= f['rhs'])
+
+    # Modelo A: w[i] representa o tempo de atraso no atendimento do local i
+    if 'total' in objectives:
+        w = model.addMVar(n, vtype=gp.GRB.CONTINUOUS, lb=0, name='w')
+        model.addConstr(w[1:] >= y[1:] - prazo[1:])
+        model._atraso = w.tolist()
+
+    # Modelo B: variável que representa o atraso máximo entre todos os locais
+    if 'max' in objectives:
+        max_atraso = model.addMVar(1, vtype=gp.GRB.CONTINUOUS, lb=0, name='max_atraso')
+        model.addConstr(max_atraso[np.zeros(n - 1, dtype=int)] >= y[1:] - prazo[1:])
+        model._max_atraso = max_atraso.tolist()[0]
+
+    # Dicionário (i, j) -> variável, usado pelo callback de subtours
+    linhas = x.tolist()
+    model._vars = gp.tupledict(((i, j), linhas[i][j]) for i in range(n) for j in range(n))
+    model._chegada = y.tolist()
+
+def build_model(location_data, warm_start=True, preprocess=True, objectives=OBJETIVOS,
+                time_limit=120, threads=None, vectorized=True, fractional_cuts=True,
+                upper_bound=None, verbose=True, precedence=True):
+    """
+    Constrói o núcleo de roteamento e tempos uma única vez, com as variáveis e
+    restrições auxiliares de cada objetivo em 'objectives'. O objetivo em si é
+    definido em solve_model, que pode ser chamado várias vezes no mesmo modelo.
+    'vectorized' escolhe o construtor matricial (padrão) ou o construtor em laço.
+    'fractional_cuts' liga a separação de subtours nas relaxações dos nós (cortes de usuário).
+    'upper_bound' fixa o limite usado no pré-processamento (por exemplo, o L de uma
+    checagem de viabilidade) no lugar do valor das heurísticas.
+    'verbose=False' desliga o log do Gurobi e os resumos impressos (subproblemas
+    pequenos resolvidos muitas vezes, como no LNS).
+    'precedence' escolhe as famílias da inferência de precedências (ver
+    precedencia.PADRAO): True, False ou um dicionário como {'cortes': 'usuario'}.
+    """
+    inicio = time.perf_counter()  # Tempo de construção (heurísticas + pré-processamento + modelo)
+
+    # Número total de locais (incluindo o ponto de partida)
+    location_count = len(location_data)
+
+    # Soluções heurísticas por objetivo: MIP start e limite superior no pré-processamento
+    rotas, limites = {}, {}
+    if warm_start and location_count > 2:
+        for objetivo in objectives:
+            rotas[objetivo] = heuristica.resolver(location_data, objetivo=objetivo)
+            _, atrasos = heuristica.tempos_por_local(rotas[objetivo], location_data)
+            limites[objetivo] = max(atrasos) if objetivo == 'max' else sum(atrasos)
+
+    # Pré-processamento: o limite precisa valer para todos os objetivos do modelo
+    limite_comum = max(limites.values()) if len(limites) == len(objectives) else None
+    if upper_bound is not None:
+        limite_comum = upper_bound if limite_comum is None else min(limite_comum, upper_bound)
+    # A soma dos atrasos só limita as precedências quando o modelo resolve apenas o Modelo A
+    limite_total = limite_comum if tuple(objectives) == ('total',) else None
+    pre = (preprocessamento.preprocessar(location_data, limite_comum, precedence, limite_total)
+           if preprocess else None)
+    cortes_precedencia = pre['cortes_precedencia'] if pre is not None else None
+
+    # Criação do modelo Gurobi no ambiente já iniciado do processo (LazyConstraints e PreCrush vêm dele)
+    env, tempo_ambiente = ambiente.obter()
+    model = gp.Model(env=env)
+    if verbose:
+        model.setParam('OutputFlag', 1)  # Exibe log no terminal
+    model.setParam('TimeLimit', time_limit)  # Tempo limite de execução (em segundos)
+    if not fractional_cuts and cortes_precedencia != 'usuario':
+        model.setParam('PreCrush', 0)  # Sem cortes de usuário via cbCut
+
+    # Número de threads do Gurobi (definido pelo escalonador para não disputar núcleos)
+    if threads is not None:
+        model.setParam('Threads', threads)
+
+    # Variáveis e restrições do núcleo e dos objetivos
+    if vectorized:
+        _build_core_matrix(model, location_data, pre, objectives)
+    else:
+        _build_core_loop(model, location_data, pre, objectives)
+
+    # Cortes de precedência y[j] - y[i] >= s_i + d_ij (i antes de j): no modelo, lazy ou no callback
+    model._precedencia = None
+    if cortes_precedencia in ('inicial', 'lazy'):
+        prec = pre['precedencia']
+        y = gp.MVar.fromlist(model._chegada)
+        restricoes = model.addConstr(y[prec['J']] - y[prec['I']] >= prec['rhs'], name='precedencia')
+        if cortes_precedencia == 'lazy':
+            restricoes.Lazy = np.ones(len(prec['I']), dtype=int)
+    elif cortes_precedencia == 'usuario':
+        model._precedencia = pre['precedencia']
+
+    if pre is not None and verbose:
+        print(preprocessamento.resumo(pre))
+
+    # Guarda variáveis e dados para uso no callback e nos solves
+    model._count = location_count
+    model._verbose = verbose
+    model._x_vars = list(model._vars.values())  # Variáveis x em ordem de linha (i * n + j)
+    model._cortes_fracionarios = fractional_cuts
+    model._location_data = location_data
+    model._pre = pre
+    model._rotas_heuristicas = rotas
+    model._limites_heuristicos = limites
+    model._chegada_max = (list(pre['chegada_max']) if pre is not None
+                          else [gp.GRB.INFINITY] * location_count)
+    model._cortes = set()  # Pool de cortes de subtour encontrados
+    model._cortes_no_modelo = set()  # Cortes do pool já adicionados como restrições
+    model._compartilhado = None  # Incumbentes trocadas com um portfólio (ver portfolio.py)
+    model._compartilhado_visto = gp.GRB.INFINITY
+    model._parametros = {}  # Parâmetros do Gurobi do último solve (ver solve_model)
+    model._epsilon = None  # Restrição max_atraso <= limite_max da fronteira de Pareto (ver solve_model)
+    telemetria.iniciar(model)  # Amostragem desligada até um solve com nome
+    model.update()
+    model._tempo_construcao = time.perf_counter() - inicio
+    model._tempo_ambiente = tempo_ambiente  # Parte da construção gasta iniciando o ambiente (0 se reaproveitado)
+    return model
+
+def _melhor_rota(model, objetivo, candidatas):
+    # Escolhe, entre as rotas candidatas, a de menor valor para o objetivo
+    dist, servico, prazo = avaliacao.vetores_instancia(model._location_data)
+    rotas = np.vstack(candidatas)
+    _, _, total, maximo = avaliacao.avaliar_rotas(rotas, dist, servico, prazo)
+    return rotas[int(np.argmin(maximo if objetivo == 'max' else total))]
+
+def valores_rota(model, rota, objetivo):
+    """Variáveis e valores (arcos, chegadas e atrasos) da rota no modelo: MIP start ou solução injetada."""
+    location_count = model._count
+    arcos = set(heuristica.rota_para_arcos(rota))
+    chegadas, atrasos = heuristica.tempos_por_local(rota, model._location_data)
+    variaveis = list(model._vars.values()) + [model._chegada[i] for i in range(location_count)]
+    valores = [1.0 if k in arcos else 0.0 for k in model._vars.keys()] + list(chegadas)
+    if objetivo == 'max':
+        variaveis.append(model._max_atraso)
+        valores.append(max(atrasos))
+    else:
+        variaveis += [model._atraso[i] for i in range(location_count)]
+        valores += list(atrasos)
+    return variaveis, valores
+
+def adicionar_mtz(model):
+    """
+    Acrescenta as restrições de ordem MTZ (u_j >= u_i + 1 - (n - 1)(1 - x_ij)),
+    como em rascunhos/teste.py: formulação alternativa, mais forte em algumas
+    instâncias, que convive com os cortes de subtour do callback.
+    """
+    n = model._count
+    u = model.addMVar(n, lb=0, ub=n - 1, name='u')
+    I, J = np.nonzero(~np.eye(n, dtype=bool) & (np.arange(n) > 0)[None, :] & (np.arange(n) > 0)[:, None])
+    x = [model._vars[i, j] for i, j in zip(I, J)]
+    model.addConstr(u[J] - u[I] - (n - 1) * gp.MVar.fromlist(x) >= 1 - (n - 1))
+    model.update()
+
+def rota_da_solucao(model):
+    """Reconstrói a permutação (a partir do depósito) da solução atual do modelo."""
+    valores = model.getAttr('X', list(model._vars.values()))
+    sucessor = {i: j for (i, j), v in zip(model._vars.keys(), valores) if v > 0.5}
+    rota, atual = [0], sucessor[0]
+    while atual != 0 and len(rota) < model._count:
+        rota.append(atual)
+        atual = sucessor[atual]
+    return np.asarray(rota)
+
+## Resolução:
+def solve_model(model, objetivo, incumbent_log=None, target_gap=None, target_obj=None,
+                rota_inicial=None, telemetry=None, limite_max=None, params=None):
+    """
+    Define o objetivo ('total' ou 'max') no modelo compartilhado e o resolve.
+    'rota_inicial' (por exemplo, a rota de um solve anterior) concorre com a
+    heurística pelo MIP start. Cortes de subtour de solves anteriores entram
+    como restrições lazy. Com 'telemetry' (nome do solve, como 'inst_22_A'),
+    o log do Gurobi vai para um arquivo próprio e a trajetória de incumbente e
+    limite é amostrada (ver telemetria.py). 'limite_max' limita o atraso
+    máximo (restrição epsilon, só o lado direito muda entre solves; o modelo
+    precisa ter o objetivo 'max'), aperta as janelas de chegada e descarta
+    os MIP starts que o violam. 'params' são parâmetros do Gurobi só deste
+    solve (por exemplo, o preset da faixa de tamanho, ver ajuste.py); os do
+    solve anterior voltam ao padrão. Retorna a tupla no formato de modelo_a/modelo_b.
+    """
+    location_data = model._location_data
+    location_count = model._count
+    tempo_chegada = model._chegada
+
+    # Função Objetivo
+    if objetivo == 'max':
+        model.setObjective(model._max_atraso, sense=gp.GRB.MINIMIZE)
+    else:
+        model.setObjective(
+            gp.quicksum(model._atraso[i] for i in range(1, location_count)),
+            sense=gp.GRB.MINIMIZE
+        )
+
+    # Limite superior específico do objetivo para os tempos de chegada
+    chegada_vars = [tempo_chegada[i] for i in range(location_count)]
+    limite = model._limites_heuristicos.get(objetivo)
+    ub = np.asarray(model._chegada_max, dtype=float)
+    prazo = np.asarray([p[3] for p in location_data], dtype=float)
+    if model._pre is not None and limite is not None:
+        ub[1:] = np.minimum(ub[1:], prazo[1:] + limite + preprocessamento.EPS)
+    if limite_max is not None:
+        ub[1:] = np.minimum(ub[1:], prazo[1:] + limite_max + preprocessamento.EPS)
+    ub = np.maximum(ub, model.getAttr('LB', chegada_vars))
+    model.setAttr('UB', chegada_vars[1:], ub[1:].tolist())
+
+    # Restrição epsilon max_atraso <= limite_max, criada no primeiro uso e desligada (RHS infinito) sem limite
+    if limite_max is not None and model._epsilon is None:
+        if not hasattr(model, '_max_atraso'):
+            raise ValueError("limite_max exige um modelo construído com o objetivo 'max'")
+        model._epsilon = model.addConstr(model._max_atraso <= limite_max, name='epsilon')
+    if model._epsilon is not None:
+        model._epsilon.RHS = limite_max if limite_max is not None else gp.GRB.INFINITY
+
+    # Pool de cortes: subtours encontrados em solves anteriores viram restrições lazy
+    for tour in model._cortes - model._cortes_no_modelo:
+        model.addConstr(subtour_cut(model, tour)).Lazy = 1
+        model._cortes_no_modelo.add(tour)
+
+    # Solução inicial (MIP start): melhor entre heurística e rota informada
+    candidatas = [r for r in (model._rotas_heuristicas.get(objetivo), rota_inicial) if r is not None]
+    if limite_max is not None:
+        dist, servico, _ = avaliacao.vetores_instancia(location_data)
+        candidatas = [r for r in candidatas
+                      if avaliacao.avaliar_rotas(r, dist, servico, prazo)[3][0] <= limite_max + preprocessamento.EPS]
+    x_keys, x_vars = list(model._vars.keys()), list(model._vars.values())
+    model.NumStart = 0
+    model.setAttr('Start', model.getVars(), [gp.GRB.UNDEFINED] * model.NumVars)
+    if candidatas:
+        model.setAttr('Start', *valores_rota(model, _melhor_rota(model, objetivo, candidatas), objetivo))
+
+    # Modo "anytime": critérios opcionais de parada antecipada
+    model.setParam('MIPGap', target_gap if target_gap is not None else 1e-4)  # Para ao atingir o gap desejado
+    model.setParam('BestObjStop', target_obj if target_obj is not None else -gp.GRB.INFINITY)
+
+    # Parâmetros do solve (preset): os do solve anterior voltam ao valor padrão do Gurobi
+    for nome in model._parametros:
+        model.setParam(nome, model.getParamInfo(nome)[5])  # (nome, tipo, valor, mínimo, máximo, padrão)
+    model._parametros = dict(params or {})
+    for nome, valor in model._parametros.items():
+        model.setParam(nome, valor)
+
+    # Arquivo JSONL que recebe cada incumbente que melhora a solução
+    model._objetivo = objetivo
+    model._melhor_obj = gp.GRB.INFINITY
+    model._separacao = separacao.novas_estatisticas()  # Contadores do callback deste solve
+    model._incumbentes = open(incumbent_log, 'w', encoding='utf-8') if incumbent_log else None
+    telemetria.iniciar(model, telemetry)
+    # Arquivo de log: um por instância/modelo com telemetria, senão o log compartilhado
+    model.setParam('LogFile', telemetria.caminho_log(telemetry) if telemetry else LOG_COMPARTILHADO)
+    # Executa o solver com callback para eliminação de subtours
+    try:
+        model.optimize(subtour_elim_callback)
+    finally:
+        if model._incumbentes is not None:
+            model._incumbentes.close()
+    metricas = telemetria.finalizar(model)
+
+    # Se o modelo não encontrou nenhuma solução viável (nem mesmo uma incumbente no tempo limite)
+    if model.status not in STATUS or model.SolCount == 0:
+        return None
+
+    # Gurobi informa OPTIMAL ao atingir o gap alvo; diferencia da prova de otimalidade
+    status = STATUS[model.status]
+    if status == 'OPTIMAL' and target_gap is not None and model.MIPGap > 1e-4:
+        status = 'TARGET_GAP'
+
+    pre = model._pre
+    detalhes = {
+        'status': status,  # Status final (OPTIMAL, TIME_LIMIT, ...)
+        'arcos_removidos': pre['arcos_removidos'] if pre is not None else 0,  # Arcos eliminados
+        'linhas_removidas': pre['linhas_removidas'] if pre is not None else 0,  # Restrições eliminadas
+        'arcos_fixados': pre['arcos_fixados'] if pre is not None else 0,  # Arcos fixados pelas precedências
+        'precedencias': len(pre['precedencia']['I']) if pre is not None and pre['precedencia'] is not None else 0,
+        'separacao': model._separacao,  # Chamadas, cortes e tempo por tipo de callback
+        'construcao': model._tempo_construcao,  # Tempo de construção do modelo (s), fora do Runtime
+        'ambiente': model._tempo_ambiente,  # Parte da construção gasta iniciando o ambiente do Gurobi
+    }
+    if metricas is not None:
+        detalhes['telemetria'] = metricas  # Primeira incumbente, integral primal, tempo de callback
+    if model._verbose:
+        print(separacao.resumo(model._separacao))
+    arcos = [k for k, v in zip(x_keys, model.getAttr('X', x_vars)) if v > 0.5]  # Arcos utilizados
+    chegadas = model.getAttr('X', chegada_vars)  # Tempo de chegada em cada local
+
+    # Modelo A: atrasos vêm diretamente das variáveis w
+    if objetivo == 'total':
+        return (
+            model.ObjVal,  # Valor da função objetivo (soma dos atrasos)
+            model.ObjBound,  # Limite inferior da função objetivo
+            model.Runtime,  # Tempo de execução
+            model.MIPGap,  # Gap relativo da solução
+            model.NodeCount,  # Número de nós explorados
+            arcos,
+            chegadas,
+            model.getAttr('X', [model._atraso[i] for i in range(location_count)]),  # Tempos de atraso
+            detalhes
+        )
+
+    # Modelo B: calcula atrasos por local com base no tempo de chegada
+    delay_times = avaliacao.atrasos_por_chegada(chegadas, [p[3] for p in location_data]).tolist()
+    return (
+        model.ObjVal,  # Valor da função objetivo (atraso máximo)
+        model.ObjBound,  # Limite inferior da função objetivo
+        model.Runtime,  # Tempo de execução do solver
+        model.MIPGap,  # Gap relativo da solução
+        model.NodeCount,  # Número de nós explorados na árvore de busca
+        arcos,
+        chegadas,
+        delay_times,  # Lista com atrasos por local
+        model._max_atraso.X,  # Valor do atraso máximo
+        detalhes
+    )
+
+def check_feasible(model):
+    """
+    Procura qualquer rota viável no modelo, sem função objetivo (para quando a
+    primeira solução é encontrada). Retorna (status, rota), com status
+    'FEASIBLE', 'INFEASIBLE' ou 'UNKNOWN' (tempo limite sem resposta).
+    O objetivo, o SolutionLimit e o LogFile do modelo são restaurados ao
+    final, e o modelo pode ser reutilizado em um solve com objetivo.
+    """
+    objetivo, sentido = model.getObjective(), model.ModelSense
+    limite_solucoes, log = model.Params.SolutionLimit, model.Params.LogFile
+    model.setObjective(gp.LinExpr(), sense=gp.GRB.MINIMIZE)
+    model.setParam('SolutionLimit', 1)
+    model.setParam('LogFile', LOG_COMPARTILHADO)
+    model._melhor_obj = gp.GRB.INFINITY
+    model._separacao = separacao.novas_estatisticas()
+    model._incumbentes = None
+    try:
+        model.optimize(subtour_elim_callback)
+        if model.SolCount > 0:
+            return 'FEASIBLE', rota_da_solucao(model)
+        if model.status in (gp.GRB.INFEASIBLE, gp.GRB.INF_OR_UNBD):
+            return 'INFEASIBLE', None
+        return 'UNKNOWN', None
+    finally:
+        model.setObjective(objetivo, sense=sentido)
+        model.setParam('SolutionLimit', limite_solucoes)
+        model.setParam('LogFile', log)
+
+def solve_both(location_data, warm_start=True, preprocess=True, incumbent_logs=(None, None),
+               target_gap=None, target_obj=None, time_limit=120, threads=None, vectorized=True,
+               fractional_cuts=True, telemetry=(None, None), params=(None, None)):
+    """
+    Resolve os Modelos A e B sobre um único modelo: o núcleo é construído uma
+    vez, o objetivo é trocado e o segundo solve recebe a rota do primeiro como
+    MIP start e os cortes de subtour encontrados como restrições lazy.
+    'params' traz os parâmetros do Gurobi de cada solve; None carrega o
+    preset da faixa de tamanho (ver ajuste.py). Retorna (resultado_a, resultado_b).
+    """
+    params = [ajuste.preset(len(location_data), objetivo) if p is None else p
+              for objetivo, p in zip(OBJETIVOS, params)]
+    model = build_model(location_data, warm_start, preprocess, OBJETIVOS, time_limit, threads, vectorized,
+                        fractional_cuts)
+    res_a = solve_model(model, 'total', incumbent_logs[0], target_gap, target_obj, telemetry=telemetry[0],
+                        params=params[0])
+    rota_a = rota_da_solucao(model) if res_a else None
+    res_b = solve_model(model, 'max', incumbent_logs[1], target_gap, target_obj, rota_inicial=rota_a,
+                        telemetry=telemetry[1], params=params[1])
+    model.dispose()
+    return res_a, res_b
@@ -0,0 +1,219 @@
+## Backend aberto dos modelos A e B: a mesma formulação resolvida pelo HiGHS (scipy.optimize.milp),
+## sem licença, com a eliminação de subtours em laço de cortes (resolve, separa, resolve de novo)
+import json
+import time
+import warnings
+import numpy as np
+from scipy import sparse
+from scipy.optimize import Bounds, LinearConstraint, milp
+import formulacao  # Dados da formulação comuns aos backends
+import heuristica  # Rota inicial e limite superior do pré-processamento
+import avaliacao  # Avaliação vetorizada das rotas candidatas
+import preprocessamento  # Big-M por arco e eliminação de arcos
+import separacao  # Ciclos de uma solução inteira
+
+# Códigos de status do scipy.optimize.milp
+STATUS = {0: 'OPTIMAL', 1: 'TIME_LIMIT'}
+
+def conferir_opcoes(params=None, telemetry=None):
+    """
+    Levanta ValueError para as opções de modelo_a/modelo_b que só existem no
+    Gurobi: 'params' (parâmetros do Gurobi) e 'telemetry' (trajetória lida no
+    callback e log próprio do Gurobi).
+    """
+    invalidas = [nome for nome, valor in (('params', params), ('telemetry', telemetry)) if valor]
+    if invalidas:
+        raise ValueError(f"opções sem suporte no backend highs: {', '.join(invalidas)}")
+
+def montar(f, objetivo):
+    """
+    Traduz os dados da formulação para o milp: custo, restrições (esparsas),
+    limites e integralidade. Variáveis em ordem: x (n*n, por linha), y (n)
+    e w (n, Modelo A) ou max_atraso (1, Modelo B).
+    """
+    n = f['n']
+    nx = n * n
+    k = n if objetivo == 'total' else 1
+    total = nx + n + k
+    linhas, colunas, valores, inferior, superior = [], [], [], [], []
+
+    def bloco(m, rows, cols, vals, lb, ub):
+        # Acrescenta m linhas: coeficientes (rows, cols, vals) com lb <= A x <= ub
+        linhas.append(np.asarray(rows) + len(inferior))
+        colunas.append(np.asarray(cols))
+        valores.append(np.asarray(vals, dtype=float))
+        inferior.extend(np.broadcast_to(lb, (m,)))
+        superior.extend(np.broadcast_to(ub, (m,)))
+
+    # Cada local deve ter exatamente uma saída e uma entrada
+    i, j = np.divmod(np.arange(nx), n)
+    bloco(n, i, i * n + j, np.ones(nx), 1.0, 1.0)
+    bloco(n, j, i * n + j, np.ones(nx), 1.0, 1.0)
+
+    # Sequenciamento: y[j] - y[i] - M_ij * x[i,j] >= s_i + d_ij - M_ij
+    I, J = f['I'], f['J']
+    if len(I):
+        r = np.arange(len(I))
+        bloco(len(I), np.concatenate((r, r, r)), np.concatenate((nx + J, nx + I, I * n + J)),
+              np.concatenate((np.ones(len(I)), -np.ones(len(I)), -f['M'])), f['rhs'], np.inf)
+
+    # Precedências (i antes de j): y[j] - y[i] >= s_i + d_ij; no HiGHS sempre no modelo
+    P, Q = f['precedencia_I'], f['precedencia_J']
+    if len(P):
+        r = np.arange(len(P))
+        bloco(len(P), np.concatenate((r, r)), np.concatenate((nx + Q, nx + P)),
+              np.concatenate((np.ones(len(P)), -np.ones(len(P)))), f['precedencia_rhs'], np.inf)
+
+    # Atrasos: w[i] >= y[i] - prazo[i] (Modelo A) ou max_atraso >= y[i] - prazo[i] (Modelo B)
+    r = np.arange(n - 1)
+    atraso = nx + n + (np.arange(1, n) if objetivo == 'total' else np.zeros(n - 1, dtype=int))
+    bloco(n - 1, np.concatenate((r, r)), np.concatenate((atraso, nx + np.arange(1, n))),
+          np.concatenate((np.ones(n - 1), -np.ones(n - 1))), -f['prazo'][1:], np.inf)
+
+    A = sparse.csr_array((np.concatenate(valores), (np.concatenate(linhas), np.concatenate(colunas))),
+                         shape=(len(inferior), total))
+    c = np.zeros(total)
+    c[nx + n:] = 1.0  # Soma dos w[i] (w[0] fica em 0) ou o próprio max_atraso
+    lb = np.concatenate((np.zeros(nx), f['chegada_min'], np.zeros(k)))
+    ub = np.concatenate((f['permitido'].ravel().astype(float), f['chegada_max'], np.full(k, np.inf)))
+    if objetivo == 'total':
+        ub[nx + n] = 0.0  # O depósito não tem atraso
+    integralidade = np.concatenate((np.ones(nx), np.zeros(n + k)))
+    return c, LinearConstraint(A, inferior, superior), Bounds(lb, ub), integralidade
+
+def corte_subtour(tour, n, total):
+    """Corte x(S) <= |S| - 1 do conjunto S como linha do milp."""
+    tour = np.asarray(tour)
+    i, j = np.meshgrid(tour, tour, indexing='ij')
+    fora_da_diagonal = i != j
+    linha = np.zeros(total)
+    linha[(i * n + j)[fora_da_diagonal]] = 1.0
+    return linha
+
+def resolver(location_data, objetivo='total', warm_start=True, preprocess=True, target_gap=None, time_limit=120,
+             precedence=True, rota_inicial=None, threads=None, target_obj=None, incumbent_log=None):
+    """
+    Resolve o Modelo A ('total') ou B ('max') pelo HiGHS. Subtours da solução
+    inteira viram cortes e o problema é resolvido de novo (com o tempo que
+    resta) até a rota ser um único ciclo. Como o milp não aceita solução
+    inicial, a melhor entre a rota heurística e 'rota_inicial' (por exemplo,
+    a incumbente de um solve anterior) entra como incumbente: limita o
+    pré-processamento e é devolvida se o HiGHS não achar nada melhor.
+    'precedence' tem o mesmo significado que em modelo_base.build_model (cortes
+    lazy ou de usuário entram direto no modelo). 'threads' vai para o HiGHS.
+    Com 'target_obj', o laço para (status USER_OBJ_LIMIT, como o BestObjStop do
+    Gurobi) assim que a incumbente atinge o valor. Com 'incumbent_log', cada
+    rota que melhora a incumbente vira uma linha JSON no mesmo formato de
+    modelo_base.registrar_incumbente.
+    Retorna (rota, resposta do último milp, status, cortes, iterações).
+    """
+    inicio = time.perf_counter()
+    rota_heuristica, limite = None, None
+    candidatas = [np.asarray(rota_inicial)] if rota_inicial is not None else []
+    if warm_start and len(location_data) > 2:
+        candidatas.append(heuristica.resolver(location_data, objetivo))
+    if candidatas:
+        dist, servico, prazo = avaliacao.vetores_instancia(location_data)
+        _, _, total, maximo = avaliacao.avaliar_rotas(np.vstack(candidatas), dist, servico, prazo)
+        valores = maximo if objetivo == 'max' else total
+        rota_heuristica, limite = candidatas[int(np.argmin(valores))], float(valores.min())
+    limite_total = limite if objetivo == 'total' else None
+    pre = preprocessamento.preprocessar(location_data, limite, precedence, limite_total) if preprocess else None
+    f = formulacao.dados(location_data, pre)
+    n = f['n']
+    c, restricao, limites, integralidade = montar(f, objetivo)
+    opcoes = {'disp': False, 'mip_rel_gap': target_gap if target_gap is not None else 1e-4}
+    if threads is not None:
+        opcoes['threads'] = threads  # Opção do HiGHS que o milp repassa sem conferir
+
+    incumbentes = open(incumbent_log, 'w', encoding='utf-8') if incumbent_log else None
+
+    def registrar(valor, limite_inferior):
+        # Mesmo registro do callback do Gurobi: tempo, objetivo e limite inferior
+        if incumbentes is not None:
+            incumbentes.write(json.dumps({'tempo': round(time.perf_counter() - inicio, 4), 'objetivo': valor,
+                                          'limite': limite_inferior}) + '\n')
+            incumbentes.flush()
+
+    cortes, iteracoes, resposta, rota, status = [], 0, None, None, 'TIME_LIMIT'
+    try:
+        if limite is not None:
+            registrar(limite, 0.0)
+        if limite is not None and target_obj is not None and limite <= target_obj:
+            status = 'USER_OBJ_LIMIT'  # A incumbente de partida já atinge o alvo
+        while status != 'USER_OBJ_LIMIT' and time.perf_counter() - inicio < time_limit:
+            opcoes['time_limit'] = time_limit - (time.perf_counter() - inicio)
+            restricoes = [restricao]
+            if cortes:
+                linhas = np.vstack([corte_subtour(t, n, len(c)) for t in cortes])
+                restricoes.append(LinearConstraint(sparse.csr_array(linhas), -np.inf, [len(t) - 1 for t in cortes]))
+            with warnings.catch_warnings():
+                warnings.filterwarnings('ignore', message='Unrecognized options', category=RuntimeWarning)
+                resposta = milp(c, constraints=restricoes, bounds=limites, integrality=integralidade, options=opcoes)
+            iteracoes += 1
+            if resposta.x is None:  # Sem solução inteira no tempo (ou inviável)
+                break
+            tours = separacao.get_subtours(separacao.sucessores(resposta.x[:n * n].reshape(n, n)))
+            if len(tours) == 1:
+                rota = np.asarray(tours[0])
+                status = STATUS.get(resposta.status, 'TIME_LIMIT')
+                _, _, total, maximo = avaliacao.avaliar_rotas(rota, f['dist'], f['servico'], f['prazo'])
+                valor = float(maximo[0] if objetivo == 'max' else total[0])
+                if limite is None or valor < limite - 1e-9:
+                    dual = getattr(resposta, 'mip_dual_bound', None)
+                    registrar(valor, float(dual) if dual is not None and np.isfinite(dual) else 0.0)
+                break
+            cortes.extend(tours)  # Um corte por ciclo e nova resolução
+    finally:
+        if incumbentes is not None:
+            incumbentes.close()
+
+    # A rota heurística vale como incumbente (o equivalente ao MIP start)
+    if rota_heuristica is not None:
+        if rota is None:
+            rota = rota_heuristica
+            if status != 'USER_OBJ_LIMIT':
+                status = 'TIME_LIMIT'
+        else:
+            candidatas = np.vstack((rota, rota_heuristica))
+            _, _, total, maximo = avaliacao.avaliar_rotas(candidatas, f['dist'], f['servico'], f['prazo'])
+            valor = maximo if objetivo == 'max' else total
+            if valor[1] < valor[0] - 1e-9:
+                rota = rota_heuristica
+    if status == 'OPTIMAL' and target_gap is not None and resposta.mip_gap > 1e-4:
+        status = 'TARGET_GAP'
+    return rota, resposta, status, len(cortes), iteracoes
+
+def solve(location_data, objetivo='total', warm_start=True, preprocess=True, target_gap=None, time_limit=120,
+          precedence=True, rota_inicial=None, threads=None, target_obj=None, incumbent_log=None):
+    """HiGHS com tupla no formato de modelo_a.solve ('total') ou modelo_b.solve ('max'); None sem solução."""
+    inicio = time.perf_counter()
+    rota, resposta, status, cortes, iteracoes = resolver(location_data, objetivo, warm_start, preprocess,
+                                                         target_gap, time_limit, precedence, rota_inicial,
+                                                         threads, target_obj, incumbent_log)
+    if rota is None:
+        return None
+    chegadas, atrasos = heuristica.tempos_por_local(rota, location_data)
+    valor = max(atrasos) if objetivo == 'max' else sum(atrasos)
+    limite = getattr(resposta, 'mip_dual_bound', None) if resposta is not None else None
+    limite = 0.0 if limite is None or not np.isfinite(limite) else min(float(limite), valor)
+    resultado = (
+        valor,  # Valor da função objetivo
+        limite,  # Limite inferior do HiGHS
+        time.perf_counter() - inicio,  # Tempo de execução
+        (valor - limite) / abs(valor) if abs(valor) > 1e-9 else 0.0,  # Gap relativo
+        getattr(resposta, 'mip_node_count', 0) if resposta is not None else 0,  # Nós explorados
+        heuristica.rota_para_arcos(rota),  # Arcos escolhidos
+        chegadas,  # Tempos de chegada
+        atrasos  # Tempos de atraso
+    )
+    if objetivo == 'max':
+        resultado += (valor,)  # Valor do atraso máximo
+    detalhes = {
+        'status': status,  # OPTIMAL, TARGET_GAP, USER_OBJ_LIMIT ou TIME_LIMIT
+        'metodo': 'HiGHS',
+        'backend': 'highs',
+        'cortes': cortes,  # Cortes de subtour adicionados no laço
+        'iteracoes': iteracoes,  # Resoluções do milp
+    }
+    return resultado + (detalhes,)  # Detalhes da solução
@@ -1,44 +1,146 @@
 import glob
 import os
 
+# Pasta padrão das instâncias, relativa a este arquivo (e não ao diretório de trabalho)
+INSTANCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "instancias")
+
+# Campos de cada local no array estruturado: coordenadas, tempo de serviço e deadline
+FIELDS = ("x", "y", "service", "deadline")
+
+def location_dtype():
+    """Tipo do array estruturado de uma instância (numpy só é importado quando usado)."""
+    import numpy as np
+    return np.dtype([(field, np.int32) for field in FIELDS])
+
 def is_last_point_depot(location_data):
     """
     Verifica se o último ponto da instância é igual ao depósito.
     """
-    if not location_data:
+    if len(location_data) == 0:
         return False
-    return location_data[0][:2] == location_data[-1][:2]
+    return list(location_data[0][:2]) == list(location_data[-1][:2])
 
-def read_instances():
+def _parse_lines(lines):
     """
-    Lê todos os arquivos .txt da pasta 'instancias', formata os dados e
-    retorna uma lista de tuplas, cada uma contendo o nome da instância
-    e os dados de localização.
+    Interpreta as linhas não vazias de um arquivo de instância. Retorna
+    (locais, problemas, linhas repetindo o depósito): locais é a lista de
+    tuplas (x, y, serviço, deadline), com o depósito primeiro. Clientes nas
+    coordenadas do depósito com serviço 0 (como um ponto de retorno ao final
+    da rota) são mantidos como estão no arquivo e só apontados; quem lê
+    decide se os rejeita.
     """
-    instances = []
-    
-    search_path = os.path.join("instancias", "*.txt")
-    filepaths = glob.glob(search_path)
+    if len(lines) < 2:
+        return [], ["arquivo sem cabeçalho ou sem depósito"], []
 
-    for filepath in filepaths:
-        with open(filepath, "r", encoding='utf-8') as f:
-            lines = [line.strip() for line in f if line.strip()]
+    problems, duplicates = [], []
+    depot = lines[1].split()
+    if len(depot) != 2 or not all(p.lstrip("-").isdigit() for p in depot):
+        return [], [f"linha 2 (depósito) deveria ter 'x y': '{lines[1]}'"], []
+    x0, y0 = map(int, depot)
+    locations = [(x0, y0, 0, 0)]
+    for number, line in enumerate(lines[2:], start=3):
+        parts = line.split()
+        if len(parts) != 4 or not all(p.lstrip("-").isdigit() for p in parts):
+            problems.append(f"linha {number} deveria ter 4 inteiros: '{line}'")
+            continue
+        x, y, service, deadline = map(int, parts)
+        if service < 0 or deadline < 0:
+            problems.append(f"linha {number} com serviço ou deadline negativo: '{line}'")
+        elif (x, y, service) == (x0, y0, 0):
+            duplicates.append(number)
+        locations.append((x, y, service, deadline))
 
-        location_data = []
-        x0, y0 = map(int, lines[1].split())
-        location_data.append([x0, y0, 0, 0])  # Adiciona o depósito
+    # O cabeçalho informa o total de locais (depósito incluso)
+    try:
+        count = int(lines[0])
+        if count != len(locations):
+            problems.append(f"cabeçalho informa {count} locais, foram lidos {len(locations)}")
+    except ValueError:
+        problems.append(f"cabeçalho inválido: '{lines[0]}'")
+    return locations, problems, duplicates
 
-        for line in lines[2:]:
-            parts = list(map(int, line.split()))
-            location_data.append(parts)
+def _read_lines(filepath):
+    with open(filepath, "r", encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+def check_instance(filepath):
+    """
+    Confere um arquivo de instância e retorna a lista de problemas encontrados
+    (vazia se o arquivo estiver correto): quantidade de locais do cabeçalho,
+    linha do depósito com 'x y', clientes com 'x y serviço deadline' inteiros
+    e não negativos e linhas que repetem o depósito.
+    """
+    _, problems, duplicates = _parse_lines(_read_lines(filepath))
+    return problems + [f"linha {number} repete o depósito" for number in duplicates]
 
-        # # Verifica se último ponto é o depósito; se não, adiciona
-        # if not is_last_point_depot(location_data):
-        #     location_data.append(location_data[0])  # Adiciona retorno ao depósito
+def load_instance(filepath, strict=True):
+    """
+    Lê um arquivo de instância em um array estruturado (x, y, service, deadline),
+    com o depósito na posição 0. Levanta ValueError se o arquivo tiver algum
+    problema de formato ou de contagem e, com strict, também se alguma linha
+    repetir o depósito; com strict=False essas linhas são mantidas como
+    clientes, com um aviso.
+    """
+    with open(filepath, "r", encoding='utf-8') as f:
+        return parse_instance(f.read(), filepath, strict)
 
-        instance_name = os.path.basename(filepath)
-        instance_name = os.path.splitext(instance_name)[0]
-        
-        instances.append((instance_name, location_data))
+def parse_instance(text, source="instância", strict=True):
+    """
+    Como load_instance, para o conteúdo de um arquivo de instância já lido
+    (por exemplo, recebido pelo serviço). 'source' identifica a origem nas
+    mensagens de erro.
+    """
+    import numpy as np
+    locations, problems, duplicates = _parse_lines([line.strip() for line in text.splitlines() if line.strip()])
+    if problems:
+        raise ValueError(f"{source}: " + "; ".join(problems))
+    if duplicates:
+        message = f"{source}: linhas {', '.join(map(str, duplicates))} repetem o depósito"
+        if strict:
+            raise ValueError(message)
+        print(f"⚠️ {message} (mantidas como clientes)")
+    return np.array(locations, dtype=location_dtype())
 
-    return instances
+def as_location_data(locations):
+    """Converte o array estruturado na lista de [x, y, serviço, deadline] usada pelos modelos."""
+    if isinstance(locations, list):
+        return locations
+    return [list(map(int, row)) for row in locations.tolist()]
+
+def instance_paths(source=INSTANCE_DIR):
+    """
+    Arquivos de uma fonte de instâncias, em ordem: uma pasta (todos os .txt),
+    um padrão glob ('instancias/inst_2*.txt') ou um único arquivo.
+    """
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, "*.txt")))
+    if glob.has_magic(source):
+        return sorted(glob.glob(source))
+    if os.path.isfile(source):
+        return [source]
+    raise FileNotFoundError(f"Fonte de instâncias não encontrada: {source}")
+
+def iter_instances(source=INSTANCE_DIR, strict=True):
+    """
+    Gera (nome, array estruturado) uma instância por vez, lendo cada arquivo
+    só quando ele é pedido. Com strict=False, arquivos inválidos são pulados
+    com um aviso em vez de interromper a leitura, e linhas que repetem o
+    depósito são mantidas como clientes (ver load_instance).
+    """
+    for filepath in instance_paths(source):
+        try:
+            locations = load_instance(filepath, strict)
+        except ValueError as e:
+            if strict:
+                raise
+            print(f"‼️ Instância ignorada: {e}")
+            continue
+        yield os.path.splitext(os.path.basename(filepath))[0], locations
+
+def read_instances(pasta=INSTANCE_DIR):
+    """
+    Lê todos os arquivos .txt da pasta 'instancias' (ou da fonte informada:
+    pasta, padrão glob ou arquivo), formata os dados e retorna uma lista de
+    tuplas, cada uma contendo o nome da instância e os dados de localização.
+    """
+    return [(name, as_location_data(locations)) for name, locations in iter_instances(pasta)]
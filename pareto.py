@@ -0,0 +1,121 @@
+## Fronteira de Pareto entre o atraso total (Modelo A) e o atraso máximo (Modelo B) pelo
+## método epsilon-restrito, varrendo o limite do atraso máximo em um único modelo persistente
+import sys
+import time
+import argparse
+import parametro
+import heuristica  # Conversão dos arcos da solução em rota
+import avaliacao  # Avaliação das rotas (total e máximo sem esperas)
+import modelo_base  # Modelo com os dois objetivos, construído uma vez
+
+# Redução mínima do atraso máximo entre dois pontos consecutivos da varredura
+PASSO = 1e-3
+
+# Número máximo de solves da varredura (os dois extremos inclusos)
+MAX_PONTOS = 50
+
+# Tempo limite (s) de cada ponto
+TEMPO_PONTO = 30
+
+def _ponto(location_data, objetivo, resultado, limite, tempo):
+    # Ponto da fronteira a partir do resultado de solve_model: valores da rota sem esperas
+    dist, servico, prazo = avaliacao.vetores_instancia(location_data)
+    rota = heuristica.arcos_para_rota(resultado[5])
+    _, _, total, maximo = avaliacao.avaliar_rotas(rota, dist, servico, prazo)
+    return {
+        'objetivo': objetivo,
+        'total': float(total[0]),
+        'maximo': float(maximo[0]),
+        'limite': limite,  # Limite do atraso máximo usado no solve (None: sem limite)
+        'status': resultado[-1]['status'],
+        'tempo': tempo,  # Tempo de parede do solve (s)
+        'nos': resultado[4],
+        'rota': rota,
+    }
+
+def nao_dominados(pontos, tolerancia=1e-6):
+    """Pontos que nenhum outro melhora nos dois objetivos, do menor atraso máximo para o maior."""
+    ordenados = sorted(pontos, key=lambda p: (p['maximo'], p['total']))
+    fronteira = []
+    for p in ordenados:
+        if not fronteira or p['total'] < fronteira[-1]['total'] - tolerancia:
+            fronteira.append(p)
+    return fronteira
+
+def fronteira(location_data, time_limit=TEMPO_PONTO, threads=None, passo=PASSO, max_pontos=MAX_PONTOS,
+              verbose=False):
+    """
+    Constrói um único modelo com os dois objetivos e resolve:
+    1. o Modelo B (menor atraso máximo, o fim da varredura; sem prova de
+       otimalidade, a varredura para no máximo encontrado);
+    2. o Modelo A sem limite (menor atraso total);
+    3. o Modelo A com max_atraso <= (atraso máximo do ponto anterior - 'passo'),
+       até o limite ficar abaixo do ótimo do Modelo B.
+    Entre os solves só mudam o lado direito da restrição epsilon e as janelas
+    de chegada; os cortes de subtour ficam no modelo. O MIP start de cada
+    ponto é a melhor rota já encontrada que respeita o novo limite (a do
+    Modelo B sempre respeita). Retorna (pontos não dominados, todos os pontos,
+    tempo de construção do modelo).
+    """
+    model = modelo_base.build_model(location_data, objectives=('total', 'max'), time_limit=time_limit,
+                                    threads=threads, verbose=verbose)
+    pontos = []
+    try:
+        inicio = time.perf_counter()
+        resultado = modelo_base.solve_model(model, 'max')
+        if resultado is None:
+            return [], [], model._tempo_construcao
+        pontos.append(_ponto(location_data, 'max', resultado, None, time.perf_counter() - inicio))
+        menor_maximo = pontos[-1]['maximo']
+
+        limite = None
+        while len(pontos) < max_pontos:
+            # Melhor rota conhecida (menor total) dentro do limite: MIP start do ponto
+            viaveis = [p for p in pontos if limite is None or p['maximo'] <= limite]
+            partida = min(viaveis, key=lambda p: p['total'])['rota'] if viaveis else None
+            inicio = time.perf_counter()
+            resultado = modelo_base.solve_model(model, 'total', rota_inicial=partida, limite_max=limite)
+            if resultado is None:  # Limite abaixo de qualquer rota (ou sem solução no tempo)
+                break
+            pontos.append(_ponto(location_data, 'total', resultado, limite, time.perf_counter() - inicio))
+            limite = pontos[-1]['maximo'] - passo
+            if limite < menor_maximo - 1e-9:
+                break
+        return nao_dominados(pontos), pontos, model._tempo_construcao
+    finally:
+        model.dispose()
+
+def imprimir(instancia, pontos, todos, construcao):
+    """Tabela da fronteira, com o tempo de cada ponto e o total da varredura."""
+    print(f"\nFronteira de Pareto - {instancia}: {len(pontos)} pontos não dominados em {len(todos)} solves "
+          f"(construção {construcao:.2f}s, solves {sum(p['tempo'] for p in todos):.2f}s)")
+    print("+----+--------+---------------+---------------+---------------+------------+-----------+")
+    print("| #  | Modelo | Atraso Total  | Atraso Máximo | Limite Máximo | Status     | Tempo (s) |")
+    print("+----+--------+---------------+---------------+---------------+------------+-----------+")
+    for k, p in enumerate(pontos, start=1):
+        limite = f"{p['limite']:.2f}" if p['limite'] is not None else "-"
+        modelo = 'B' if p['objetivo'] == 'max' else 'A'
+        print(f"| {k:>2} | {modelo:<6} | {p['total']:>13.2f} | {p['maximo']:>13.2f} | {limite:>13} | {p['status']:<10} "
+              f"| {p['tempo']:>9.2f} |")
+    print("+----+--------+---------------+---------------+---------------+------------+-----------+")
+
+## Linha de comando:
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fronteira de Pareto entre atraso total e atraso máximo")
+    parser.add_argument("source", nargs="?", default=parametro.INSTANCE_DIR,
+                        help="instâncias: pasta, padrão glob ou arquivo .txt")
+    parser.add_argument("--time-limit", type=float, default=TEMPO_PONTO, help="tempo limite de cada ponto")
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--step", type=float, default=PASSO, help="redução mínima do atraso máximo por ponto")
+    parser.add_argument("--max-points", type=int, default=MAX_PONTOS)
+    args = parser.parse_args(argv)
+
+    for instancia, locations in parametro.iter_instances(args.source):
+        location_data = parametro.as_location_data(locations)
+        pontos, todos, construcao = fronteira(location_data, args.time_limit, args.threads, args.step,
+                                              args.max_points)
+        imprimir(instancia, pontos, todos, construcao)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
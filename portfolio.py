@@ -0,0 +1,262 @@
+## Portfólio de configurações para uma instância: processos em paralelo, incumbentes
+## compartilhadas e cancelamento assim que uma configuração prova o resultado
+import os
+import sys
+import math
+import json
+import time
+import argparse
+import functools
+import multiprocessing
+from collections import Counter, defaultdict
+import numpy as np
+import parametro
+from faixas import FAIXAS, faixa  # Faixas de tamanho do padrão aprendido (as mesmas dos presets do ajuste)
+
+# Registro das execuções (uma linha JSON por portfólio), usado para aprender o padrão por tamanho;
+# ancorado no módulo, pois execucao.run_job também o lê
+REGISTRO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados", "portfolio.jsonl")
+
+# Tempo (s) dado às configurações canceladas para pararem sozinhas antes de serem encerradas
+ESPERA_CANCELAMENTO = 2.0
+
+# Status que encerram o portfólio: otimalidade provada ou gap alvo atingido
+STATUS_PROVADOS = ('OPTIMAL', 'TARGET_GAP')
+
+class IncumbenteCompartilhada:
+    """
+    Melhor rota encontrada por qualquer configuração, em memória compartilhada
+    entre os processos, e o sinal de parada do portfólio. Os modelos do Gurobi
+    publicam suas incumbentes no callback e recebem as melhores das outras
+    configurações como solução heurística (modelo_base.usar_incumbente_compartilhada).
+    """
+    def __init__(self, n, contexto=multiprocessing):
+        self._valor = contexto.Value('d', math.inf)
+        self._rota = contexto.Array('i', n, lock=False)
+        self.parar = contexto.Event()
+
+    def valor(self):
+        return self._valor.value
+
+    def publicar(self, valor, rota):
+        """Guarda a rota se ela melhorar a melhor conhecida; retorna se houve melhora."""
+        with self._valor.get_lock():
+            if valor >= self._valor.value - 1e-9:
+                return False
+            self._rota[:] = [int(v) for v in rota]
+            self._valor.value = valor
+            return True
+
+    def melhor(self):
+        """(valor, rota) da melhor incumbente publicada."""
+        with self._valor.get_lock():
+            return self._valor.value, np.asarray(self._rota[:])
+
+## Configurações:
+def _mip(location_data, objetivo, time_limit, threads, target_gap, compartilhado, parametros=None, mtz=False):
+    # Modelo A ou B do modelo_base, com parâmetros do Gurobi e formulação opcionais
+    import modelo_base
+    model = modelo_base.build_model(location_data, objectives=(objetivo,), time_limit=time_limit,
+                                    threads=threads, verbose=False)
+    try:
+        for nome, valor in (parametros or {}).items():
+            model.setParam(nome, valor)
+        if mtz:
+            modelo_base.adicionar_mtz(model)
+        model._compartilhado = compartilhado
+        return modelo_base.solve_model(model, objetivo, target_gap=target_gap)
+    finally:
+        model.dispose()
+
+def _dp(location_data, objetivo, time_limit, threads, target_gap, compartilhado):
+    import programacao_dinamica
+    return programacao_dinamica.solve(location_data, objetivo)
+
+def _bissecao(location_data, objetivo, time_limit, threads, target_gap, compartilhado):
+    import bissecao
+    return bissecao.solve(location_data, time_limit=time_limit, threads=threads)
+
+def _lns(location_data, objetivo, time_limit, threads, target_gap, compartilhado):
+    import lns
+    return lns.solve(location_data, objetivo, time_limit=time_limit, threads=threads, compartilhado=compartilhado)
+
+# Parâmetros do Gurobi das variantes do MIP (também aplicados por execucao.run_job quando a variante é o padrão)
+PARAMETROS = {
+    "mip-semente": {'Seed': 1},
+    "mip-limite": {'MIPFocus': 2},
+    "mip-viavel": {'MIPFocus': 1},
+}
+
+# Configurações disponíveis: (função, objetivos atendidos, maior instância em que vale a pena tentar)
+CONFIGS = {
+    "mip": (_mip, ('total', 'max'), None),
+    "mip-semente": (lambda *args: _mip(*args, parametros=PARAMETROS["mip-semente"]), ('total', 'max'), None),
+    "mip-limite": (lambda *args: _mip(*args, parametros=PARAMETROS["mip-limite"]), ('total', 'max'), None),
+    "mip-viavel": (lambda *args: _mip(*args, parametros=PARAMETROS["mip-viavel"]), ('total', 'max'), None),
+    "mtz": (lambda *args: _mip(*args, mtz=True), ('total', 'max'), None),
+    "dp": (_dp, ('total', 'max'), 20),
+    "bissecao": (_bissecao, ('max',), None),
+    "lns": (_lns, ('total', 'max'), None),
+}
+
+# Ordem de preferência quando há mais configurações que núcleos
+PADRAO = ("mip", "dp", "bissecao", "mtz", "lns", "mip-limite", "mip-semente", "mip-viavel")
+
+def aplicavel(nome, n, objetivo):
+    """A configuração atende o objetivo e o tamanho da instância?"""
+    _, objetivos, limite = CONFIGS[nome]
+    return objetivo in objetivos and (limite is None or n <= limite)
+
+def escolher_configs(n, objetivo, core_budget, configs=None):
+    """
+    Configurações aplicáveis à instância (objetivo e tamanho), na ordem de
+    preferência, limitadas ao orçamento de núcleos (uma por processo).
+    """
+    escolhidas = [nome for nome in configs or PADRAO if aplicavel(nome, n, objetivo)]
+    return escolhidas[:max(1, core_budget)]
+
+## Execução:
+def _executar(nome, location_data, objetivo, time_limit, threads, target_gap, compartilhado, fila):
+    # Processo de uma configuração: devolve (nome, resultado, tempo de parede) pela fila
+    inicio = time.perf_counter()
+    try:
+        resultado = CONFIGS[nome][0](location_data, objetivo, time_limit, threads, target_gap, compartilhado)
+    except Exception as e:  # Falha em uma configuração não derruba o portfólio
+        print(f"‼️ Configuração {nome} falhou: {e}")
+        resultado = None
+    if resultado and resultado[-1]['status'] in STATUS_PROVADOS:
+        compartilhado.parar.set()
+    fila.put((nome, resultado, time.perf_counter() - inicio))
+
+def executar(location_data, objetivo='total', core_budget=None, time_limit=120, target_gap=None, configs=None):
+    """
+    Roda as configurações em processos paralelos sob o orçamento de núcleos,
+    trocando incumbentes entre elas. Assim que uma prova a otimalidade (ou
+    atinge 'target_gap'), as demais são canceladas. Retorna (nome da vencedora,
+    resultado no formato de modelo_a/modelo_b, tempos por configuração, None
+    nas canceladas); sem prova, vence a de melhor objetivo.
+    """
+    location_data = parametro.as_location_data(location_data)
+    core_budget = core_budget or multiprocessing.cpu_count()
+    nomes = escolher_configs(len(location_data), objetivo, core_budget, configs)
+    threads = max(1, core_budget // len(nomes))
+
+    contexto = multiprocessing.get_context()
+    compartilhado = IncumbenteCompartilhada(len(location_data), contexto)
+    fila = contexto.Queue()
+    processos = {
+        nome: contexto.Process(target=_executar, args=(nome, location_data, objetivo, time_limit, threads,
+                                                       target_gap, compartilhado, fila), daemon=True)
+        for nome in nomes
+    }
+    inicio = time.perf_counter()
+    for processo in processos.values():
+        processo.start()
+
+    resultados, tempos, vencedora = {}, {}, None
+    while len(resultados) < len(processos):
+        # Espera com folga: configurações que não usam o Gurobi podem ignorar o tempo limite
+        restante = time_limit + ESPERA_CANCELAMENTO + 10 - (time.perf_counter() - inicio)
+        if vencedora is not None:
+            restante = min(restante, ESPERA_CANCELAMENTO)
+        try:
+            nome, resultado, tempo = fila.get(timeout=max(restante, 0.01))
+        except Exception:  # queue.Empty: as restantes são canceladas
+            break
+        resultados[nome], tempos[nome] = resultado, tempo
+        if vencedora is None and resultado and resultado[-1]['status'] in STATUS_PROVADOS:
+            vencedora = nome
+            compartilhado.parar.set()
+
+    for nome, processo in processos.items():
+        if processo.is_alive():
+            processo.terminate()
+        processo.join()
+        tempos.setdefault(nome, None)  # Cancelada antes de terminar
+
+    if vencedora is None:
+        validos = {nome: res for nome, res in resultados.items() if res}
+        vencedora = min(validos, key=lambda nome: (validos[nome][0], tempos[nome])) if validos else None
+    return vencedora, resultados.get(vencedora), tempos
+
+## Registro e padrão por tamanho:
+def registrar(instancia, location_data, objetivo, vencedora, resultado, tempos, caminho=REGISTRO):
+    """Acrescenta ao registro a vencedora de um portfólio e os tempos das configurações."""
+    registro = {
+        'instancia': instancia,
+        'n': len(location_data),
+        'objetivo': objetivo,
+        'vencedora': vencedora,
+        'status': resultado[-1]['status'] if resultado else None,
+        'valor': float(resultado[0]) if resultado else None,
+        'tempos': {nome: None if t is None else round(t, 4) for nome, t in tempos.items()},
+    }
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(registro) + '\n')
+    return registro
+
+@functools.lru_cache(maxsize=4)
+def _vencedoras(caminho, _mtime):
+    # (objetivo, n, vencedora, status) de cada portfólio registrado; relido só quando o arquivo muda
+    with open(caminho, encoding='utf-8') as f:
+        registros = [json.loads(linha) for linha in f]
+    return tuple((r['objetivo'], r['n'], r['vencedora'], r['status']) for r in registros if r['vencedora'])
+
+def padroes(caminho=REGISTRO, faixas=FAIXAS):
+    """
+    Configuração padrão por (objetivo, faixa de tamanho): a que mais venceu
+    com prova de otimalidade no registro (ou, sem provas na faixa, a que mais venceu).
+    """
+    if not os.path.exists(caminho):
+        return {}
+    vitorias, provadas = defaultdict(Counter), defaultdict(Counter)
+    for objetivo, n, vencedora, status in _vencedoras(caminho, os.path.getmtime(caminho)):
+        grupo = (objetivo, faixa(n, faixas))
+        vitorias[grupo][vencedora] += 1
+        if status in STATUS_PROVADOS:
+            provadas[grupo][vencedora] += 1
+    return {grupo: (provadas[grupo] or contagem).most_common(1)[0][0] for grupo, contagem in vitorias.items()}
+
+def padrao(n, objetivo, caminho=REGISTRO):
+    """
+    Configuração padrão aprendida para uma instância de n locais e o objetivo,
+    ou None se a faixa não tem registro (ou a vencedora não se aplica a n).
+    """
+    nome = padroes(caminho).get((objetivo, faixa(n)))
+    return nome if nome in CONFIGS and aplicavel(nome, n, objetivo) else None
+
+## Linha de comando:
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Portfólio de configurações por instância")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="roda o portfólio nas instâncias e registra as vencedoras")
+    run.add_argument("source", nargs="?", default=parametro.INSTANCE_DIR,
+                     help="instâncias: pasta, padrão glob ou arquivo .txt")
+    run.add_argument("--objetivos", nargs="+", default=['total', 'max'], choices=['total', 'max'])
+    run.add_argument("--configs", nargs="+", default=None, choices=sorted(CONFIGS))
+    run.add_argument("--cores", type=int, default=None, help="orçamento de núcleos (padrão: todos)")
+    run.add_argument("--time-limit", type=float, default=120)
+    run.add_argument("--target-gap", type=float, default=None)
+
+    sub.add_parser("padroes", help="mostra a configuração padrão aprendida por faixa de tamanho")
+
+    args = parser.parse_args(argv)
+    if args.command == "padroes":
+        for (objetivo, grupo), nome in sorted(padroes().items()):
+            print(f"{objetivo:<6} {grupo:>8}: {nome}")
+        return 0
+
+    for instancia, locations in parametro.iter_instances(args.source):
+        for objetivo in args.objetivos:
+            vencedora, resultado, tempos = executar(locations, objetivo, args.cores, args.time_limit,
+                                                    args.target_gap, args.configs)
+            r = registrar(instancia, locations, objetivo, vencedora, resultado, tempos)
+            valor = f"{r['valor']:.2f}" if r['valor'] is not None else "-"
+            print(f"   - {instancia} / {objetivo}: {vencedora} ({r['status']}, objetivo {valor}) | "
+                  + ", ".join(f"{nome} {'cancelada' if t is None else f'{t:.2f}s'}" for nome, t in tempos.items()))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
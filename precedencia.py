@@ -0,0 +1,120 @@
+## Inferência de precedências entre clientes a partir de deadlines, serviços e de um limite superior
+import numpy as np
+import avaliacao
+
+# Tolerância numérica: só infere relações violadas com folga
+EPS = 1e-6
+
+# Rodadas de inferência (precedências apertam as janelas, que geram novas precedências)
+RODADAS = 5
+
+# Famílias usadas pelos modelos, cada uma ligada ou desligada separadamente:
+# - 'janelas': limites de tempo_chegada apertados pelas precedências;
+# - 'arcos': arcos fixados em zero (j -> i com i antes de j, arcos que pulam um cliente
+#   obrigatoriamente intermediário, saída do depósito e retorno a ele);
+# - 'cortes': y[j] >= y[i] + s_i + d_ij para i antes de j, adicionados no modelo ('inicial'),
+#   como restrições lazy ('lazy'), separados no callback como cortes de usuário ('usuario') ou None.
+PADRAO = {'janelas': True, 'arcos': True, 'cortes': 'inicial'}
+MODOS_CORTES = (None, 'inicial', 'lazy', 'usuario')
+
+def opcoes(precedence):
+    """Normaliza a opção dos modelos: True (PADRAO), False/None (desligado) ou um dicionário parcial."""
+    if precedence is True:
+        return dict(PADRAO)
+    if not precedence:
+        return {'janelas': False, 'arcos': False, 'cortes': None}
+    resultado = dict(PADRAO, **precedence)
+    if resultado['cortes'] not in MODOS_CORTES:
+        raise ValueError(f"Modo de cortes de precedência inválido: {resultado['cortes']!r}")
+    return resultado
+
+def relacoes(dist, servico, prazo, chegada_min, chegada_max, limite_total=None):
+    """
+    Matriz booleana precede[i, j] = "o cliente i vem antes de j em toda rota
+    viável (ou melhor que o limite)". Se j viesse antes de i, a chegada em i
+    seria no mínimo chegada_min_j + s_j + d_ji (desigualdade triangular); i é
+    obrigatoriamente anterior quando isso:
+    - passa do máximo de chegada de i (deadline + limite superior); ou,
+    - no Modelo A ('limite_total'), eleva a soma dos atrasos mínimos acima do limite.
+    """
+    n = len(prazo)
+    cedo = chegada_min[:, None] + servico[:, None] + dist  # cedo[j, i]: chegada em i com j antes
+    nao_antes = cedo > chegada_max[None, :] + EPS
+    if limite_total is not None:
+        atraso_min = np.maximum(chegada_min - prazo, 0.0)
+        atraso_min[0] = 0.0
+        atraso_se_depois = np.maximum(cedo - prazo[None, :], 0.0)
+        nao_antes |= atraso_min.sum() - atraso_min[None, :] + atraso_se_depois > limite_total + EPS
+
+    precede = nao_antes.T.copy()
+    precede[0, :] = precede[:, 0] = False  # O depósito é o início da rota, fora das relações
+    np.fill_diagonal(precede, False)
+    contraditorias = precede & precede.T  # Sem rota abaixo do limite: nada a inferir com segurança
+    return precede & ~contraditorias
+
+def fecho_transitivo(precede):
+    """Fecho transitivo (i antes de k e k antes de j => i antes de j) por quadrados booleanos."""
+    atual = precede.copy()
+    while True:
+        novo = atual | ((atual.astype(np.int32) @ atual.astype(np.int32)) > 0)
+        if (novo == atual).all():
+            return novo
+        atual = novo
+
+def inferir(location_data, chegada_min, chegada_max, limite_total=None, rodadas=RODADAS):
+    """
+    Deriva as precedências e as janelas de chegada apertadas por elas, em
+    até 'rodadas' rodadas. Retorna um dicionário com:
+    - 'precede': matriz booleana (fechada transitivamente);
+    - 'chegada_min' / 'chegada_max': janelas apertadas;
+    - 'arcos_fixados': arcos que nenhuma rota compatível com as precedências usa;
+    - 'I', 'J', 'rhs': pares (i antes de j) dos cortes y[j] - y[i] >= s_i + d_ij;
+    - 'rodadas': rodadas executadas.
+    """
+    dist, servico, prazo = avaliacao.vetores_instancia(location_data)
+    n = len(location_data)
+    chegada_min = np.asarray(chegada_min, dtype=float).copy()
+    chegada_max = np.asarray(chegada_max, dtype=float).copy()
+    precede = np.zeros((n, n), dtype=bool)
+
+    rodada = 0
+    for rodada in range(1, rodadas + 1):
+        novas = fecho_transitivo(precede | relacoes(dist, servico, prazo, chegada_min, chegada_max, limite_total))
+        if novas.diagonal().any():  # Ciclo de precedências: limite abaixo do ótimo, mantém a rodada anterior
+            break
+        precede = novas
+        # i antes de j: chegada_min_j >= chegada_min_i + s_i + d_ij e chegada_max_i <= chegada_max_j - s_i - d_ij
+        passo = servico[:, None] + dist
+        minimo = np.max(np.where(precede, chegada_min[:, None] + passo, -np.inf), axis=0)
+        maximo = np.min(np.where(precede, chegada_max[None, :] - passo, np.inf), axis=1)
+        novo_min, novo_max = np.maximum(chegada_min, minimo), np.minimum(chegada_max, maximo)
+        novo_max = np.maximum(novo_max, novo_min)
+        if np.allclose(novo_min, chegada_min) and np.allclose(novo_max, chegada_max):
+            break
+        chegada_min, chegada_max = novo_min, novo_max
+
+    # Arcos impossíveis: j -> i com i antes de j, i -> j com algum k obrigatoriamente entre eles,
+    # depósito -> j com algum cliente antes de j e i -> depósito com algum cliente depois de i
+    contagem = precede.astype(np.int32)
+    fixados = precede.T | ((contagem @ contagem) > 0)
+    fixados[0, :] = precede.any(axis=0)
+    fixados[:, 0] = precede.any(axis=1)
+    fixados[0, 0] = False
+    np.fill_diagonal(fixados, False)
+
+    I, J = np.nonzero(precede)
+    return {
+        'precede': precede,
+        'chegada_min': chegada_min,
+        'chegada_max': chegada_max,
+        'arcos_fixados': fixados,
+        'I': I,
+        'J': J,
+        'rhs': servico[I] + dist[I, J],
+        'rodadas': rodada,
+    }
+
+def resumo(prec):
+    """Texto curto com o resultado da inferência."""
+    return (f"Precedências: {len(prec['I'])} pares, {int(prec['arcos_fixados'].sum())} arcos fixados "
+            f"({prec['rodadas']} rodadas)")
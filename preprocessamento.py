@@ -0,0 +1,96 @@
+## Pré-processamento: janelas de chegada, Big-M por arco e eliminação de arcos
+import numpy as np
+import avaliacao
+import precedencia
+
+# Tolerância numérica para não eliminar arcos de soluções viáveis por arredondamento
+EPS = 1e-6
+
+def janelas_chegada(location_data, limite_superior=None):
+    """
+    Calcula limites (mínimo, máximo) para o tempo de chegada em cada local.
+
+    - Mínimo: pela desigualdade triangular, nenhum caminho chega a j antes
+      da viagem direta do depósito (que parte no instante 0).
+    - Máximo: antes de chegar a i, cada outro local é atendido e deixado no
+      máximo uma vez, pelo seu arco de saída mais longo. Se houver um limite
+      superior conhecido para o objetivo (soma ou maior atraso), nenhuma
+      solução melhor que ele chega a i depois de deadline_i + limite.
+    """
+    dist, servico, prazo = avaliacao.vetores_instancia(location_data)
+    saida_max = dist.max(axis=1)
+    horizonte = servico.sum() + saida_max.sum()
+
+    chegada_min = dist[0].copy()
+    chegada_max = horizonte - servico - saida_max
+    if limite_superior is not None:
+        chegada_max = np.minimum(chegada_max, prazo + limite_superior + EPS)
+    # O depósito é o ponto de partida: tempo de chegada fixo em 0
+    chegada_min[0] = chegada_max[0] = 0.0
+    chegada_max = np.maximum(chegada_max, chegada_min)
+    return chegada_min, chegada_max
+
+def preprocessar(location_data, limite_superior=None, opcoes_precedencia=None, limite_total=None):
+    """
+    Gera os dados usados na construção dos modelos A e B:
+
+    - 'M': matriz com a constante Big-M de cada arco (i, j), a menor que
+      mantém a restrição de sequenciamento inativa quando x[i,j] = 0:
+      M_ij = max_chegada_i + servico_i + dist_ij - min_chegada_j.
+    - 'arcos_proibidos': arcos que nenhuma solução viável (ou melhor que o
+      limite superior) pode usar, pois chegar a j por i estoura o máximo de j.
+    - 'chegada_min' / 'chegada_max': limites para as variáveis de chegada.
+    - 'arcos_removidos' / 'linhas_removidas': contagem para relatório.
+    - 'precedencia': resultado de precedencia.inferir (ou None), com as famílias
+      de 'opcoes_precedencia' aplicadas às janelas e aos arcos proibidos e o
+      modo dos cortes em 'cortes_precedencia'. 'limite_total' é o limite da
+      soma dos atrasos (só quando o modelo resolve apenas o Modelo A).
+    """
+    dist, servico, _ = avaliacao.vetores_instancia(location_data)
+    n = len(location_data)
+    chegada_min, chegada_max = janelas_chegada(location_data, limite_superior)
+    opcoes = precedencia.opcoes(opcoes_precedencia)
+    prec = None
+    if opcoes['janelas'] or opcoes['arcos'] or opcoes['cortes']:
+        prec = precedencia.inferir(location_data, chegada_min, chegada_max, limite_total)
+        if opcoes['janelas']:
+            chegada_min, chegada_max = prec['chegada_min'], prec['chegada_max']
+
+    partida_min = chegada_min + servico
+    partida_max = chegada_max + servico
+    M = np.maximum(partida_max[:, None] + dist - chegada_min[None, :], 0.0)
+
+    # Arco (i, j) impossível: mesmo saindo de i o mais cedo possível, chega-se a j tarde demais
+    proibidos = partida_min[:, None] + dist > chegada_max[None, :] + EPS
+    proibidos[:, 0] = False  # O retorno ao depósito não tem restrição de tempo
+    np.fill_diagonal(proibidos, False)  # Laços já são proibidos no modelo
+    arcos_fixados = 0
+    if opcoes['arcos']:
+        arcos_fixados = int((prec['arcos_fixados'] & ~proibidos).sum())
+        proibidos |= prec['arcos_fixados']
+
+    arcos_removidos = int(proibidos.sum())
+    mantidos = ~proibidos
+    np.fill_diagonal(mantidos, False)
+    mantidos[:, 0] = False
+    return {
+        'M': M,
+        'arcos_proibidos': proibidos,
+        'chegada_min': chegada_min,
+        'chegada_max': chegada_max,
+        'arcos_removidos': arcos_removidos,
+        # Cada arco removido elimina a sua restrição de sequenciamento (destino j >= 1)
+        'linhas_removidas': int(proibidos[:, 1:].sum()),
+        'arcos_total': n * (n - 1),
+        'M_medio': float(M[mantidos].mean()) if mantidos.any() else 0.0,
+        'precedencia': prec,
+        'arcos_fixados': arcos_fixados,  # Arcos removidos só pelas precedências
+        'cortes_precedencia': opcoes['cortes'] if prec is not None and len(prec['I']) else None,
+    }
+
+def resumo(pre):
+    """Texto curto com o resultado do pré-processamento."""
+    return (f"Pré-processamento: {pre['arcos_removidos']} de {pre['arcos_total']} arcos removidos, "
+            f"{pre['linhas_removidas']} restrições de sequenciamento eliminadas, "
+            f"Big-M médio {pre['M_medio']:.1f}"
+            + (f" | {precedencia.resumo(pre['precedencia'])}" if pre['precedencia'] is not None else ""))
@@ -0,0 +1,134 @@
+## Programação dinâmica exata (Held-Karp com rótulos) para instâncias pequenas
+import time
+import numpy as np
+import heuristica
+import avaliacao
+
+# Maior número de locais (depósito incluso) resolvido pela programação dinâmica
+LIMITE_LOCAIS = 20
+
+# Tolerância numérica nas comparações de dominância e de limite superior
+EPS = 1e-9
+
+def _poda_dominados(estado, tempo, custo):
+    """
+    Índices dos rótulos não dominados. Dentro de um mesmo estado (conjunto
+    visitado, último local), um rótulo é descartado se outro chegou mais cedo
+    (ou no mesmo instante) com custo menor ou igual: como o atraso futuro não
+    diminui com o tempo de chegada, ele nunca leva a uma solução melhor.
+    """
+    ordem = np.lexsort((custo, tempo, estado))
+    estado = estado[ordem]
+    # Custos viram postos inteiros (empates com o mesmo posto) para a comparação ser exata
+    _, posto = np.unique(np.round(custo[ordem] / EPS) * EPS, return_inverse=True)
+    # Mínimo acumulado segmentado por estado: cada grupo é deslocado para baixo do anterior
+    inicio_grupo = np.concatenate(([True], estado[1:] != estado[:-1]))
+    deslocamento = np.cumsum(inicio_grupo) * (len(posto) + 1)
+    minimo = np.minimum.accumulate(posto - deslocamento) + deslocamento
+    anterior = np.concatenate(([len(posto)], minimo[:-1]))
+    anterior[inicio_grupo] = len(posto)  # O primeiro rótulo de cada estado é sempre mantido
+    return ordem[posto < anterior]
+
+def resolver(location_data, objetivo='total', limite_superior=None, rota_inicial=None):
+    """
+    Encontra a rota ótima para 'total' (soma dos atrasos) ou 'max' (maior
+    atraso). Cada camada guarda os rótulos com k clientes visitados como
+    vetores (conjunto em bits, último local, tempo, custo, pai) e todas as
+    extensões são calculadas de uma vez. Retorna (rota, valor, rótulos gerados).
+    Com um 'limite_superior' informado, a rota é None se nenhuma rota tiver
+    valor menor ou igual a ele. Sem ele, o limite vem de 'rota_inicial' (por
+    exemplo, a rota reparada de um solve anterior) ou da heurística.
+    """
+    dist, servico, prazo = avaliacao.vetores_instancia(location_data)
+    n = len(location_data)
+    if n <= 2:
+        return np.arange(n), 0.0, 0
+
+    # Limite superior (heurística) para podar rótulos que já custam mais que ele
+    rota_heuristica = None
+    if limite_superior is None:
+        rota = rota_heuristica = (np.asarray(rota_inicial) if rota_inicial is not None
+                                  else heuristica.resolver(location_data, objetivo))
+        _, _, total, maximo = avaliacao.avaliar_rotas(rota, dist, servico, prazo)
+        limite_superior = float(maximo[0] if objetivo == 'max' else total[0])
+        # Atraso zero não pode ser melhorado: a heurística já é ótima
+        if limite_superior <= EPS:
+            return rota, 0.0, 0
+
+    clientes = np.arange(1, n)
+    bits = np.int64(1) << clientes
+
+    # Primeira camada: depósito -> cada cliente
+    tempo = servico[0] + dist[0, clientes]
+    atraso = np.maximum(tempo - prazo[clientes], 0.0)
+    camadas = [{'conjunto': bits.copy(), 'ultimo': clientes.copy(), 'tempo': tempo,
+                'custo': atraso, 'pai': -np.ones(n - 1, dtype=np.int64)}]
+    gerados = n - 1
+
+    for _ in range(n - 2):
+        atual = camadas[-1]
+        # Todas as extensões (rótulo, próximo cliente) ainda não visitado
+        r, c = np.nonzero((atual['conjunto'][:, None] & bits[None, :]) == 0)
+        if len(r) == 0:
+            break
+        proximo = clientes[c]
+        ultimo = atual['ultimo'][r]
+        novo_tempo = atual['tempo'][r] + servico[ultimo] + dist[ultimo, proximo]
+        novo_atraso = np.maximum(novo_tempo - prazo[proximo], 0.0)
+        if objetivo == 'max':
+            novo_custo = np.maximum(atual['custo'][r], novo_atraso)
+        else:
+            novo_custo = atual['custo'][r] + novo_atraso
+        gerados += len(r)
+
+        # Poda por limite superior: o custo nunca diminui ao estender a rota
+        ok = novo_custo <= limite_superior + EPS
+        r, proximo, novo_tempo, novo_custo = r[ok], proximo[ok], novo_tempo[ok], novo_custo[ok]
+        novo_conjunto = atual['conjunto'][r] | bits[proximo - 1]
+
+        # Poda por dominância dentro de cada estado (conjunto, último local)
+        estado = novo_conjunto * n + proximo
+        manter = _poda_dominados(estado, novo_tempo, novo_custo) if len(estado) else np.array([], dtype=int)
+        camadas.append({'conjunto': novo_conjunto[manter], 'ultimo': proximo[manter],
+                        'tempo': novo_tempo[manter], 'custo': novo_custo[manter], 'pai': r[manter]})
+
+    final = camadas[-1]
+    if len(final['custo']) == 0:
+        # Nenhum rótulo abaixo do limite: a heurística (se foi ela que deu o limite) é ótima
+        if rota_heuristica is not None:
+            return rota_heuristica, limite_superior, gerados
+        return None, np.inf, gerados
+
+    # Reconstrói a rota a partir do melhor rótulo completo
+    k = int(np.argmin(final['custo']))
+    valor = float(final['custo'][k])
+    rota = []
+    for camada in reversed(camadas):
+        rota.append(int(camada['ultimo'][k]))
+        k = int(camada['pai'][k])
+    return np.asarray([0] + rota[::-1]), valor, gerados
+
+def solve(location_data, objetivo='total', rota_inicial=None):
+    """
+    Resolve a instância por programação dinâmica e retorna uma tupla no mesmo
+    formato de modelo_a.solve (objetivo 'total') ou modelo_b.solve ('max').
+    Como a solução é exata, limite inferior = objetivo e gap = 0.
+    'rota_inicial' substitui a heurística no limite superior da poda.
+    """
+    inicio = time.time()
+    rota, _, gerados = resolver(location_data, objetivo, rota_inicial=rota_inicial)
+    chegadas, atrasos = heuristica.tempos_por_local(rota, location_data)
+    valor = max(atrasos) if objetivo == 'max' else sum(atrasos)
+    resultado = (
+        valor,  # Valor da função objetivo
+        valor,  # Limite inferior (solução exata)
+        time.time() - inicio,  # Tempo de execução
+        0.0,  # Gap relativo
+        gerados,  # Rótulos gerados (no lugar dos nós da árvore de busca)
+        heuristica.rota_para_arcos(rota),  # Arcos escolhidos
+        chegadas,  # Tempos de chegada
+        atrasos  # Tempos de atraso
+    )
+    if objetivo == 'max':
+        resultado += (valor,)  # Valor do atraso máximo
+    return resultado + ({'status': 'OPTIMAL', 'metodo': 'DP'},)  # Detalhes da solução
@@ -0,0 +1,113 @@
+## Reotimização incremental: uma instância modificada (deadline alterado, parada incluída
+## ou removida) é resolvida de novo, partindo da rota de um solve anterior, reparada
+import time
+from collections import Counter
+import numpy as np
+import heuristica  # Busca local
+import avaliacao  # Avaliação vetorizada das rotas
+
+# Tempo (s) da busca local aplicada à rota reparada
+TEMPO_REPARO = 0.5
+
+# Fração mínima de locais em comum para que uma instância anterior sirva de base
+SEMELHANCA_MINIMA = 0.5
+
+## Correspondência entre instâncias:
+def chaves(location_data):
+    """Chave de cada local: (x, y, ocorrência), para distinguir locais nas mesmas coordenadas."""
+    vistos = Counter()
+    resultado = []
+    for p in location_data:
+        ponto = (int(p[0]), int(p[1]))
+        resultado.append(ponto + (vistos[ponto],))
+        vistos[ponto] += 1
+    return resultado
+
+def correspondencia(anteriores, atuais):
+    """
+    Índice na instância atual de cada local da anterior (-1 se ele foi
+    removido), pareando os locais pelas coordenadas. Serviços e deadlines
+    podem ter mudado. Retorna (mapa, semelhança), com a semelhança sendo a
+    fração de locais em comum; sem o mesmo depósito, a semelhança é 0.
+    """
+    posicao = {chave: k for k, chave in enumerate(chaves(atuais))}
+    mapa = [posicao.get(chave, -1) for chave in chaves(anteriores)]
+    if not mapa or mapa[0] != 0:
+        return mapa, 0.0
+    comuns = sum(1 for k in mapa if k >= 0)
+    return mapa, comuns / max(len(anteriores), len(atuais))
+
+def mesmos_dados(anteriores, atuais):
+    """Se as duas instâncias são idênticas (mesmos locais, serviços e deadlines, na mesma ordem)."""
+    return len(anteriores) == len(atuais) and all(list(a) == list(b) for a, b in zip(anteriores, atuais))
+
+## Reparo da rota:
+def reparar(rota_anterior, mapa, location_data, objetivo='total', limite_tempo=TEMPO_REPARO):
+    """
+    Traduz a rota anterior para a instância atual: retira os locais
+    removidos, insere cada local novo (do menor deadline para o maior) na
+    posição de menor custo, avaliando todas as posições de uma vez, e aplica
+    a busca local da heurística por até 'limite_tempo' segundos.
+    Retorna (rota, valor).
+    """
+    dist, servico, prazo = avaliacao.vetores_instancia(location_data)
+    n = len(location_data)
+    rota = np.asarray([mapa[v] for v in rota_anterior if mapa[v] >= 0], dtype=int)
+    novos = np.setdiff1d(np.arange(n), rota)
+    for local in novos[np.argsort(prazo[novos], kind='stable')]:
+        candidatos = np.array([np.insert(rota, p, local) for p in range(1, len(rota) + 1)])
+        _, _, total, maximo = avaliacao.avaliar_rotas(candidatos, dist, servico, prazo)
+        principal, desempate = (maximo, total) if objetivo == 'max' else (total, maximo)
+        rota = candidatos[np.lexsort((desempate, principal))[0]]
+    if n > 2:
+        rota = heuristica.busca_local(rota, dist, servico, prazo, objetivo, limite_tempo)
+    _, _, total, maximo = avaliacao.avaliar_rotas(rota, dist, servico, prazo)
+    return rota, float(maximo[0] if objetivo == 'max' else total[0])
+
+## Resolução:
+def resolver(location_data, objetivo='total', metodo='MIP', rota_anterior=None, mapa=None, time_limit=30,
+             threads=None, target_gap=None, backend='gurobi'):
+    """
+    Resolve a instância com o método escolhido pelo chamador ('DP', 'LNS',
+    'BISECTION' ou 'MIP', ver execucao.solve_params). Com a rota de um solve
+    anterior e o 'mapa' de correspondencia, a rota reparada substitui a heurística:
+    - MIP (Gurobi): MIP start e limite superior do pré-processamento, sem
+      rodar a heurística construtiva;
+    - DP: limite superior da poda;
+    - LNS: rota de partida;
+    - HiGHS: incumbente e limite do pré-processamento (o milp não aceita MIP start).
+    A bisseção (só o Modelo B) parte do próprio limite heurístico e não usa a rota.
+    O modelo e o pré-processamento (janelas, arcos eliminados, precedências)
+    são refeitos por completo: um deadline alterado ou uma parada nova muda
+    as janelas de todos os locais. Do solve anterior só se aproveitam a rota
+    reparada e o limite superior que ela dá.
+    Retorna (tupla no formato de modelo_a/modelo_b, informações do reparo).
+    """
+    inicio = time.perf_counter()
+    rota, valor = None, None
+    if rota_anterior is not None and len(location_data) > 1:
+        rota, valor = reparar(rota_anterior, mapa, location_data, objetivo)
+    info = {'incremental': rota is not None, 'valor_reparado': valor,
+            'tempo_reparo': time.perf_counter() - inicio}
+
+    if metodo == 'DP':
+        import programacao_dinamica
+        return programacao_dinamica.solve(location_data, objetivo, rota_inicial=rota), info
+    if metodo == 'BISECTION':
+        import bissecao
+        return bissecao.solve(location_data, time_limit=time_limit, threads=threads), info
+    if metodo == 'LNS':
+        import lns
+        return lns.solve(location_data, objetivo, time_limit=time_limit, threads=threads, rota_inicial=rota), info
+    if backend == 'highs':
+        import modelo_highs
+        return modelo_highs.solve(location_data, objetivo, target_gap=target_gap, time_limit=time_limit,
+                                  rota_inicial=rota, threads=threads), info
+
+    import modelo_base
+    model = modelo_base.build_model(location_data, warm_start=rota is None, objectives=(objetivo,),
+                                    time_limit=time_limit, threads=threads, upper_bound=valor, verbose=False)
+    try:
+        return modelo_base.solve_model(model, objetivo, target_gap=target_gap, rota_inicial=rota), info
+    finally:
+        model.dispose()
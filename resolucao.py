@@ -1,38 +1,37 @@
 import os
+import math
+import queue
 import datetime
-import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.patches import Patch as patches
+import threading
+from concurrent.futures import ProcessPoolExecutor
 
-def format_solution_table(label, solution, is_model_b=False):
-    """Formata a tabela de resultados para um único modelo."""
+def format_solution_table(label, solution, is_model_b=False, location_data=None):
+    """
+    Formata a tabela de resultados para um único modelo. Com 'location_data',
+    a solução passa pelo verificador (avaliacao.problemas) e os problemas
+    encontrados entram no texto.
+    """
     if solution is None:
         return f"RESULTADO {label}: NENHUMA SOLUÇÃO ENCONTRADA A TEMPO"
 
-    (objective_upper_bound, _, runtime, _, _, routes_raw, arrival_times, delay_times, *rest) = solution
+    (objective_upper_bound, _, runtime, gap, _, routes_raw, arrival_times, delay_times, *rest) = solution
+    # Último elemento da tupla: dicionário de detalhes (status final do solver)
+    details = rest[-1] if rest and isinstance(rest[-1], dict) else {}
+    status = details.get('status', 'OPTIMAL')
     
-    # --- LÓGICA CORRIGIDA PARA MONTAR A ROTA ---
-    points_in_order = []
-    if routes_raw:
-        try:
-            route_dict = dict(routes_raw)
-            curr = 0
-            # O loop deve rodar exatamente o número de vezes do total de locais
-            # para garantir que todos os pontos sejam adicionados à lista.
-            for _ in range(len(route_dict)):
-                points_in_order.append(curr)
-                curr = route_dict.get(curr)
-                # Se a rota for inválida (o que não deve acontecer), para.
-                if curr is None:
-                    break
-        except Exception as e:
-            print(f"Erro ao montar a rota para a tabela: {e}")
-            points_in_order = [] # Reseta em caso de erro
+    # Rota a partir dos arcos; com a instância, a solução é conferida sem confiar no solver
+    import avaliacao
+    points_in_order = avaliacao.ciclo(routes_raw, len(arrival_times))[0].tolist() if routes_raw else []
+    problems = avaliacao.problemas(solution, location_data) if location_data is not None else []
 
     def fmt(value): return "0.00" if abs(value) < 1e-6 else f"{value:.2f}"
     max_delay_str = f"\nMaior Atraso: {fmt(rest[0])}" if is_model_b and rest else ""
     
-    result = f"Resultado {label} (Atraso {'Maior' if is_model_b else 'Total'}): {fmt(objective_upper_bound)}{max_delay_str} (Tempo: {runtime:.2f}s)\n"
+    # Soluções não provadas ótimas (tempo limite, heurística) informam status e gap
+    status_str = f"\nStatus: {status} (Gap: {gap * 100:.2f}%)" if status != 'OPTIMAL' else ""
+    status_str += "".join(f"\nVerificação: {problem}" for problem in problems)
+    
+    result = f"Resultado {label} (Atraso {'Maior' if is_model_b else 'Total'}): {fmt(objective_upper_bound)}{max_delay_str}{status_str} (Tempo: {runtime:.2f}s)\n"
     result += "+---------------+-----------------+---------------+\n"
     result += "| Ponto da Rota | Hora de Chegada | Tempo de Atraso |\n"
     result += "+---------------+-----------------+---------------+\n"
@@ -45,41 +44,148 @@ def format_solution_table(label, solution, is_model_b=False):
     result += "Nota: A rota completa, incluindo o arco de retorno ao Centro de Distribuição (Ponto 0), está representada no gráfico."
     return result
 
-def log_solution(instance_name, solution_a, solution_b):
-    """Gera o arquivo de log com os resultados dos dois modelos."""
+def format_solution_log(instance_name, solution_a, solution_b, location_data=None, data=None):
+    """
+    Texto do arquivo de log com os resultados dos dois modelos (verificados se
+    'location_data' for informado). 'data' (segundos desde a época) é o
+    instante do processamento; o padrão é agora.
+    """
+    moment = datetime.datetime.fromtimestamp(data) if data is not None else datetime.datetime.now()
+    log_file_content = f"Dia e Hora do Processamento: {moment.strftime('%Y-%m-%d %H:%M:%S')}\n"
+    log_file_content += f"Instancia: {instance_name}\n\n"
+    log_file_content += format_solution_table("A", solution_a, location_data=location_data) + "\n\n"
+    log_file_content += format_solution_table("B", solution_b, is_model_b=True, location_data=location_data)
+    return log_file_content
+
+def log_solution(instance_name, solution_a, solution_b, location_data=None):
+    """
+    Grava a visão em texto dos resultados em resultados/solucao_<instância>.txt.
+    Os resultados completos ficam no armazém colunar (ver armazem.py).
+    """
     if not os.path.exists("./resultados"):
         os.makedirs("./resultados")
 
-    log_file_content = f"Dia e Hora do Processamento: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-    log_file_content += f"Instancia: {instance_name}\n\n"
-    log_file_content += format_solution_table("A", solution_a) + "\n\n"
-    log_file_content += format_solution_table("B", solution_b, is_model_b=True)
-    
     with open(os.path.join("resultados", f"solucao_{instance_name}.txt"), "w", encoding='utf-8') as file:
-        file.write(log_file_content)
+        file.write(format_solution_log(instance_name, solution_a, solution_b, location_data))
 
-def plot_resolucao(instance_name, nodes, route):
-    """Gera e salva o gráfico da rota encontrada."""
-    if not route: return
+def _image_path(name):
     image_dir = os.path.join('resultados', 'imagens')
-    if not os.path.exists(image_dir): os.makedirs(image_dir)
-    
+    os.makedirs(image_dir, exist_ok=True)
+    return os.path.join(image_dir, f"solucao_{name}.png")
+
+def _new_figure(figsize):
+    # API orientada a objetos (Figure + Agg), sem o estado global do pyplot; matplotlib só é
+    # importado quando o primeiro gráfico é desenhado
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig
+
+def draw_route(ax, instance_name, nodes, route, fontsize=16):
+    """Desenha a rota em um Axes (sem pyplot), com o depósito destacado."""
+    import networkx as nx
+    from matplotlib.patches import Patch as patches
+
     G = nx.DiGraph(route)
     pos = {i: (nodes[i][0], nodes[i][1]) for i in range(len(nodes))}
-    
-    plt.figure(figsize=(10, 8))
-    plt.title(f"Rota Otimizada - {instance_name}", fontsize=16)
-    
+    ax.set_title(f"Rota Otimizada - {instance_name}", fontsize=fontsize)
+
     # Garante que as cores dos nós correspondam aos nós presentes no gráfico
     node_colors = ['gold' if node == 0 else 'skyblue' for node in G.nodes()]
-    nx.draw(G, pos, labels={n: f"{n}" for n in G.nodes()}, with_labels=True, node_size=500,
-            node_color=node_colors, font_size=10, font_weight='bold',
-            edge_color='gray', width=1.5, arrows=True, arrowstyle='->', arrowsize=20,
-            connectionstyle='arc3,rad=0.1')
-            
+    nx.draw_networkx(G, pos, ax=ax, labels={n: f"{n}" for n in G.nodes()}, with_labels=True, node_size=500,
+                     node_color=node_colors, font_size=10, font_weight='bold',
+                     edge_color='gray', width=1.5, arrows=True, arrowstyle='->', arrowsize=20,
+                     connectionstyle='arc3,rad=0.1')
+    ax.set_axis_off()
+
     legend_elements = [patches(facecolor='gold', label='Depósito'), patches(facecolor='skyblue', label='Clientes')]
-    plt.legend(handles=legend_elements, loc='best')
-    
-    filepath = os.path.join(image_dir, f"solucao_{instance_name}.png")
-    plt.savefig(filepath, bbox_inches='tight')
-    plt.close()
\ No newline at end of file
+    ax.legend(handles=legend_elements, loc='best')
+
+def plot_resolucao(instance_name, nodes, route):
+    """Gera e salva o gráfico da rota encontrada."""
+    if not route: return
+    fig = _new_figure(figsize=(10, 8))
+    draw_route(fig.add_subplot(), instance_name, nodes, route)
+    filepath = _image_path(instance_name)
+    fig.savefig(filepath, bbox_inches='tight')
+    return filepath
+
+def plot_panel(panel_name, items, columns=2):
+    """
+    Gera uma única imagem com várias rotas, uma por painel. 'items' é uma lista
+    de (nome, nodes, route), como os argumentos de plot_resolucao.
+    """
+    items = [item for item in items if item[2]]
+    if not items: return
+    rows = math.ceil(len(items) / columns)
+    fig = _new_figure(figsize=(6 * columns, 5 * rows))
+    axes = fig.subplots(rows, columns, squeeze=False).ravel()
+    for ax, (name, nodes, route) in zip(axes, items):
+        draw_route(ax, name, nodes, route, fontsize=12)
+    for ax in axes[len(items):]:
+        ax.set_axis_off()
+    filepath = _image_path(panel_name)
+    fig.savefig(filepath, bbox_inches='tight')
+    return filepath
+
+class PlotPipeline:
+    """
+    Etapa de gráficos separada da resolução: as soluções prontas entram em uma
+    fila, uma thread consome a fila e renderiza em um pool de processos próprio.
+    Com batch_size, cada lote de batch_size rotas vira uma imagem com vários
+    painéis. Com enabled=False (benchmarks), submit não faz nada.
+    """
+    def __init__(self, workers=1, batch_size=None, enabled=True):
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.files = []
+        if not enabled:
+            return
+        self._queue = queue.Queue()
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._futures = []
+        self._batches = 0
+        self._consumer = threading.Thread(target=self._consume, daemon=True)
+        self._consumer.start()
+
+    def submit(self, name, nodes, route):
+        """Enfileira uma rota para desenhar (não bloqueia quem resolve)."""
+        if self.enabled and route:
+            self._queue.put((name, nodes, route))
+
+    def _flush(self, batch):
+        self._batches += 1
+        self._futures.append(self._executor.submit(plot_panel, f"painel_{self._batches:03d}", batch))
+
+    def _consume(self):
+        batch = []
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if not self.batch_size:
+                self._futures.append(self._executor.submit(plot_resolucao, *item))
+                continue
+            batch.append(item)
+            if len(batch) == self.batch_size:
+                self._flush(batch)
+                batch = []
+        if batch:
+            self._flush(batch)
+
+    def close(self):
+        """Espera a fila esvaziar e os gráficos terminarem; retorna os arquivos gerados."""
+        if self.enabled:
+            self._queue.put(None)
+            self._consumer.join()
+            self.files = [f.result() for f in self._futures]
+            self._executor.shutdown()
+            self.enabled = False
+        return self.files
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
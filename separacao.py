@@ -0,0 +1,123 @@
+## Separação de cortes de subtour: soluções inteiras (MIPSOL) e fracionárias (MIPNODE)
+import time
+import numpy as np
+
+# Tolerância para considerar um corte violado
+EPS = 1e-6
+
+## Soluções inteiras:
+def sucessores(valores):
+    """Vetor de sucessores de uma solução inteira dada como matriz (n x n) de x[i,j]."""
+    return np.argmax(valores, axis=1)
+
+def get_subtours(sucessor):
+    """
+    Encontra os ciclos de uma solução inteira em O(n), percorrendo o vetor
+    de sucessores e marcando cada local uma única vez.
+    """
+    n = len(sucessor)
+    visitado = np.zeros(n, dtype=bool)
+    tours = []
+    for inicio in range(n):
+        if visitado[inicio]:
+            continue
+        tour, atual = [], inicio
+        while not visitado[atual]:
+            visitado[atual] = True
+            tour.append(atual)
+            atual = int(sucessor[atual])
+        tours.append(tour)
+    return tours
+
+## Soluções fracionárias:
+def componentes(peso):
+    """Componentes conexas do grafo suporte (arestas com peso positivo)."""
+    n = len(peso)
+    rotulo = -np.ones(n, dtype=int)
+    for inicio in range(n):
+        if rotulo[inicio] >= 0:
+            continue
+        rotulo[inicio] = inicio
+        pilha = [inicio]
+        while pilha:
+            i = pilha.pop()
+            for j in np.flatnonzero((peso[i] > EPS) & (rotulo < 0)):
+                rotulo[j] = inicio
+                pilha.append(j)
+    return [np.flatnonzero(rotulo == r).tolist() for r in np.unique(rotulo)]
+
+def corte_minimo(peso):
+    """
+    Corte mínimo global (Stoer-Wagner) de um grafo não direcionado com matriz
+    de pesos simétrica. Retorna (valor do corte, lista de nós de um dos lados).
+    """
+    peso = peso.astype(float).copy()
+    n = len(peso)
+    grupos = [[i] for i in range(n)]
+    ativos = list(range(n))
+    melhor_valor, melhor_lado = np.inf, []
+    while len(ativos) > 1:
+        # Fase: adiciona sempre o nó mais fortemente ligado ao conjunto atual
+        idx = np.asarray(ativos)
+        ligacao = peso[idx[0], idx].copy()
+        no_conjunto = np.zeros(len(idx), dtype=bool)
+        no_conjunto[0] = True
+        anterior, ultimo = 0, 0
+        for _ in range(len(idx) - 1):
+            candidatos = np.where(no_conjunto, -np.inf, ligacao)
+            k = int(np.argmax(candidatos))
+            anterior, ultimo = ultimo, k
+            no_conjunto[k] = True
+            ligacao += peso[idx[k], idx]
+        valor_fase = ligacao[ultimo] - peso[idx[ultimo], idx[ultimo]]
+        s, t = idx[anterior], idx[ultimo]
+        if valor_fase < melhor_valor:
+            melhor_valor, melhor_lado = valor_fase, list(grupos[t])
+        # Contrai t em s
+        grupos[s].extend(grupos[t])
+        peso[s, :] += peso[t, :]
+        peso[:, s] += peso[:, t]
+        peso[s, s] = 0.0
+        ativos.remove(t)
+    return melhor_valor, melhor_lado
+
+def separar_fracionario(valores):
+    """
+    Conjuntos S que violam o corte de subtour na solução fracionária 'valores'
+    (matriz n x n). Com as restrições de grau, x(S) <= |S| - 1 equivale a
+    x(δ(S)) >= 2 no grafo simétrico x + x^T: primeiro usa as componentes
+    conexas (cortes de valor zero) e, se o suporte for conexo, o corte mínimo.
+    Cada conjunto é devolvido pelo lado que não contém o depósito.
+    """
+    n = len(valores)
+    peso = valores + valores.T
+    np.fill_diagonal(peso, 0.0)
+
+    partes = componentes(peso)
+    if len(partes) > 1:
+        return [p for p in partes if 0 not in p]
+
+    valor, lado = corte_minimo(peso)
+    if valor < 2.0 - 1e-3 and 2 <= len(lado) <= n - 2:
+        if 0 in lado:
+            lado = sorted(set(range(n)) - set(lado))
+        return [lado]
+    return []
+
+## Estatísticas do callback:
+def novas_estatisticas():
+    """Contadores de chamadas, cortes adicionados e tempo gasto por tipo de callback."""
+    return {tipo: {'chamadas': 0, 'cortes': 0, 'tempo': 0.0} for tipo in ('MIPSOL', 'MIPNODE', 'PRECEDENCIA')}
+
+def registrar(estatisticas, tipo, inicio, cortes):
+    """Acumula uma chamada do callback nos contadores."""
+    estatisticas[tipo]['chamadas'] += 1
+    estatisticas[tipo]['cortes'] += cortes
+    estatisticas[tipo]['tempo'] += time.perf_counter() - inicio
+
+def resumo(estatisticas):
+    """Texto curto com os contadores do callback."""
+    return " | ".join(
+        f"{tipo}: {e['chamadas']} chamadas, {e['cortes']} cortes, {e['tempo']:.2f}s"
+        for tipo, e in estatisticas.items()
+    )
@@ -0,0 +1,315 @@
+## Serviço local de resolução: instâncias recebidas por HTTP (porta TCP ou socket Unix), jobs em
+## uma fila limitada atendida por um pool de processos e resultados em JSON. Instâncias parecidas
+## com uma resolvida há pouco são reotimizadas a partir da rota anterior (ver reotimizacao.py)
+import os
+import sys
+import json
+import time
+import uuid
+import asyncio
+import argparse
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import parametro
+import execucao  # Escolha do método e inicialização dos processos, como no main.py
+import reotimizacao
+
+# Porta TCP padrão (em localhost)
+PORTA = 8765
+
+# Jobs aguardando na fila (além dos em execução); acima disso o pedido é recusado com 503
+MAX_FILA = 32
+
+# Instâncias resolvidas lembradas para reotimização e jobs concluídos guardados para consulta
+HISTORICO = 64
+
+# Tempo limite (s) padrão de cada solve, do zero ou reotimizando a partir de uma rota anterior
+TEMPO_LIMITE = 30
+TEMPO_LIMITE_INCREMENTAL = 5
+
+# Modelos atendidos: rótulo -> objetivo (os mesmos de execucao.OBJECTIVES)
+MODELOS = {"A": "total", "B": "max"}
+
+class FilaCheia(Exception):
+    """A fila de jobs atingiu MAX_FILA."""
+
+def ler_pedido(pedido):
+    """
+    Valida o JSON de um pedido e devolve (location_data, modelos, opções).
+    A instância vem em 'locations' (linhas [x, y, serviço, deadline], depósito
+    primeiro) ou em 'instance' (texto no formato dos arquivos de instância).
+    Sem 'time_limit', o job usa TEMPO_LIMITE (ou TEMPO_LIMITE_INCREMENTAL ao
+    partir de uma rota anterior). Levanta ValueError com a descrição dos problemas.
+    """
+    if not isinstance(pedido, dict):
+        raise ValueError("o pedido deve ser um objeto JSON")
+    if "instance" in pedido:
+        location_data = parametro.as_location_data(parametro.parse_instance(pedido["instance"]))
+    else:
+        locations = pedido.get("locations")
+        if (not isinstance(locations, list) or len(locations) < 2
+                or not all(isinstance(p, list) and len(p) == 4 and all(isinstance(v, int) for v in p)
+                           for p in locations)):
+            raise ValueError("'locations' deve ter o depósito e ao menos um cliente, cada um [x, y, serviço, deadline]")
+        if any(p[2] < 0 or p[3] < 0 for p in locations):
+            raise ValueError("serviço e deadline não podem ser negativos")
+        location_data = [list(p) for p in locations]
+    modelos = pedido.get("models", list(MODELOS))
+    if not modelos or any(m not in MODELOS for m in modelos):
+        raise ValueError(f"'models' deve conter {' e/ou '.join(MODELOS)}")
+    opcoes = {
+        "time_limit": float(pedido["time_limit"]) if "time_limit" in pedido else None,
+        "target_gap": pedido.get("target_gap"),
+        "base": pedido.get("base"),  # Job anterior a usar como base (senão, o mais parecido do histórico)
+        "incremental": bool(pedido.get("incremental", True)),
+    }
+    return location_data, list(dict.fromkeys(modelos)), opcoes
+
+def resposta(resultado, info):
+    """Tupla de resultado (formato de modelo_a/modelo_b) em um dicionário serializável em JSON."""
+    import avaliacao
+    import heuristica
+    location_data = info.pop("location_data")  # Só para a verificação; a instância não volta na resposta
+    if not resultado:
+        return {"status": "SEM_SOLUCAO", **info}
+    detalhes = resultado[-1]
+    return {
+        "status": detalhes["status"],
+        "metodo": detalhes.get("metodo", "MIP"),
+        "valor": float(resultado[0]),
+        "limite": float(resultado[1]),
+        "gap": float(resultado[3]),
+        "tempo": float(resultado[2]),
+        "rota": [int(v) for v in heuristica.arcos_para_rota(resultado[5])],
+        "chegadas": [float(v) for v in resultado[6]],
+        "atrasos": [float(v) for v in resultado[7]],
+        "problemas": avaliacao.problemas(resultado, location_data),  # Verificação independente
+        **info,
+    }
+
+def _resolver(location_data, rotulo, metodo, rota_anterior, mapa, opcoes, threads, backend):
+    # Executado em um processo do pool: solve (incremental ou não) e resposta em JSON
+    resultado, info = reotimizacao.resolver(location_data, MODELOS[rotulo], metodo, rota_anterior, mapa,
+                                            opcoes["time_limit"], threads, opcoes["target_gap"], backend)
+    return resposta(resultado, dict(info, location_data=location_data))
+
+class Servico:
+    """
+    Fila limitada de jobs (um por instância e modelo) atendida por 'workers'
+    processos, cada um com 'threads' threads do Gurobi. Cada instância
+    resolvida entra no histórico; um pedido parecido com ela (mesmo depósito
+    e ao menos reotimizacao.SEMELHANCA_MINIMA dos locais em comum) parte da
+    rota anterior reparada, e um pedido idêntico a um resultado ótimo é
+    respondido sem resolver.
+    """
+    def __init__(self, workers=1, threads=None, max_fila=MAX_FILA, historico=HISTORICO,
+                 dp_limit=None, lns_limit=None, backend="gurobi"):
+        import lns
+        import programacao_dinamica
+        self.workers = workers
+        self.threads = threads or max(1, multiprocessing.cpu_count() // workers)
+        self.max_fila = max_fila
+        self.tamanho_historico = historico
+        self.dp_limit = programacao_dinamica.LIMITE_LOCAIS if dp_limit is None else dp_limit
+        self.lns_limit = lns.LIMITE_LOCAIS if lns_limit is None else lns_limit
+        self.backend = backend
+        self.jobs = OrderedDict()  # id -> estado, resultados e evento de conclusão
+        self.historico = OrderedDict()  # id -> (location_data, {rótulo: resposta})
+        self._fila = None
+        self._executor = None
+        self._tarefas = []
+
+    async def iniciar(self):
+        self._fila = asyncio.Queue(maxsize=self.max_fila)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=execucao.warm_worker,
+                                             initargs=(self.threads, self.backend))
+        # Processos criados antes da primeira conexão: filhos criados durante uma requisição herdariam
+        # o socket do cliente e a conexão não fecharia enquanto eles existissem
+        await asyncio.gather(*(asyncio.get_running_loop().run_in_executor(self._executor, os.getpid)
+                               for _ in range(self.workers)))
+        self._tarefas = [asyncio.create_task(self._trabalhador()) for _ in range(self.workers)]
+
+    async def fechar(self):
+        for tarefa in self._tarefas:
+            tarefa.cancel()
+        await asyncio.gather(*self._tarefas, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+
+    ## Histórico:
+    def _base(self, location_data, opcoes):
+        # Instância anterior mais parecida (ou a indicada em 'base'): (id, mapa, semelhança)
+        candidatos = [opcoes["base"]] if opcoes["base"] in self.historico else reversed(self.historico)
+        melhor = (None, None, 0.0)
+        for job_id in candidatos:
+            mapa, semelhanca = reotimizacao.correspondencia(self.historico[job_id][0], location_data)
+            if semelhanca > melhor[2]:
+                melhor = (job_id, mapa, semelhanca)
+        return melhor if melhor[2] >= reotimizacao.SEMELHANCA_MINIMA else (None, None, 0.0)
+
+    def _lembrar(self, job_id, location_data, resultados):
+        self.historico[job_id] = (location_data, resultados)
+        while len(self.historico) > self.tamanho_historico:
+            self.historico.popitem(last=False)
+
+    ## Jobs:
+    def submeter(self, pedido):
+        """Valida e enfileira um pedido; retorna o id do job (ValueError ou FilaCheia se recusado)."""
+        location_data, modelos, opcoes = ler_pedido(pedido)
+        if self._fila.qsize() + len(modelos) > self.max_fila:
+            raise FilaCheia(f"fila cheia ({self.max_fila} jobs)")
+
+        job_id = uuid.uuid4().hex[:12]
+        base, mapa, semelhanca = self._base(location_data, opcoes) if opcoes["incremental"] else (None, None, 0.0)
+        if opcoes["time_limit"] is None:  # A rota reparada já é boa: sem limite no pedido, a reotimização é curta
+            opcoes["time_limit"] = TEMPO_LIMITE_INCREMENTAL if base else TEMPO_LIMITE
+        metodos = {rotulo: execucao.solve_params(location_data, MODELOS[rotulo], self.dp_limit, self.lns_limit,
+                                                 self.backend)["method"] for rotulo in modelos}
+        job = {"id": job_id, "estado": "fila", "n": len(location_data), "metodos": metodos, "base": base,
+               "semelhanca": semelhanca, "recebido": time.time(), "resultados": {},
+               "pendentes": len(modelos), "evento": asyncio.Event()}
+        self.jobs[job_id] = job
+        for rotulo in modelos:
+            anterior = self.historico[base][1].get(rotulo) if base else None
+            if anterior and anterior["status"] == "OPTIMAL" and reotimizacao.mesmos_dados(
+                    self.historico[base][0], location_data):
+                self._concluir(job, location_data, rotulo, dict(anterior, reaproveitado=True))
+                continue
+            rota = anterior["rota"] if anterior else None
+            self._fila.put_nowait((job, location_data, rotulo, rota, mapa if rota else None, opcoes))
+        self._podar_jobs()
+        return job_id
+
+    def _concluir(self, job, location_data, rotulo, resultado):
+        job["resultados"][rotulo] = resultado
+        job["pendentes"] -= 1
+        if job["pendentes"] == 0:
+            job["estado"] = "pronto"
+            job["parede"] = time.time() - job["recebido"]
+            validos = {r: res for r, res in job["resultados"].items() if "rota" in res}
+            if validos:
+                self._lembrar(job["id"], location_data, validos)
+            job["evento"].set()
+
+    def _podar_jobs(self):
+        # Guarda os jobs concluídos mais recentes (os pendentes nunca saem)
+        concluidos = [job_id for job_id, job in self.jobs.items() if job["estado"] == "pronto"]
+        for job_id in concluidos[:max(0, len(concluidos) - self.tamanho_historico)]:
+            del self.jobs[job_id]
+
+    async def _trabalhador(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job, location_data, rotulo, rota, mapa, opcoes = await self._fila.get()
+            job["estado"] = "executando"
+            job.setdefault("espera", time.time() - job["recebido"])
+            try:
+                resultado = await loop.run_in_executor(self._executor, _resolver, location_data, rotulo,
+                                                       job["metodos"][rotulo], rota, mapa, opcoes, self.threads,
+                                                       self.backend)
+            except Exception as e:  # Falha em um solve não derruba o serviço
+                resultado = {"status": "ERRO", "erro": str(e)}
+            self._concluir(job, location_data, rotulo, resultado)
+            self._fila.task_done()
+
+    async def aguardar(self, job_id):
+        """Espera o job terminar e devolve o seu estado."""
+        await self.jobs[job_id]["evento"].wait()
+        return self.estado(job_id)
+
+    def estado(self, job_id):
+        """Estado público de um job (sem o evento interno)."""
+        job = self.jobs[job_id]
+        return {k: v for k, v in job.items() if k not in ("evento", "pendentes")}
+
+    def resumo(self):
+        return {"fila": self._fila.qsize(), "workers": self.workers, "threads": self.threads,
+                "jobs": len(self.jobs), "historico": len(self.historico)}
+
+    ## HTTP:
+    async def tratar(self, reader, writer):
+        """
+        Uma requisição HTTP/1.1 por conexão:
+        - POST /solve: resolve e responde com o resultado (espera o job);
+        - POST /jobs: enfileira e responde 202 com o id;
+        - GET /jobs/<id>: estado do job e resultados prontos;
+        - GET /status: tamanho da fila e do histórico.
+        """
+        try:
+            linha = (await reader.readline()).decode("latin-1").split()
+            cabecalhos = {}
+            while (cabecalho := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                nome, _, valor = cabecalho.decode("latin-1").partition(":")
+                cabecalhos[nome.strip().lower()] = valor.strip()
+            corpo = await reader.readexactly(int(cabecalhos.get("content-length", 0)))
+            codigo, dados = await self._rota(linha[0] if linha else "", linha[1] if len(linha) > 1 else "", corpo)
+        except (ValueError, TypeError) as e:  # Inclui json.JSONDecodeError
+            codigo, dados = 400, {"erro": str(e)}
+        except FilaCheia as e:
+            codigo, dados = 503, {"erro": str(e)}
+        except Exception as e:
+            codigo, dados = 500, {"erro": str(e)}
+        texto = json.dumps(dados).encode("utf-8")
+        motivo = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 503: "Service Unavailable"}
+        writer.write(f"HTTP/1.1 {codigo} {motivo.get(codigo, 'Internal Server Error')}\r\n"
+                     f"Content-Type: application/json\r\nContent-Length: {len(texto)}\r\n"
+                     f"Connection: close\r\n\r\n".encode("latin-1") + texto)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def _rota(self, metodo, caminho, corpo):
+        if metodo == "POST" and caminho in ("/solve", "/jobs"):
+            job_id = self.submeter(json.loads(corpo or b"{}"))
+            if caminho == "/jobs":
+                return 202, {"id": job_id, "estado": self.jobs[job_id]["estado"]}
+            return 200, await self.aguardar(job_id)
+        if metodo == "GET" and caminho.startswith("/jobs/"):
+            job_id = caminho[len("/jobs/"):]
+            return (200, self.estado(job_id)) if job_id in self.jobs else (404, {"erro": "job não encontrado"})
+        if metodo == "GET" and caminho == "/status":
+            return 200, self.resumo()
+        return 404, {"erro": f"rota desconhecida: {metodo} {caminho}"}
+
+async def servir(host="127.0.0.1", porta=PORTA, socket_unix=None, **parametros):
+    """Inicia o serviço em uma porta TCP ou em um socket Unix e atende até ser interrompido."""
+    servico = Servico(**parametros)
+    await servico.iniciar()
+    if socket_unix:
+        servidor = await asyncio.start_unix_server(servico.tratar, path=socket_unix)
+        print(f"🚀 Serviço em {socket_unix} ({servico.workers} processos x {servico.threads} threads)")
+    else:
+        servidor = await asyncio.start_server(servico.tratar, host, porta)
+        print(f"🚀 Serviço em http://{host}:{porta} ({servico.workers} processos x {servico.threads} threads)")
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        await servico.fechar()
+
+## Linha de comando:
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço local de resolução (HTTP com respostas em JSON)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=PORTA)
+    parser.add_argument("--unix", default=None, help="caminho de um socket Unix (no lugar da porta TCP)")
+    parser.add_argument("--workers", type=int, default=1, help="processos que resolvem os jobs")
+    parser.add_argument("--cores", type=int, default=None, help="orçamento de núcleos (padrão: todos)")
+    parser.add_argument("--queue", type=int, default=MAX_FILA, help="jobs aguardando antes de recusar (503)")
+    parser.add_argument("--lns-limit", type=int, default=None,
+                        help="instâncias com mais locais usam o motor LNS (padrão 50; 0 desliga)")
+    parser.add_argument("--backend", choices=["gurobi", "highs"], default="gurobi")
+    args = parser.parse_args(argv)
+
+    threads = max(1, (args.cores or multiprocessing.cpu_count()) // args.workers)
+    try:
+        asyncio.run(servir(args.host, args.port, args.unix, workers=args.workers, threads=threads,
+                           max_fila=args.queue, lns_limit=args.lns_limit, backend=args.backend))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+## Telemetria por solve: log separado, amostras de incumbente/limite e métricas derivadas
+import os
+import sys
+import glob
+import time
+import numpy as np
+
+# Valor que o Gurobi usa como infinito (incumbente ainda inexistente)
+INFINITO_GUROBI = 1e100
+
+# Pasta com um log do Gurobi e um arquivo de amostras (.npz) por instância/modelo
+TELEMETRY_DIR = os.path.join("resultados", "telemetria")
+
+# Intervalo mínimo (s) entre duas amostras periódicas; novas incumbentes são sempre amostradas
+INTERVALO = 0.5
+
+# Colunas gravadas no arquivo de amostras
+COLUNAS = ('tempo', 'incumbente', 'limite', 'nos')
+
+def caminho_log(nome, pasta=TELEMETRY_DIR):
+    """Log do Gurobi exclusivo do solve 'nome' (por exemplo, 'inst_22_A')."""
+    os.makedirs(pasta, exist_ok=True)
+    return os.path.join(pasta, f"{nome}.log")
+
+def caminho_amostras(nome, pasta=TELEMETRY_DIR):
+    """Arquivo colunar (.npz) com as amostras do solve 'nome'."""
+    os.makedirs(pasta, exist_ok=True)
+    return os.path.join(pasta, f"{nome}.npz")
+
+## Coleta (chamada pelo callback do modelo):
+def iniciar(model, nome=None, intervalo=INTERVALO):
+    """Prepara o modelo para amostrar o solve seguinte; sem nome, a amostragem fica desligada."""
+    model._telemetria = nome
+    model._amostras = {c: [] for c in COLUNAS} if nome else None
+    model._intervalo_amostra = intervalo
+    model._ultima_amostra = -np.inf
+    model._tempo_amostragem = 0.0
+
+def _anotar(model, tempo, incumbente, limite, nos):
+    amostras = model._amostras
+    for coluna, valor in zip(COLUNAS, (tempo, incumbente, limite, nos)):
+        amostras[coluna].append(valor)
+    model._ultima_amostra = tempo
+
+def amostrar(model, where):
+    """
+    Registra (tempo, incumbente, limite, nós) no callback: em MIP a cada
+    'intervalo' segundos e em MIPSOL a cada nova incumbente.
+    """
+    if model._amostras is None:
+        return
+    from gurobipy import GRB  # Já carregado pelo modelo; o resumo não precisa do Gurobi
+    inicio = time.perf_counter()
+    cb = GRB.Callback
+    tempo = model.cbGet(cb.RUNTIME)
+    if where == cb.MIP:
+        if tempo - model._ultima_amostra >= model._intervalo_amostra:
+            _anotar(model, tempo, model.cbGet(cb.MIP_OBJBST), model.cbGet(cb.MIP_OBJBND),
+                    model.cbGet(cb.MIP_NODCNT))
+    elif where == cb.MIPSOL:
+        incumbente = min(model.cbGet(cb.MIPSOL_OBJ), model.cbGet(cb.MIPSOL_OBJBST))
+        _anotar(model, tempo, incumbente, model.cbGet(cb.MIPSOL_OBJBND), model.cbGet(cb.MIPSOL_NODCNT))
+    model._tempo_amostragem += time.perf_counter() - inicio
+
+## Métricas:
+def integral_primal(tempo, incumbente, referencia):
+    """
+    Integral primal (Berthold): área sob o gap primal p(t) = |inc - ref| / max(|inc|, |ref|)
+    ao longo do solve, com p = 1 antes da primeira incumbente. 'referencia' é o
+    melhor valor conhecido (o objetivo final, na falta do ótimo).
+    """
+    tempo = np.asarray(tempo, dtype=float)
+    if len(tempo) == 0:
+        return 0.0
+    incumbente = np.minimum.accumulate(np.asarray(incumbente, dtype=float))
+    escala = np.maximum(np.abs(incumbente), abs(referencia))
+    with np.errstate(invalid='ignore'):
+        gap = np.where(escala > 0, np.abs(incumbente - referencia) / escala, 0.0)
+    gap = np.where(np.isfinite(incumbente) & (incumbente * referencia >= 0), np.minimum(gap, 1.0), 1.0)
+    # p(t) é constante por partes: 1 até a primeira amostra e gap[k] entre as amostras k e k+1
+    return float(tempo[0] + np.sum(gap[:-1] * np.diff(tempo)))
+
+def metricas(amostras, separacao=None, tempo_amostragem=0.0):
+    """
+    Métricas derivadas de um solve: tempo até a primeira incumbente, integral
+    primal, limites finais e tempo gasto nos callbacks (separação de subtours
+    e a própria amostragem).
+    """
+    tempo = np.asarray(amostras['tempo'], dtype=float)
+    incumbente = np.asarray(amostras['incumbente'], dtype=float)
+    incumbente[incumbente >= INFINITO_GUROBI] = np.inf  # Sem incumbente o Gurobi informa GRB.INFINITY
+    viaveis = np.flatnonzero(np.isfinite(incumbente))
+    referencia = float(incumbente[viaveis].min()) if len(viaveis) else np.inf
+    resultado = {
+        'amostras': len(tempo),
+        'tempo_total': float(tempo[-1]) if len(tempo) else 0.0,
+        'primeira_incumbente': float(tempo[viaveis[0]]) if len(viaveis) else None,
+        'integral_primal': integral_primal(tempo, incumbente, referencia) if len(viaveis) else None,
+        'objetivo_final': referencia if len(viaveis) else None,
+        'limite_final': float(amostras['limite'][-1]) if len(tempo) else None,
+        'tempo_amostragem': tempo_amostragem,
+    }
+    if separacao is not None:
+        resultado['tempo_callback'] = sum(e['tempo'] for e in separacao.values()) + tempo_amostragem
+    return resultado
+
+## Gravação e leitura:
+def finalizar(model):
+    """
+    Acrescenta a amostra final do solve, grava as colunas e as métricas no
+    arquivo .npz e devolve as métricas (None se a telemetria estiver desligada).
+    """
+    if model._amostras is None:
+        return None
+    if model.SolCount > 0:
+        _anotar(model, model.Runtime, model.ObjVal, model.ObjBound, model.NodeCount)
+    else:
+        _anotar(model, model.Runtime, np.inf, model.ObjBound, model.NodeCount)
+    resultado = metricas(model._amostras, model._separacao, model._tempo_amostragem)
+    colunas = {c: np.asarray(v, dtype=float) for c, v in model._amostras.items()}
+    escalares = {k: np.nan if v is None else float(v) for k, v in resultado.items()}
+    np.savez_compressed(caminho_amostras(model._telemetria), **colunas,
+                        **{f"metrica_{k}": v for k, v in escalares.items()})
+    model._amostras = None
+    return resultado
+
+def carregar(caminho):
+    """Lê um arquivo de amostras: (colunas, métricas)."""
+    with np.load(caminho) as dados:
+        colunas = {c: dados[c] for c in COLUNAS}
+        valores = {k[len('metrica_'):]: float(dados[k]) for k in dados.files if k.startswith('metrica_')}
+    return colunas, {k: (None if np.isnan(v) else v) for k, v in valores.items()}
+
+## Resumo de uma execução:
+def resumo(pasta=TELEMETRY_DIR):
+    """Imprime uma linha por solve com as métricas e as médias da execução."""
+    linhas = []
+    for caminho in sorted(glob.glob(os.path.join(pasta, "*.npz"))):
+        _, m = carregar(caminho)
+        linhas.append((os.path.splitext(os.path.basename(caminho))[0], m))
+    if not linhas:
+        print(f"Nenhum arquivo de telemetria em {pasta}.")
+        return linhas
+
+    def fmt(valor, spec='.2f'):
+        return format(valor, spec) if valor is not None else "-"
+
+    print("\n+--------------------+----------+-------------+-----------------+--------------+----------+")
+    print("| Solve              | Tempo (s)| 1ª inc. (s) | Integral primal | Callback (s) | Amostras |")
+    print("+--------------------+----------+-------------+-----------------+--------------+----------+")
+    for nome, m in linhas:
+        print(f"| {nome:<18} | {fmt(m['tempo_total']):>8} | {fmt(m['primeira_incumbente']):>11} "
+              f"| {fmt(m['integral_primal'], '.3f'):>15} | {fmt(m.get('tempo_callback')):>12} | {int(m['amostras']):>8} |")
+    print("+--------------------+----------+-------------+-----------------+--------------+----------+")
+
+    def media(chave):
+        valores = [m[chave] for _, m in linhas if m.get(chave) is not None]
+        return sum(valores) / len(valores) if valores else None
+
+    print(f"Média de {len(linhas)} solves: tempo {fmt(media('tempo_total'))}s | 1ª incumbente "
+          f"{fmt(media('primeira_incumbente'))}s | integral primal {fmt(media('integral_primal'), '.3f')} "
+          f"| callback {fmt(media('tempo_callback'))}s")
+    return linhas
+
+if __name__ == "__main__":
+    # Uso: python telemetria.py [pasta]
+    resumo(sys.argv[1] if len(sys.argv) > 1 else TELEMETRY_DIR)
@@ -0,0 +1,47 @@
+## Apoio aos testes: instâncias pequenas geradas e enumeração de todas as rotas
+import itertools
+import numpy as np
+import avaliacao
+import benchmark
+import heuristica
+import preprocessamento
+
+# Tolerância na comparação de valores de objetivo
+TOLERANCIA = 1e-6
+
+def instancias(tamanhos, sementes=range(4), apertos=(0.5, 1.0, 2.0)):
+    """Instâncias de benchmark.generate_instance: (nome, location_data) para cada combinação."""
+    for n, semente, aperto in itertools.product(tamanhos, sementes, apertos):
+        yield f"n{n}_s{semente}_t{aperto}", benchmark.generate_instance(n, semente, aperto)
+
+def todas_as_rotas(location_data):
+    """Todas as rotas a partir do depósito: (rotas, chegadas, total, máximo), avaliadas sem esperas."""
+    n = len(location_data)
+    rotas = np.array([(0,) + p for p in itertools.permutations(range(1, n))], dtype=int)
+    chegadas, _, total, maximo = avaliacao.avaliar(rotas, *avaliacao.vetores_instancia(location_data))
+    return rotas, chegadas, total, maximo
+
+def otimo(location_data, objetivo):
+    """Valor ótimo por força bruta ('total' ou 'max')."""
+    _, _, total, maximo = todas_as_rotas(location_data)
+    return float((maximo if objetivo == 'max' else total).min())
+
+def rotas_otimas(location_data, objetivo):
+    """(rotas ótimas, chegadas indexadas pelo local) por força bruta."""
+    rotas, chegadas, total, maximo = todas_as_rotas(location_data)
+    valores = maximo if objetivo == 'max' else total
+    otimas = valores <= valores.min() + TOLERANCIA
+    return rotas[otimas], chegadas[otimas]
+
+def compativel(rota, chegadas, pre):
+    """Se a rota usa só arcos mantidos e as suas chegadas (sem esperas) cabem nas janelas."""
+    arcos = np.stack([rota, np.roll(rota, -1)], axis=1)
+    eps = preprocessamento.EPS
+    return (not pre['arcos_proibidos'][arcos[:, 0], arcos[:, 1]].any()
+            and (chegadas >= pre['chegada_min'] - eps).all()
+            and (chegadas <= pre['chegada_max'] + eps).all())
+
+def limites(location_data, objetivo):
+    """Limite da heurística (o usado pelos modelos) e o próprio ótimo, o mais apertado válido."""
+    _, atrasos = heuristica.tempos_por_local(heuristica.resolver(location_data, objetivo), location_data)
+    return (max(atrasos) if objetivo == 'max' else sum(atrasos)), otimo(location_data, objetivo)
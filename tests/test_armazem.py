@@ -0,0 +1,59 @@
+## Armazém colunar: gravação e consulta, e gravações interrompidas descartadas
+import os
+import numpy as np
+import pytest
+import armazem
+import programacao_dinamica
+from tests import apoio
+
+def resolvidas(quantidade):
+    for nome, location_data in list(apoio.instancias([6, 8], apertos=(1.0,)))[:quantidade]:
+        yield nome, location_data, programacao_dinamica.solve(location_data, 'total'), \
+            programacao_dinamica.solve(location_data, 'max')
+
+def conferir(pasta, esperados):
+    # Cada linha do armazém reconstrói a tupla gravada
+    tabela, vetores = armazem.abrir(pasta)
+    assert len(tabela['n']) == len(esperados)
+    for k, (nome, modelo, resultado) in enumerate(esperados):
+        assert (tabela['instancia'][k], tabela['modelo'][k]) == (nome, modelo)
+        assert tabela['violacoes'][k] == 0
+        lido = armazem.solucao(tabela, vetores, k)
+        assert lido[0] == pytest.approx(resultado[0])
+        assert sorted(lido[5]) == sorted(resultado[5])
+        assert np.allclose(lido[6], resultado[6]) and np.allclose(lido[7], resultado[7])
+        assert lido[-1] == {'status': 'OPTIMAL', 'metodo': 'DP'}
+
+def test_gravar_e_consultar(tmp_path):
+    pasta = str(tmp_path)
+    esperados = []
+    for nome, location_data, res_a, res_b in resolvidas(3):
+        armazem.gravar_instancia(nome, res_a, res_b, location_data, pasta=pasta)
+        esperados += [(nome, 'A', res_a), (nome, 'B', res_b)]
+    conferir(pasta, esperados)
+    armazem.gravar("sem_solucao", 'A', None, pasta=pasta)
+    tabela, vetores = armazem.abrir(pasta)
+    assert armazem.solucao(tabela, vetores, len(esperados)) is None
+    assert list(tabela['status'][armazem.filtrar(tabela, modelo='A')]) == ['OPTIMAL'] * 3 + ['SEM_SOLUCAO']
+    assert [linha['solves'] for linha in armazem.resumo(tabela)] == [4, 3]
+
+def test_gravacao_interrompida(tmp_path):
+    pasta = str(tmp_path)
+    (nome, location_data, res_a, res_b), (nome_2, location_data_2, res_a_2, _) = resolvidas(2)
+    armazem.gravar(nome, 'A', res_a, location_data, pasta=pasta)
+
+    # Gravação interrompida: vetores e parte das colunas já no disco, o restante não
+    for coluna in ('chegada', 'atraso', 'rota'):
+        with open(armazem._caminho(pasta, coluna), 'ab') as f:
+            f.write(np.zeros(len(location_data), dtype=armazem.VETORES[coluna]).tobytes())
+    for coluna in list(armazem.COLUNAS)[:5]:
+        with open(armazem._caminho(pasta, coluna), 'ab') as f:
+            f.write(b'\x01\x02\x03')
+    conferir(pasta, [(nome, 'A', res_a)])  # A leitura só vê as linhas completas
+
+    armazem.gravar(nome, 'B', res_b, location_data, pasta=pasta)
+    armazem.gravar(nome_2, 'A', res_a_2, location_data_2, pasta=pasta)
+    conferir(pasta, [(nome, 'A', res_a), (nome, 'B', res_b), (nome_2, 'A', res_a_2)])
+    tamanhos = {os.path.getsize(armazem._caminho(pasta, c)) // armazem._tipo(t).itemsize
+                for c, t in armazem.COLUNAS.items()}
+    assert tamanhos == {3}  # As sobras foram cortadas antes de acrescentar
@@ -0,0 +1,50 @@
+## Verificador independente: soluções válidas passam, subciclos, chegadas e objetivos errados não
+import numpy as np
+import pytest
+import avaliacao
+import programacao_dinamica
+from tests import apoio
+
+@pytest.fixture
+def instancia():
+    return apoio.benchmark.generate_instance(7, 3, 2.0)
+
+def alterar(resultado, indice, valor):
+    return resultado[:indice] + (valor,) + resultado[indice + 1:]
+
+@pytest.mark.parametrize("objetivo", ['total', 'max'])
+def test_solucao_valida(instancia, objetivo):
+    assert avaliacao.problemas(programacao_dinamica.solve(instancia, objetivo), instancia, objetivo) == []
+
+def test_subciclo(instancia):
+    resultado = programacao_dinamica.solve(instancia, 'total')
+    subciclos = [(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 6), (6, 3)]
+    encontrados = avaliacao.problemas(alterar(resultado, 5, subciclos), instancia, 'total')
+    assert any("não é um ciclo" in p for p in encontrados)
+
+def test_chegada_errada(instancia):
+    resultado = programacao_dinamica.solve(instancia, 'total')
+    rota = avaliacao.ciclo(resultado[5], len(instancia))[0]
+    chegadas = list(resultado[6])
+    chegadas[rota[2]] -= 1.0  # Antes do possível pelo arco que chega nela
+    encontrados = avaliacao.problemas(alterar(resultado, 6, chegadas), instancia, 'total')
+    assert any("chegada antes do possível" in p for p in encontrados)
+
+@pytest.mark.parametrize("objetivo", ['total', 'max'])
+def test_objetivo_errado(instancia, objetivo):
+    resultado = programacao_dinamica.solve(instancia, objetivo)
+    assert resultado[0] > 1.0  # Instância apertada: há atraso a subestimar
+    encontrados = avaliacao.problemas(alterar(resultado, 0, resultado[0] - 1.0), instancia, objetivo)
+    assert encontrados
+    with pytest.raises(ValueError, match="Solução inválida"):
+        avaliacao.verificar(alterar(resultado, 0, resultado[0] - 1.0), instancia, objetivo)
+
+def test_avaliar_igual_avaliar_rotas(instancia):
+    # Mesmos valores nas duas indexações (posição na rota e número do local)
+    dist, servico, prazo = avaliacao.vetores_instancia(instancia)
+    rotas = apoio.todas_as_rotas(instancia)[0][:50]
+    chegadas_pos, _, total, maximo = avaliacao.avaliar_rotas(rotas, dist, servico, prazo)
+    chegadas, atrasos, total_2, maximo_2 = avaliacao.avaliar(rotas, dist, servico, prazo)
+    assert np.allclose(np.take_along_axis(chegadas, rotas, axis=1), chegadas_pos)
+    assert np.allclose(total, total_2) and np.allclose(maximo, maximo_2)
+    assert np.allclose(atrasos.sum(axis=1), total)
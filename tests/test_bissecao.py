@@ -0,0 +1,18 @@
+## Bisseção do Modelo B: mesmo ótimo do MIP do Modelo B em instâncias pequenas
+import pytest
+from tests import apoio
+
+gp = pytest.importorskip("gurobipy")
+import bissecao
+import modelo_b
+
+def test_igual_ao_modelo_b():
+    for nome, location_data in apoio.instancias([6, 9], sementes=range(2)):
+        resultado = bissecao.solve(location_data, time_limit=60, check_time_limit=20, threads=1)
+        referencia = modelo_b.solve(location_data, time_limit=60, threads=1)
+        assert referencia[-1]['status'] == 'OPTIMAL', nome
+        folga = bissecao.TOLERANCIA * max(1.0, referencia[0])
+        assert resultado[0] == pytest.approx(referencia[0], abs=folga), nome
+        assert resultado[-1]['status'] == 'OPTIMAL', nome
+        assert resultado[1] <= referencia[0] + folga, nome  # O limite inferior provado não passa do ótimo
+        assert resultado[0] == pytest.approx(apoio.otimo(location_data, 'max'), abs=folga), nome
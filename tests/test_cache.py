@@ -0,0 +1,60 @@
+## Cache de resultados: a chave muda com a instância, o modelo e os parâmetros
+import os
+import copy
+import programacao_dinamica
+import cache
+from tests import apoio
+
+PARAMETROS = {"method": "MIP", "time_limit": 120, "learned": None, "backend": "gurobi", "gurobi": {}}
+
+def test_chave_estavel():
+    location_data = apoio.benchmark.generate_instance(10, 1)
+    assert cache.chave(location_data, 'A', PARAMETROS) == cache.chave(copy.deepcopy(location_data), 'A',
+                                                                       dict(PARAMETROS))
+
+def test_chave_muda_com_instancia_modelo_e_parametros():
+    location_data = apoio.benchmark.generate_instance(10, 1)
+    alterada = copy.deepcopy(location_data)
+    alterada[3][3] += 1  # Só um deadline
+    base = cache.chave(location_data, 'A', PARAMETROS)
+    variantes = [
+        cache.chave(alterada, 'A', PARAMETROS),
+        cache.chave(location_data, 'B', PARAMETROS),
+        cache.chave(location_data, 'A', dict(PARAMETROS, method="LNS")),
+        cache.chave(location_data, 'A', dict(PARAMETROS, time_limit=60)),
+        cache.chave(location_data, 'A', dict(PARAMETROS, backend="highs")),
+        cache.chave(location_data, 'A', dict(PARAMETROS, gurobi={"MIPFocus": 2})),
+    ]
+    assert base not in variantes
+    assert len(set(variantes)) == len(variantes)
+
+def test_gravar_e_carregar(tmp_path):
+    location_data = apoio.benchmark.generate_instance(7, 2)
+    resultado = programacao_dinamica.solve(location_data, 'max')
+    k = cache.chave(location_data, 'B', PARAMETROS)
+    assert cache.carregar(k, pasta=str(tmp_path)) is None
+    cache.gravar(k, resultado, pasta=str(tmp_path))
+    lido = cache.carregar(k, pasta=str(tmp_path))
+    assert lido[:5] == resultado[:5] and lido[-1] == resultado[-1]
+    assert cache.otimo(lido)
+
+def test_chave_muda_com_os_presets(tmp_path):
+    # Os parâmetros do Gurobi vêm do preset da faixa: regravar o preset muda a chave
+    import ajuste
+    caminho = str(tmp_path / "presets.json")
+    location_data = apoio.benchmark.generate_instance(30, 0)
+    n = len(location_data)
+
+    def chave_atual():
+        return cache.chave(location_data, 'A', dict(PARAMETROS, gurobi=ajuste.preset(n, 'total', caminho)))
+
+    sem_preset = chave_atual()
+    ajuste.gravar('total', ajuste.faixa(n), {'params': {'MIPFocus': 2}}, caminho)
+    com_preset = chave_atual()
+    assert com_preset != sem_preset and chave_atual() == com_preset
+    ajuste.gravar('total', ajuste.faixa(n), {'params': {'MIPFocus': 1}}, caminho)
+    os.utime(caminho, ns=(0, os.stat(caminho).st_mtime_ns + 10**9))  # Mesmo em sistemas com mtime grosso
+    assert chave_atual() not in (sem_preset, com_preset)
+    ajuste.gravar('max', ajuste.faixa(n), {'params': {'Cuts': 2}}, caminho)
+    os.utime(caminho, ns=(0, os.stat(caminho).st_mtime_ns + 10**9))
+    assert ajuste.preset(n, 'total', caminho) == {'MIPFocus': 1}  # Os presets do outro objetivo não mudam o A
@@ -0,0 +1,53 @@
+## Leitura de instâncias: cabeçalho, formato e linhas que repetem o depósito
+import pytest
+import parametro
+
+VALIDA = "3\n10 10\n20 20 5 30\n30 10 5 60\n"
+
+def escrever(pasta, nome, texto):
+    caminho = pasta / nome
+    caminho.write_text(texto, encoding='utf-8')
+    return str(caminho)
+
+def test_le_instancia_valida(tmp_path):
+    escrever(tmp_path, "ok.txt", VALIDA)
+    [(nome, locations)] = list(parametro.iter_instances(str(tmp_path)))
+    assert nome == "ok"
+    assert parametro.as_location_data(locations) == [[10, 10, 0, 0], [20, 20, 5, 30], [30, 10, 5, 60]]
+
+@pytest.mark.parametrize("texto, trecho", [
+    ("4\n10 10\n20 20 5 30\n30 10 5 60\n", "cabeçalho informa 4 locais, foram lidos 3"),
+    ("três\n10 10\n20 20 5 30\n", "cabeçalho inválido"),
+    ("2\n10 10 0\n20 20 5 30\n", "depósito"),
+    ("2\n10 10\n20 20 5\n", "deveria ter 4 inteiros"),
+    ("2\n10 10\n20 20 -5 30\n", "negativo"),
+])
+def test_rejeita_arquivo_invalido(tmp_path, texto, trecho):
+    escrever(tmp_path, "ruim.txt", texto)
+    with pytest.raises(ValueError, match=trecho):
+        list(parametro.iter_instances(str(tmp_path)))
+    assert parametro.check_instance(str(tmp_path / "ruim.txt"))
+
+def test_rejeita_linha_que_repete_o_deposito(tmp_path):
+    caminho = escrever(tmp_path, "volta.txt", "4\n10 10\n20 20 5 30\n30 10 5 60\n10 10 0 0\n")
+    with pytest.raises(ValueError, match="linhas 5 repetem o depósito"):
+        list(parametro.iter_instances(str(tmp_path)))
+    assert parametro.check_instance(caminho) == ["linha 5 repete o depósito"]
+
+def test_sem_strict_pula_invalidos_e_mantem_o_deposito_repetido(tmp_path, capsys):
+    escrever(tmp_path, "a_ok.txt", VALIDA)
+    escrever(tmp_path, "b_ruim.txt", "5\n10 10\n20 20 5 30\n")
+    escrever(tmp_path, "c_volta.txt", "3\n10 10\n20 20 5 30\n10 10 0 0\n")
+    instancias = dict(parametro.iter_instances(str(tmp_path), strict=False))
+    assert sorted(instancias) == ["a_ok", "c_volta"]
+    assert len(instancias["c_volta"]) == 3  # Mantida como cliente, não descartada
+    saida = capsys.readouterr().out
+    assert "Instância ignorada" in saida and "repetem o depósito" in saida
+
+def test_leitura_sob_demanda(tmp_path):
+    escrever(tmp_path, "a.txt", VALIDA)
+    escrever(tmp_path, "b.txt", "lixo\n")
+    instancias = parametro.iter_instances(str(tmp_path))
+    assert next(instancias)[0] == "a"  # O arquivo inválido só é lido quando pedido
+    with pytest.raises(ValueError):
+        next(instancias)
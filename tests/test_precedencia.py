@@ -0,0 +1,35 @@
+## Precedências: as relações, janelas e arcos fixados nunca cortam todas as rotas ótimas
+import numpy as np
+import pytest
+import precedencia
+import preprocessamento
+from tests import apoio
+
+def respeita(rota, precede):
+    """Se a rota visita i antes de j para todo par i -> j inferido."""
+    posicao = np.empty(len(rota), dtype=int)
+    posicao[rota] = np.arange(len(rota))
+    i, j = np.nonzero(precede)
+    return bool((posicao[i] < posicao[j]).all())
+
+@pytest.mark.parametrize("objetivo", ['total', 'max'])
+def test_mantem_uma_rota_otima(objetivo):
+    inferidas = 0
+    for nome, location_data in apoio.instancias(range(3, 8)):
+        rotas, chegadas = apoio.rotas_otimas(location_data, objetivo)
+        for limite in apoio.limites(location_data, objetivo):
+            # Como em modelo_base.build_model: o limite da soma só vale quando o modelo resolve apenas o A
+            pre = preprocessamento.preprocessar(location_data, limite, True,
+                                                limite if objetivo == 'total' else None)
+            precede = pre['precedencia']['precede']
+            inferidas += int(precede.sum())
+            assert any(apoio.compativel(r, c, pre) and respeita(r, precede) for r, c in zip(rotas, chegadas)), \
+                (nome, limite)
+    assert inferidas > 0  # As instâncias apertadas geram precedências: o teste não é vazio
+
+def test_opcoes():
+    assert precedencia.opcoes(True) == precedencia.PADRAO
+    assert precedencia.opcoes(False) == {'janelas': False, 'arcos': False, 'cortes': None}
+    assert precedencia.opcoes({'cortes': 'lazy'})['cortes'] == 'lazy'
+    with pytest.raises(ValueError):
+        precedencia.opcoes({'cortes': 'todos'})
@@ -0,0 +1,21 @@
+## Pré-processamento: janelas e arcos removidos nunca cortam todas as rotas ótimas
+import pytest
+import avaliacao
+import preprocessamento
+from tests import apoio
+
+@pytest.mark.parametrize("objetivo", ['total', 'max'])
+def test_mantem_uma_rota_otima(objetivo):
+    for nome, location_data in apoio.instancias(range(3, 8)):
+        rotas, chegadas = apoio.rotas_otimas(location_data, objetivo)
+        for limite in apoio.limites(location_data, objetivo):
+            pre = preprocessamento.preprocessar(location_data, limite)
+            assert any(apoio.compativel(r, c, pre) for r, c in zip(rotas, chegadas)), (nome, limite)
+
+def test_big_m_desativa_o_arco():
+    # Com x[i,j] = 0 a restrição y[j] >= y[i] + s_i + d_ij - M_ij vale em qualquer ponto das janelas
+    for nome, location_data in apoio.instancias([7]):
+        pre = preprocessamento.preprocessar(location_data, apoio.otimo(location_data, 'max'))
+        dist, servico, _ = avaliacao.vetores_instancia(location_data)
+        folga = (pre['chegada_min'][None, :] - pre['chegada_max'][:, None] - servico[:, None] - dist + pre['M'])
+        assert (folga >= -preprocessamento.EPS).all(), nome
@@ -0,0 +1,22 @@
+## Programação dinâmica: mesmo ótimo da força bruta em instâncias de até 8 locais
+import numpy as np
+import pytest
+import avaliacao
+import programacao_dinamica
+from tests import apoio
+
+@pytest.mark.parametrize("objetivo", ['total', 'max'])
+def test_igual_a_forca_bruta(objetivo):
+    for nome, location_data in apoio.instancias(range(2, 9)):
+        resultado = programacao_dinamica.solve(location_data, objetivo)
+        assert resultado[0] == pytest.approx(apoio.otimo(location_data, objetivo), abs=apoio.TOLERANCIA), nome
+        assert avaliacao.problemas(resultado, location_data, objetivo) == [], nome
+
+@pytest.mark.parametrize("objetivo", ['total', 'max'])
+def test_rota_inicial_nao_muda_o_otimo(objetivo):
+    # A rota inicial só limita a poda: mesmo uma rota ruim não pode trocar o ótimo
+    for nome, location_data in apoio.instancias([8], apertos=(1.0,)):
+        rota = np.arange(len(location_data))[::-1]
+        rota = np.concatenate([[0], rota[:-1]])
+        resultado = programacao_dinamica.solve(location_data, objetivo, rota_inicial=rota)
+        assert resultado[0] == pytest.approx(apoio.otimo(location_data, objetivo), abs=apoio.TOLERANCIA), nome